@@ -1,9 +1,16 @@
 # flake8: noqa
-from eskapade import helpers
-from eskapade.core.definitions import StatusCode
-from eskapade.core.process_services import ConfigObject
-from eskapade.core.process_services import DataStore
-from eskapade.core.element import Chain, Link
-from eskapade.core.process_manager import process_manager
+from eskapade import exceptions
+from eskapade._lazy import lazy_attributes
 from eskapade.exceptions import *
 from eskapade.version import version as __version__
+
+# core classes and the process manager are imported on first access
+lazy_attributes(__name__, dict(helpers='eskapade.helpers',
+                               StatusCode='eskapade.core.definitions:StatusCode',
+                               ConfigObject='eskapade.core.process_services:ConfigObject',
+                               DataStore='eskapade.core.process_services:DataStore',
+                               Chain='eskapade.core.element:Chain',
+                               Link='eskapade.core.element:Link',
+                               process_manager='eskapade.core.process_manager:process_manager'))
+__all__ = ['helpers', 'StatusCode', 'ConfigObject', 'DataStore', 'Chain', 'Link', 'process_manager'] \
+    + [_ for _ in vars(exceptions) if not _.startswith('_')]
@@ -0,0 +1,79 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/27
+
+Description:
+    Lazy loading of module attributes
+
+    Package attributes, such as the link classes of a link package, are
+    imported on first access instead of when the package is imported.  This
+    keeps the start-up time of Eskapade independent of the dependencies of
+    modules that are not used in a run.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module with attributes that are imported on first access."""
+
+    def __getattr__(self, name):
+        """Import lazy attribute.
+
+        Only called if the attribute is not found in the module dictionary.
+        The imported object is stored in the module, so it is imported only
+        once.
+        """
+        try:
+            target = self.__dict__['_lazy_attributes'][name]
+        except KeyError:
+            raise AttributeError('module "{mod}" has no attribute "{name}"'.format(mod=self.__name__, name=name))
+        mod_name, _, attr_name = target.partition(':')
+        value = importlib.import_module(mod_name)
+        if attr_name:
+            value = getattr(value, attr_name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        """Get attributes of the module, including lazy attributes."""
+        return sorted(set(super().__dir__()).union(self.__dict__.get('_lazy_attributes', ())))
+
+
+def lazy_attributes(module_name, attributes):
+    """Set attributes of a module that are imported on first access.
+
+    The targets are specified as "module" for modules and as
+    "module:attribute" for objects in a module, e.g.
+
+    >>> lazy_attributes(__name__, dict(ReadToDf='eskapade.analysis.links.read_to_df:ReadToDf',
+    >>>                                persistence='eskapade.core.persistence'))
+
+    :param str module_name: name of the module, usually __name__
+    :param dict attributes: import targets by attribute name
+    """
+    module = sys.modules[module_name]
+    module.__class__ = LazyModule
+    module.__dict__.setdefault('_lazy_attributes', {}).update(attributes)
+
+
+def lazy_links(module_name, links):
+    """Set link classes of a link package that are imported on first access.
+
+    Each link class is defined in a submodule of the package, which is
+    specified by the module name.
+
+    :param str module_name: name of the link package, usually __name__
+    :param dict links: link-module names by class name
+    """
+    lazy_attributes(module_name, {cls: '{pkg}.{mod}:{cls}'.format(pkg=module_name, mod=mod, cls=cls)
+                                  for cls, mod in links.items()})
@@ -1,2 +1,11 @@
 # flake8: noqa
-from eskapade.analysis.links import *
+from eskapade._lazy import lazy_attributes
+from eskapade.analysis import links
+
+# link classes and analysis modules are imported on first access
+lazy_attributes(__name__, {cls: 'eskapade.analysis.links:' + cls for cls in links.__all__})
+lazy_attributes(__name__, dict(datetime='eskapade.analysis.datetime',
+                               histogram='eskapade.analysis.histogram',
+                               histogram_filling='eskapade.analysis.histogram_filling',
+                               statistics='eskapade.analysis.statistics'))
+__all__ = links.__all__
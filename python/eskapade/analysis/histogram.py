@@ -15,6 +15,7 @@ Redistribution and use in source and binary forms, with or without
 LICENSE.
 """
 
+import copy
 from collections import Counter
 
 import numpy as np
@@ -125,6 +126,22 @@ class ValueCounts(object):
         """
         return self.__lt__(other) or self.__eq__(other)
 
+    def __eskapade_merge__(self, other):
+        """Merge with value counts of the same variables.
+
+        :param ValueCounts other: the other ValueCounts object
+        :returns: value counts with the summed counts of both objects
+        :rtype: ValueCounts
+        :raises ValueError: if the variables of the value counts differ
+        """
+        if tuple(self.key) != tuple(other.key):
+            raise ValueError('cannot merge value counts of variables {} and {}'.format(self.key, other.key))
+        counts = dict(self.counts)
+        for vals, cnt in other.counts.items():
+            counts[vals] = counts.get(vals, 0) + cnt
+
+        return ValueCounts(self.key, self.key, counts)
+
     def _transform_key(self, key):
         """Transform input key to desired tuple format.
 
@@ -1088,6 +1105,25 @@ class Histogram(BinningUtil, ArgumentsMixin):
             values = values.reshape((1,))
         return Histogram(counts=(values, bin_vals[1]), variable=new_var_name)
 
+    def __eskapade_merge__(self, other):
+        """Merge with histogram of the same variable and binning.
+
+        The bin counts are added without converting them to bin values.
+
+        :param Histogram other: the other histogram
+        :returns: histogram with the summed bin counts of both histograms
+        :rtype: Histogram
+        :raises ValueError: if the variables or binnings of the histograms differ
+        """
+        if self.variable != other.variable:
+            raise ValueError('cannot merge histograms of variables "{}" and "{}"'.format(self.variable, other.variable))
+        specs, other_specs = self.bin_specs, other.bin_specs
+        if set(specs) != set(other_specs) or not all(np.array_equal(specs[k], other_specs[k]) for k in specs):
+            raise ValueError('cannot merge histograms of "{}" with different binnings'.format(self.variable))
+
+        return Histogram(self._val_counts.__eskapade_merge__(other._val_counts), variable=self.variable,
+                         bin_specs=copy.deepcopy(specs) or None, datatype=self.datatype)
+
     @classmethod
     def combine_hists(cls, hists, labels=False, rel_bin_width_tol=1e-6, **kwargs):
         """Combine a set of histograms.
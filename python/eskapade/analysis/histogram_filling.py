@@ -99,6 +99,14 @@ class HistogramFillerBase(Link):
         self.num_cols = []
         self.dt_cols = []
 
+    def get_output_keys(self):
+        """Get keys of data-store objects stored by the link.
+
+        :returns: key of the histograms
+        :rtype: set
+        """
+        return {self.store_key} if self.store_key else set()
+
     def initialize(self):
         """Initialize the link."""
         # check basic attribute settings
@@ -1,15 +1,18 @@
-from eskapade.analysis.links.apply_func_to_df import ApplyFuncToDf
-from eskapade.analysis.links.apply_selection_to_df import ApplySelectionToDf
-from eskapade.analysis.links.basic_generator import BasicGenerator
-from eskapade.analysis.links.df_concatenator import DfConcatenator
-from eskapade.analysis.links.df_merger import DfMerger
-from eskapade.analysis.links.histogrammar_filler import HistogrammarFiller
-from eskapade.analysis.links.random_sample_splitter import RandomSampleSplitter
-from eskapade.analysis.links.read_to_df import ReadToDf
-from eskapade.analysis.links.record_factorizer import RecordFactorizer
-from eskapade.analysis.links.record_vectorizer import RecordVectorizer
-from eskapade.analysis.links.value_counter import ValueCounter
-from eskapade.analysis.links.write_from_df import WriteFromDf
+from eskapade._lazy import lazy_links
+
+lazy_links(__name__, dict(
+    ApplyFuncToDf='apply_func_to_df',
+    ApplySelectionToDf='apply_selection_to_df',
+    BasicGenerator='basic_generator',
+    DfConcatenator='df_concatenator',
+    DfMerger='df_merger',
+    HistogrammarFiller='histogrammar_filler',
+    RandomSampleSplitter='random_sample_splitter',
+    ReadToDf='read_to_df',
+    RecordFactorizer='record_factorizer',
+    RecordVectorizer='record_vectorizer',
+    ValueCounter='value_counter',
+    WriteFromDf='write_from_df'))
 
 __all__ = ['ApplyFuncToDf',
            'ApplySelectionToDf',
@@ -51,6 +51,18 @@ class ApplyFuncToDf(Link):
         self._process_kwargs(kwargs, read_key='', store_key='', apply_funcs=[], add_columns=None)
         self.check_extra_kwargs(kwargs)
 
+    def get_output_keys(self):
+        """Get keys of data-store objects stored or modified by the link.
+
+        The input data frame is modified in place, so its key is included.
+
+        :returns: keys of the output data frame and of the function results
+        :rtype: set
+        """
+        keys = {self.read_key, self.store_key if self.store_key is not None else self.read_key}
+        keys.update(arr['store_key'] for arr in self.apply_funcs if 'store_key' in arr)
+        return keys
+
     def initialize(self):
         """Initialize the link."""
         self.check_arg_vals('read_key')
@@ -20,6 +20,7 @@ import copy
 import pandas as pd
 
 from eskapade import process_manager, DataStore, Link, StatusCode
+from eskapade.analysis.links.read_to_df import ReadToDf, parse_query
 
 
 class ApplySelectionToDf(Link):
@@ -53,6 +54,51 @@ class ApplySelectionToDf(Link):
         # pass on remaining kwargs to pandas query
         self.kwargs = copy.deepcopy(kwargs)
 
+    def get_output_keys(self):
+        """Get keys of data-store objects stored by the link.
+
+        :returns: keys of the selected data frame and its number of records
+        :rtype: set
+        """
+        store_key = self.store_key or self.read_key
+        return {store_key, 'n_' + store_key} if store_key else None
+
+    def push_down(self, link):
+        """Push the selection down into the link that reads the dataframe.
+
+        If the preceding link is a ReadToDf link that reads the input
+        dataframe, the simple queries are applied to each file or chunk
+        while reading.  If all queries are simple, only the selected columns
+        and the columns in the queries are read.  The selection is still
+        applied by this link, which then only removes the columns of the
+        queries.
+
+        :param Link link: preceding link in the chain
+        :returns: True if the selection was pushed down
+        :rtype: bool
+        """
+        if not isinstance(link, ReadToDf) or link.key != self.read_key or self.continue_if_failure or self.kwargs:
+            return False
+
+        query_set = [self.query_set] if isinstance(self.query_set, str) else list(self.query_set)
+        select_columns = [self.select_columns] if isinstance(self.select_columns, str) else list(self.select_columns)
+        parsed = [parse_query(q) for q in query_set]
+        queries = [q for q, p in zip(query_set, parsed) if p is not None]
+        columns = []
+        if select_columns and None not in parsed and not link.select_columns:
+            query_columns = set().union(*(p[0] for p in parsed)) - set(select_columns)
+            columns = select_columns + sorted(query_columns)
+        if not queries and not columns:
+            return False
+
+        link_queries = [link.query_set] if isinstance(link.query_set, str) else list(link.query_set)
+        link.query_set = link_queries + queries
+        link.select_columns = columns or link.select_columns
+        self.logger.info('Pushed selection down into link "{link!s}": queries [{queries}], columns [{columns}].',
+                         link=link, queries=', '.join(queries), columns=', '.join(columns))
+
+        return True
+
     def initialize(self):
         """Initialize the link.
 
@@ -24,6 +24,40 @@ from eskapade import StatusCode
 from eskapade import process_manager
 
 
+def generate_data(columns, size, gen_config=None):
+    """Generate data frame with basic distributions.
+
+    Numeric columns are drawn from normal distributions and string columns
+    from a set of choices, with NumPy's global random generator.  The
+    configuration of each column can specify "dtype", "mean" and "std" for
+    numeric columns, and "choice" and "choice_prob" for string columns.
+
+    :param list columns: column names
+    :param int size: number of rows
+    :param dict gen_config: generator configuration for each column
+    :return: generated data
+    :rtype: pandas.DataFrame
+    """
+    data = {}
+    for col in columns:
+        # get generator configuration for this variable
+        conf = gen_config.get(col, {}) if gen_config else {}
+        mu = conf.get('mean', 0.)
+        sigma = conf.get('std', 1.)
+        dtype = conf.get('dtype', float)
+        choice = conf.get('choice', ['a', 'b', 'c'])
+        choice_prob = conf.get('choice_prob', None)
+
+        # generate
+        if dtype == str:
+            data[col] = np.random.choice(choice, size=size, p=choice_prob)
+        else:
+            data[col] = np.random.normal(loc=mu, scale=sigma, size=size).astype(dtype)
+
+    # create data frame
+    return pd.DataFrame(data=data, columns=columns)
+
+
 class BasicGenerator(Link):
     """Generate data with basic distributions."""
 
@@ -60,23 +94,6 @@ class BasicGenerator(Link):
         # generate data
         self.logger.debug('Generating {n:d} rows for columns [{columns}].',
                           n=self.size, columns=', '.join('"{}"'.format(c) for c in self.columns))
-        data = {}
-        for col in self.columns:
-            # get generator configuration for this variable
-            conf = self.gen_config.get(col, {}) if self.gen_config else {}
-            mu = conf.get('mean', 0.)
-            sigma = conf.get('std', 1.)
-            dtype = conf.get('dtype', float)
-            choice = conf.get('choice', ['a', 'b', 'c'])
-            choice_prob = conf.get('choice_prob', None)
-
-            # generate
-            if dtype == str:
-                data[col] = np.random.choice(choice, size=self.size, p=choice_prob)
-            else:
-                data[col] = np.random.normal(loc=mu, scale=sigma, size=self.size).astype(dtype)
-
-        # create data frame
-        process_manager.service(DataStore)[self.key] = pd.DataFrame(data=data, columns=self.columns)
+        process_manager.service(DataStore)[self.key] = generate_data(self.columns, self.size, self.gen_config)
 
         return StatusCode.Success
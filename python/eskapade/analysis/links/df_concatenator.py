@@ -49,6 +49,22 @@ class DfConcatenator(Link):
         # pass on remaining kwargs to pandas reader
         self.kwargs = copy.deepcopy(kwargs)
 
+    def get_input_keys(self):
+        """Get keys of data-store objects read by the link.
+
+        :returns: keys of the data frames to concatenate
+        :rtype: set
+        """
+        return set(self.read_keys)
+
+    def get_output_keys(self):
+        """Get keys of data-store objects stored by the link.
+
+        :returns: keys of the concatenated data frame and its number of records
+        :rtype: set
+        """
+        return {self.store_key, 'n_' + self.store_key} if self.store_key else None
+
     def initialize(self):
         """Initialize the link."""
         assert self.read_keys, 'read_keys have not been set.'
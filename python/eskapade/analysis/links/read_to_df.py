@@ -15,9 +15,18 @@ modification, are permitted according to the terms listed in the file
 LICENSE.
 """
 
+import ast
+import collections
+import contextlib
 import copy
+import functools
 import glob
+import multiprocessing
 import os
+import pickle
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
@@ -27,22 +36,309 @@ from eskapade import DataStore
 from eskapade import Link
 from eskapade import StatusCode
 from eskapade import process_manager
+from eskapade.core.data_store_io import import_pyarrow
 from eskapade.logger import Logger
 
 logger = Logger()
 
+
+def _pyarrow():
+    """Get pyarrow module for reading columnar formats."""
+    pyarrow = import_pyarrow()
+    if pyarrow is None:
+        logger.fatal('Reading Parquet, Feather, or Arrow files requires pyarrow, which is not installed.')
+        raise RuntimeError('pyarrow not installed')
+    return pyarrow
+
+
+def _arrow_chunks(batches, chunksize, split_blocks):
+    """Convert Arrow record batches to dataframes of chunksize records.
+
+    The batches are regrouped, so all dataframes but the last have exactly
+    chunksize records, as read_csv chunks, and a default index continues
+    over the chunks.  Slicing does not copy the data of the batches.
+    """
+    pyarrow = _pyarrow()
+
+    def to_pandas(table, start):
+        df = table.to_pandas(split_blocks=split_blocks)
+        if isinstance(df.index, pd.RangeIndex):
+            df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    pending, n_pending, n_read = [], 0, 0
+    for batch in batches:
+        pending.append(batch)
+        n_pending += batch.num_rows
+        while n_pending >= chunksize:
+            table = pyarrow.Table.from_batches(pending)
+            yield to_pandas(table.slice(0, chunksize), n_read)
+            n_read += chunksize
+            table = table.slice(chunksize)
+            pending, n_pending = table.to_batches(), table.num_rows
+    if n_pending:
+        yield to_pandas(pyarrow.Table.from_batches(pending), n_read)
+
+
+def read_parquet(path, usecols=None, chunksize=None, memory_map=True, split_blocks=False, **kwargs):
+    """Read Parquet file with pyarrow.
+
+    :param str path: path of the file
+    :param list usecols: columns to read (default: all columns)
+    :param int chunksize: if set, return iterator over dataframes of chunksize records, read by row group
+    :param bool memory_map: memory-map the file instead of reading it into memory
+    :param bool split_blocks: do not consolidate columns of equal type in the dataframe, which avoids copying
+        the columns; numeric columns without missing values then refer to the Arrow data directly
+    :param kwargs: keyword arguments passed on to pyarrow.parquet.read_table, e.g. filters, or to
+        ParquetFile.iter_batches if chunksize is set
+    :returns: dataframe or iterator over dataframes
+    """
+    parquet = _pyarrow().parquet
+    if chunksize:
+        parquet_file = parquet.ParquetFile(path, memory_map=memory_map)
+        return _arrow_chunks(parquet_file.iter_batches(batch_size=chunksize, columns=usecols, **kwargs),
+                             chunksize, split_blocks)
+    return parquet.read_table(path, columns=usecols, memory_map=memory_map, **kwargs).to_pandas(
+        split_blocks=split_blocks)
+
+
+def read_arrow(path, usecols=None, chunksize=None, memory_map=True, split_blocks=False):
+    """Read Feather or Arrow IPC file with pyarrow.
+
+    :param str path: path of the file
+    :param list usecols: columns to read (default: all columns)
+    :param int chunksize: if set, return iterator over dataframes of chunksize records, read by record batch;
+        requires the Arrow IPC file format, i.e. Feather version 2
+    :param bool memory_map: memory-map the file instead of reading it into memory
+    :param bool split_blocks: do not consolidate columns of equal type in the dataframe, which avoids copying
+        the columns; numeric columns without missing values then refer to the Arrow data directly
+    :returns: dataframe or iterator over dataframes
+    """
+    pyarrow = _pyarrow()
+    if chunksize:
+        import pyarrow.ipc
+        source = pyarrow.memory_map(path) if memory_map else pyarrow.OSFile(path)
+        reader = pyarrow.ipc.open_file(source)
+        batches = (reader.get_batch(it) for it in range(reader.num_record_batches))
+        if usecols is not None:
+            batches = (batch.select(usecols) for batch in batches)
+        return _arrow_chunks(batches, chunksize, split_blocks)
+    import pyarrow.feather
+    return pyarrow.feather.read_table(path, columns=usecols, memory_map=memory_map).to_pandas(
+        split_blocks=split_blocks)
+
+
+def _frame_chunks(frames, chunksize):
+    """Regroup dataframes into dataframes of chunksize records.
+
+    All dataframes but the last have exactly chunksize records, as read_csv
+    chunks.
+    """
+    pending, n_pending = [], 0
+    for frame in frames:
+        pending.append(frame)
+        n_pending += len(frame.index)
+        while n_pending >= chunksize:
+            df = pd.concat(pending) if len(pending) > 1 else pending[0]
+            yield df.iloc[:chunksize]
+            pending, n_pending = [df.iloc[chunksize:]], n_pending - chunksize
+    if n_pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+
+def read_hdf(path, chunksize=None, **kwargs):
+    """Read HDF5 file with Pandas.
+
+    :param str path: path of the file
+    :param int chunksize: if set, return iterator over dataframes of chunksize records; requires table format
+    :param kwargs: keyword arguments passed on to pandas.read_hdf, e.g. key, columns, where, start, stop
+    :returns: dataframe or iterator over dataframes
+    """
+    if chunksize:
+        # the table iterator reads the records from start to stop in chunks and closes the file at the end
+        return iter(pd.read_hdf(path, chunksize=chunksize, **kwargs))
+    return pd.read_hdf(path, **kwargs)
+
+
+def read_json_lines(path, **kwargs):
+    """Read JSON-lines file, with one JSON record per line, with Pandas.
+
+    :param str path: path of the file
+    :param kwargs: keyword arguments passed on to pandas.read_json, e.g. chunksize
+    :returns: dataframe or iterator over dataframes
+    """
+    return pd.read_json(path, lines=True, **kwargs)
+
+
+def read_sql(path, con, chunksize=None, **kwargs):
+    """Read results of SQL query in file with Pandas.
+
+    :param str path: path of the file with the query
+    :param con: SQLAlchemy connectable or database URL, or function that returns a DBAPI connection, e.g.
+        functools.partial(sqlite3.connect, db_path); the function is called for each file, and the connection is
+        closed after reading
+    :param int chunksize: if set, return iterator over dataframes of chunksize records
+    :param kwargs: keyword arguments passed on to pandas.read_sql
+    :returns: dataframe or iterator over dataframes
+    """
+    with open(path) as query_file:
+        query = query_file.read()
+    if not callable(con):
+        return pd.read_sql(query, con, chunksize=chunksize, **kwargs)
+
+    connection = con()
+    if not chunksize:
+        with contextlib.closing(connection):
+            return pd.read_sql(query, connection, **kwargs)
+    return _closing_chunks(pd.read_sql(query, connection, chunksize=chunksize, **kwargs), connection)
+
+
+def _closing_chunks(chunks, connection):
+    """Close database connection after the last chunk."""
+    with contextlib.closing(connection):
+        yield from chunks
+
+
+def read_pickle(path, chunksize=None, **kwargs):
+    """Read pickled dataframes.
+
+    The file contains a dataframe or a list of dataframes, which are
+    concatenated.  For reading in chunks, the file may also contain several
+    of these pickled one after another.
+
+    :param str path: path of the file
+    :param int chunksize: if set, return iterator over dataframes of chunksize records; the pickled objects are
+        loaded one by one, so memory usage is bounded by the largest object; requires an uncompressed file
+    :param kwargs: keyword arguments passed on to pandas.read_pickle, e.g. compression
+    :returns: dataframe or iterator over dataframes
+    """
+    if chunksize:
+        return _frame_chunks(_pickled_frames(path), chunksize)
+    obj = pd.read_pickle(path, **kwargs)
+    return pd.concat(obj) if isinstance(obj, list) else obj
+
+
+def _pickled_frames(path):
+    """Load dataframes from pickle file one by one."""
+    with open(path, 'rb') as pickle_file:
+        while True:
+            try:
+                obj = pickle.load(pickle_file)
+            except EOFError:
+                return
+            yield from (obj if isinstance(obj, list) else [obj])
+
+
 pd_readers = {'csv': pd.read_csv,
               'tsv': pd.read_csv,
               'xls': pd.read_excel,
               'xlsx': pd.read_excel,
               'json': pd.read_json,
-              'h5': pd.read_hdf,
-              'sql': pd.read_sql,
+              'jsonl': read_json_lines,
+              'ndjson': read_json_lines,
+              'h5': read_hdf,
+              'hdf': read_hdf,
+              'hdf5': read_hdf,
+              'sql': read_sql,
               'htm': pd.read_html,
               'html': pd.read_html,
               'dta': pd.read_stata,
-              'pkl': pd.read_pickle,
-              'pickle': pd.read_pickle}
+              'pkl': read_pickle,
+              'pickle': read_pickle,
+              'parquet': read_parquet,
+              'pq': read_parquet,
+              'feather': read_arrow,
+              'arrow': read_arrow,
+              'ipc': read_arrow}
+
+# readers that select columns with the usecols argument
+usecols_readers = {pd.read_csv, pd.read_excel, read_parquet, read_arrow}
+
+# operators of comparisons in simple query predicates
+_QUERY_OPS = {ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.In: 'in',
+              ast.NotIn: 'not in'}
+_REVERSED_OPS = {ast.Eq: ast.Eq, ast.NotEq: ast.NotEq, ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt,
+                 ast.GtE: ast.LtE}
+
+# comparison operators of Parquet filters; comparisons with missing values differ for other operators
+_FILTER_OPS = {'==', '<', '<=', '>', '>=', 'in'}
+
+
+def parse_query(query):
+    """Parse simple query predicate.
+
+    A simple predicate compares columns with constants, e.g. "x > 0" or
+    "y in ['a', 'b']", and combines these comparisons with "and", "or",
+    "not", or the bitwise operators of these.  Queries with local variables
+    (@), function calls, or arithmetic are not simple.
+
+    :param str query: query expression, see pandas.DataFrame.query
+    :returns: names of the columns in the predicate, and the comparisons as (column, operator, value) tuples if
+        the predicate is a conjunction of comparisons; None if the predicate is not simple
+    :rtype: tuple
+    """
+    try:
+        node = ast.parse(query.strip(), mode='eval').body
+    except SyntaxError:
+        return None
+    columns, comparisons = set(), []
+    conjunction = _parse_predicate(node, columns, comparisons)
+    if conjunction is None:
+        return None
+    return columns, comparisons if conjunction else None
+
+
+def _parse_predicate(node, columns, comparisons):
+    """Collect columns and comparisons of predicate node.
+
+    :returns: True if the predicate is a conjunction of comparisons, False if it is another simple predicate, and
+        None if it is not simple
+    """
+    if isinstance(node, ast.BoolOp) or (isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr))):
+        operands = node.values if isinstance(node, ast.BoolOp) else [node.left, node.right]
+        results = [_parse_predicate(_, columns, comparisons) for _ in operands]
+        if None in results:
+            return None
+        return isinstance(node.op, (ast.And, ast.BitAnd)) and all(results)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+        return None if _parse_predicate(node.operand, columns, []) is None else False
+
+    # comparison of a column with a constant
+    if not isinstance(node, ast.Compare) or len(node.ops) != 1:
+        return None
+    left, right, op = node.left, node.comparators[0], type(node.ops[0])
+    if isinstance(right, ast.Name) and op in _REVERSED_OPS:
+        left, right, op = right, left, _REVERSED_OPS[op]
+    if not isinstance(left, ast.Name) or left.id == 'index' or op not in _QUERY_OPS:
+        return None
+    try:
+        value = ast.literal_eval(right)
+    except ValueError:
+        return None
+    columns.add(left.id)
+    comparisons.append((left.id, _QUERY_OPS[op], value))
+    return True
+
+
+def select_records(df, query_set=(), select_columns=()):
+    """Select records and columns of dataframe.
+
+    :param pandas.DataFrame df: input dataframe
+    :param list query_set: query expressions to evaluate in order, see pandas.DataFrame.query
+    :param list select_columns: column names to select after querying
+    :returns: dataframe with selected records and columns
+    :rtype: pandas.DataFrame
+    """
+    for query in query_set:
+        df = df.query(query)
+    if select_columns and list(df.columns) != list(select_columns):
+        df = df[list(select_columns)]
+    return df
+
+
+def _read_selected(path, reader, query_set=(), select_columns=(), **kwargs):
+    """Read dataframe and select records and columns."""
+    return select_records(pandasReader(path, reader, **kwargs), query_set, select_columns)
 
 
 class ReadToDf(Link):
@@ -64,7 +360,19 @@ class ReadToDf(Link):
         :param bool itr_over_files: Iterate over individual files, default is false.
             If false, are files are collected in one dataframe. NB chunksize takes priority!
         :param int chunksize: Default is none. If positive integer then will always iterate.
-            chunksize requires pd.read_csv or pd.read_table.
+            chunksize requires a CSV, JSON-lines (or JSON with lines=True), HDF5 table, SQL, pickle, Parquet,
+            Feather, or Arrow file, or a reader that returns an iterator over dataframes.
+        :param int n_workers: number of files read concurrently if the files are collected in one dataframe.
+            Default is 1.
+        :param bool worker_processes: read files in worker processes instead of threads, default is false.
+            Processes also parallelize parsing that holds the Python interpreter lock, at the cost of
+            transferring the dataframes; the reader must then be picklable, e.g. not a lambda.
+        :param int prefetch: number of datasets (files or chunks) read ahead by a background thread when iterating,
+            while the chain processes the current dataset. Default is 0: read when requested.
+        :param list query_set: query expressions to select records of each file or chunk while reading,
+            see pandas.DataFrame.query. Columns and comparisons in simple queries are passed on to the reader,
+            as usecols and Parquet filters, if supported.
+        :param list select_columns: column names to select after querying
         :param kwargs: all other key word arguments are passed on to the pandas reader.
         """
         # initialize Link, pass name from kwargs
@@ -72,7 +380,8 @@ class ReadToDf(Link):
 
         # process and register all relevant kwargs. kwargs are added as attributes of the link.
         # second arg is default value for an attribute. key is popped from kwargs.
-        self._process_kwargs(kwargs, path='', key='', reader=None, itr_over_files=False, chunksize=None)
+        self._process_kwargs(kwargs, path='', key='', reader=None, itr_over_files=False, chunksize=None,
+                             n_workers=1, worker_processes=False, prefetch=0, query_set=[], select_columns=[])
 
         # pass on remaining kwargs to pandas reader
         self.kwargs = copy.deepcopy(kwargs)
@@ -80,11 +389,41 @@ class ReadToDf(Link):
         self._paths = None
         self._path_itr = None
         self._current_path = None
+        self._reader_path = None
         self._latest_data_length = 0
         self._sum_data_length = 0
+        self._n_datasets = 0
         self._iterate = False
         self._reader = None
         self._usecols = self.kwargs.get('usecols', [])
+        self._prefetch_queue = None
+        self._prefetch_thread = None
+        self._prefetch_stop = None
+        self._finished = False
+
+    def get_input_keys(self):
+        """Get keys of data-store objects read by the link.
+
+        :returns: empty set; data are read from file
+        :rtype: set
+        """
+        return set()
+
+    def get_output_keys(self):
+        """Get keys of data-store objects stored by the link.
+
+        :returns: keys of the data frame and its number of records
+        :rtype: set
+        """
+        return {self.key, 'n_' + self.key, 'n_sum_' + self.key}
+
+    def get_trace_args(self):
+        """Get metadata of the link for the spans in the run trace.
+
+        :returns: key, current file, and number of datasets (files or chunks) read
+        :rtype: dict
+        """
+        return dict(store_key=self.key, path=self._current_path, chunk=self._n_datasets)
 
     def set_chunk_size(self, size):
         """Set chunksize setting.
@@ -97,6 +436,14 @@ class ReadToDf(Link):
         """Initialize the link."""
         assert isinstance(self.key, str) and self.key, 'Output key not set.'
         assert isinstance(self._usecols, list), 'Usecols not set correctly.'
+        assert isinstance(self.n_workers, int) and self.n_workers > 0, 'Number of workers must be a positive integer.'
+        assert isinstance(self.prefetch, int) and self.prefetch >= 0, 'Prefetch depth must be a non-negative integer.'
+        self._stop_prefetch()
+        self._finished = False
+        if isinstance(self.query_set, str):
+            self.query_set = [self.query_set]
+        if isinstance(self.select_columns, str):
+            self.select_columns = [self.select_columns]
 
         # construct and check list of file paths to read
         read_paths = [p for p in self.path] if not isinstance(self.path, str) else [self.path]
@@ -130,7 +477,7 @@ class ReadToDf(Link):
             assert isinstance(self.chunksize,
                               int) and self.chunksize > 0, 'Chunksize needs to be set to positive integer.'
             self._iterate = True
-            self.logger.info('chunksize = {size:d}. NB chunksize requires pd.read_csv or pd.read_table.',
+            self.logger.info('chunksize = {size:d}. NB chunksize requires a reader that returns an iterator.',
                              size=self.chunksize)
             # add back chunksize if it was a kwarg, so it's picked up by pandas.
             self.kwargs['chunksize'] = self.chunksize
@@ -139,6 +486,11 @@ class ReadToDf(Link):
         elif len(self._paths) > 1 and self.itr_over_files is True:
             self._iterate = True
         self.logger.info('File and/or chunksize iterator is active: {is_iterate}.', is_iterate=self._iterate)
+        self.repeats_chain = self._iterate
+        if self.query_set or self.select_columns:
+            self._push_down_selection()
+        if self._iterate and self.prefetch:
+            self.logger.info('Prefetching {n:d} datasets in background thread.', n=self.prefetch)
 
         return StatusCode.Success
 
@@ -154,7 +506,10 @@ class ReadToDf(Link):
         if not self._iterate:
             self.logger.debug('Reading datasets from files [{files}]',
                               files=', '.join('"{}"'.format(p) for p in self._paths))
-            df = pd.concat(pandasReader(p, self.reader, **self.kwargs) for p in self._paths)
+            dfs = self._read_files()
+            # a single dataframe is stored as is, instead of copying it in concat
+            df = dfs[0] if len(dfs) == 1 else pd.concat(dfs)
+            del dfs
             numentries = len(df.index)
         # 2. handle case where iteration has been turned on
         else:
@@ -167,16 +522,17 @@ class ReadToDf(Link):
             if self.latest_data_length() == 0:
                 assert self.is_finished(), 'Got empty dataset but not at end of iterator.'
                 # at end of loop, df == None.
-                df = pd.DataFrame(columns=self._usecols)
+                df = pd.DataFrame(columns=self.select_columns or self._usecols)
 
             # do we have more datasets to go?
             # pass this information to the (possible) repeater at the end of chain
             reqstr = 'chainRepeatRequestBy_' + self.name
             settings[reqstr] = not self.is_finished()
 
-            numentries = self.latest_data_length()
+            numentries = len(df.index)
             sumentries = self.sum_data_length()
-            self.logger.info('Read next <{n:d}> records; summing up to <{sum_n:d}>.', n=numentries, sum_n=sumentries)
+            self.logger.info('Read next <{n:d}> records; summing up to <{sum_n:d}>.', n=self.latest_data_length(),
+                             sum_n=sumentries)
             ds['n_sum_' + self.key] = sumentries
 
         # store dataframe and number of entries
@@ -185,14 +541,89 @@ class ReadToDf(Link):
 
         return StatusCode.Success
 
+    def _read_files(self):
+        """Read all input files.
+
+        With more than one worker, the files are read concurrently.
+
+        :returns: dataframes in the order of the input files
+        :rtype: list
+        """
+        paths = [str(p) for p in self._paths]
+        read = functools.partial(_read_selected, reader=self.reader, query_set=self.query_set,
+                                 select_columns=self.select_columns, **self.kwargs)
+        n_workers = min(self.n_workers, len(paths))
+        if n_workers == 1:
+            return [read(p) for p in paths]
+
+        if self.worker_processes:
+            # fork workers if possible, so they do not import the modules of the reader again
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+            executor = ProcessPoolExecutor(n_workers, mp_context=multiprocessing.get_context(start_method))
+        else:
+            executor = ThreadPoolExecutor(n_workers)
+        self.logger.debug('Reading {n:d} files with {n_workers:d} {workers}.', n=len(paths), n_workers=n_workers,
+                          workers='processes' if self.worker_processes else 'threads')
+        with executor:
+            # map returns the results in the order of the paths
+            return list(executor.map(read, paths))
+
+    def _push_down_selection(self):
+        """Pass on columns and comparisons of the selection to the reader.
+
+        The columns of the selection and of the queries are read with the
+        usecols argument, and comparisons in the queries are passed on as
+        Parquet filters.  The selection is also applied to the dataframes
+        that are read.
+        """
+        readers = {get_reader(str(p), self.reader) for p in self._paths}
+        parsed = [parse_query(q) for q in self.query_set]
+        if self.select_columns and 'usecols' not in self.kwargs and readers <= usecols_readers \
+                and None not in parsed:
+            query_columns = set().union(*(p[0] for p in parsed)) - set(self.select_columns)
+            self._usecols = self.kwargs['usecols'] = list(self.select_columns) + sorted(query_columns)
+            self.logger.debug('Reading columns [{columns}].', columns=', '.join(self._usecols))
+        if readers == {read_parquet} and not self.chunksize and 'filters' not in self.kwargs:
+            filters = []
+            for comparisons in (p[1] for p in parsed if p is not None and p[1] is not None):
+                for column, op, value in comparisons:
+                    if op == '==' and isinstance(value, (list, tuple)):
+                        # a comparison with a list selects the values in the list
+                        op = 'in'
+                    if op in _FILTER_OPS and (op == 'in') == isinstance(value, (list, tuple)):
+                        filters.append((column, op, value))
+            if filters:
+                self.kwargs['filters'] = filters
+                self.logger.debug('Reading Parquet records with filters {filters}.', filters=filters)
+
+    def finalize(self):
+        """Finalize the link.
+
+        Stops the prefetch thread if it is still reading.
+        """
+        self._stop_prefetch()
+
+        return StatusCode.Success
+
     def is_finished(self) -> bool:
         """Try to assess if looper is done iterating over files.
 
         Assess if looper is done or if a next dataset is still coming up.
         """
+        if self.prefetch:
+            # assessed by the prefetch thread when it read the current dataset
+            return self._finished
+        return self._read_finished(self._latest_data_length)
+
+    def _read_finished(self, data_length):
+        """Assess if reading is done after reading a dataset.
+
+        :param int data_length: length of the dataset that was read last
+        :rtype: bool
+        """
         finished = self._path_itr.finished
         if isinstance(self.chunksize, int) and self.chunksize > 0:
-            finished &= (self._latest_data_length < self.chunksize)
+            finished &= (data_length < self.chunksize)
         return finished
 
     def __next__(self):
@@ -209,7 +640,10 @@ class ReadToDf(Link):
         except AttributeError:
             self._latest_data_length = 0
         self._sum_data_length += self._latest_data_length
+        self._n_datasets += data is not None
 
+        if isinstance(data, pd.DataFrame):
+            data = select_records(data, self.query_set, self.select_columns)
         return data
 
     def latest_data_length(self):
@@ -223,18 +657,89 @@ class ReadToDf(Link):
     def _next(self):
         """Pass up the next dataset in the loop.
 
+        This is either a entire file or a file chunk.  With prefetching, the
+        dataset is taken from the queue that is filled by the prefetch
+        thread.
+        """
+        if not self.prefetch:
+            data = self._read_next()
+            self._current_path = self._reader_path
+            return data
+
+        if self._prefetch_thread is None:
+            if self._finished:
+                # all datasets were passed up already
+                return None
+            self._start_prefetch()
+        data, self._current_path, self._finished, exc = self._prefetch_queue.get()
+        if exc is not None:
+            self._stop_prefetch()
+            raise exc
+        if self._finished:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
+        return data
+
+    def _start_prefetch(self):
+        """Start background thread that reads the next datasets."""
+        self._prefetch_queue = queue.Queue(maxsize=self.prefetch)
+        self._prefetch_stop = threading.Event()
+        self._prefetch_thread = threading.Thread(target=self._prefetch, name='{}-prefetch'.format(self.name),
+                                                 args=(self._prefetch_queue, self._prefetch_stop), daemon=True)
+        self._prefetch_thread.start()
+
+    def _stop_prefetch(self):
+        """Stop the prefetch thread."""
+        if self._prefetch_thread is None:
+            return
+        self._prefetch_stop.set()
+        self._prefetch_thread.join()
+        self._prefetch_thread = None
+        self._prefetch_queue = None
+
+    def _prefetch(self, data_queue, stop):
+        """Read datasets into the queue until all datasets are read.
+
+        Each queue item holds the dataset, its file path, whether reading is
+        done, and the exception raised while reading, if any.
+
+        :param queue.Queue data_queue: queue of datasets to pass up
+        :param threading.Event stop: event that stops reading
+        """
+        finished = False
+        while not (finished or stop.is_set()):
+            try:
+                data = self._read_next()
+                finished = self._read_finished(len(data.index) if isinstance(data, pd.DataFrame) else 0)
+                item = (data, self._reader_path, finished, None)
+            except Exception as exc:
+                finished = True
+                item = (None, self._reader_path, True, exc)
+
+            # wait for a free slot in the queue, unless reading is stopped
+            while not stop.is_set():
+                try:
+                    data_queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def _read_next(self):
+        """Read the next dataset.
+
         This is either a entire file or a file chunk.
         """
         data = None
 
         # 1. input file has already been set (in previous cycle),
         #    and this is still used for chunking.
-        if self._reader is not None and isinstance(self._reader, pd.io.parsers.TextFileReader):
+        if self._reader is not None and isinstance(self._reader, collections.abc.Iterator):
             try:
                 data = next(self._reader)
                 return data
             except StopIteration:
-                # TextFileReader throws stopiterator exception at end
+                # chunk iterator throws stopiterator exception at end
                 data = None
             except Exception:
                 raise Exception('Unexpected error: cannot process next dataset iteration.')
@@ -249,8 +754,8 @@ class ReadToDf(Link):
             except Exception:
                 self.logger.fatal('Could not read from new path "{path}".', path=path)
                 raise
-            self._current_path = path
-            self.logger.info('Opened new file "{path}".', path=self._current_path)
+            self._reader_path = path
+            self.logger.info('Opened new file "{path}".', path=path)
         else:
             # no new files left to open
             # (data is still None)
@@ -263,11 +768,12 @@ class ReadToDf(Link):
             data = self._reader
             # resetting the reader for next itr
             self._reader = None
-        elif isinstance(self._reader, pd.io.parsers.TextFileReader):
+        elif isinstance(self._reader, collections.abc.Iterator):
+            # a chunk iterator, e.g. a TextFileReader
             try:
                 data = next(self._reader)
             except StopIteration:
-                # TextFileReader throws stopiterator exception at end
+                # chunk iterator throws stopiterator exception at end
                 data = None
             except Exception:
                 raise Exception('Unexpected error: cannot process next dataset iteration.')
@@ -275,7 +781,7 @@ class ReadToDf(Link):
         return data
 
 
-def pandasReader(path, reader, *args, **kwargs):
+def get_reader(path, reader):
     """Pick the correct pandas reader.
 
     Based on provided reader setting, or based on file extension.
@@ -285,7 +791,15 @@ def pandasReader(path, reader, *args, **kwargs):
     if not reader:
         logger.fatal('No suitable reader found for file "{path}".', path=path)
         raise RuntimeError('unable to find suitable Pandas reader.')
-    logger.debug('Using Pandas reader "{reader!s}"', reader=reader)
     # If the reader is input as 'csv' by hand, use the lookup, else use the specified reader (as pd.read_X)
-    reader = pd_readers.get(reader) if isinstance(reader, str) else reader
+    return pd_readers.get(reader) if isinstance(reader, str) else reader
+
+
+def pandasReader(path, reader, *args, **kwargs):
+    """Read file with the correct pandas reader.
+
+    Based on provided reader setting, or based on file extension.
+    """
+    reader = get_reader(path, reader)
+    logger.debug('Using Pandas reader "{reader!s}"', reader=reader)
     return reader(path, *args, **kwargs)
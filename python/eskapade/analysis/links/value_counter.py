@@ -96,6 +96,14 @@ class ValueCounter(HistogramFillerBase):
         self._counts = {}
         self._valcnts = {}
 
+    def get_output_keys(self):
+        """Get keys of data-store objects stored by the link.
+
+        :returns: keys of the value counts and histograms
+        :rtype: set
+        """
+        return set(k for k in (self.store_key, self.store_key_counts, self.store_key_hists) if k)
+
     def initialize(self):
         """Initialize the link."""
         # check basic attribute settings
@@ -15,6 +15,7 @@ modification, are permitted according to the terms listed in the file
 LICENSE.
 """
 
+import copy
 import operator
 from collections import Counter
 
@@ -100,6 +101,30 @@ class ArrayStats:
         # to be filled in make_histogram
         self.hist = None
 
+    def __eskapade_merge__(self, other):
+        """Merge with summary of the same column in other data.
+
+        The values and weights of both summaries are concatenated.  The
+        statistics are computed if they were computed for this summary; the
+        histogram is not made.
+
+        :param ArrayStats other: summary of the other data
+        :returns: summary of the combined data
+        :rtype: ArrayStats
+        :raises ValueError: if the column names differ, or if only one summary has weights
+        """
+        if self.name != other.name:
+            raise ValueError('cannot merge statistics of columns "{}" and "{}"'.format(self.name, other.name))
+        if (self.weights is None) != (other.weights is None):
+            raise ValueError('cannot merge statistics of "{}" with and without weights'.format(self.name))
+        weights = pd.concat([self.weights, other.weights], ignore_index=True) if self.weights is not None else None
+        merged = ArrayStats(pd.concat([self.col, other.col], ignore_index=True), self.name, weights=weights,
+                            unit=self.unit, label=self.label)
+        if self.stat_vals:
+            merged.create_stats()
+
+        return merged
+
     def get_col_props(self):
         """Get column properties.
 
@@ -379,6 +404,23 @@ class GroupByStats(ArrayStats):
         else:
             raise Exception('This class is a wrapper for group-by input. Please supply a proper "groupby" key word.')
 
+    def __eskapade_merge__(self, other):
+        """Merge with group-by summary of the same column in other data.
+
+        The summaries of groups in both objects are merged.
+
+        :param GroupByStats other: group-by summary of the other data
+        :returns: group-by summary of the combined data
+        :rtype: GroupByStats
+        """
+        merged = copy.copy(self)
+        merged.stats_obj = dict(self.stats_obj)
+        for group_key, stats in other.stats_obj.items():
+            merged.stats_obj[group_key] = (merged.stats_obj[group_key].__eskapade_merge__(stats)
+                                           if group_key in merged.stats_obj else stats)
+
+        return merged
+
     def get_latex_table(self, get_stats=None):
         """Get LaTeX code string for group-by table of stats values.
 
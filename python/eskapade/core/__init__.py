@@ -1,5 +1,7 @@
 # flake8: noqa
-from eskapade.core import definitions
-from eskapade.core import persistence
-from eskapade.core import process_services
-from eskapade.core import run_utils
+from eskapade._lazy import lazy_attributes
+
+lazy_attributes(__name__, dict(definitions='eskapade.core.definitions',
+                               persistence='eskapade.core.persistence',
+                               process_services='eskapade.core.process_services',
+                               run_utils='eskapade.core.run_utils'))
@@ -0,0 +1,276 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/05
+
+Description:
+    Functions to persist data-store objects in separate files
+
+    Each object is written to its own file, in a format that depends on the
+    type of the object:
+
+        - npy: NumPy arrays (without Python objects), with numpy.save
+        - parquet: Pandas data frames without Python objects other than
+          strings, with pyarrow (if installed)
+        - pkl: all other objects, with pickle
+
+    A manifest file ties the object files together.  The manifest is
+    written after all objects have been written, so a directory without a
+    manifest does not contain a complete set of objects.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import functools
+import os
+import pickle
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from eskapade.logger import Logger
+
+MANIFEST_FILE = 'manifest.pkl'
+MANIFEST_VERSION = 1
+
+# get logging instance
+logger = Logger()
+
+
+@functools.lru_cache()
+def import_pyarrow():
+    """Import pyarrow, which is imported only when a data frame is persisted.
+
+    :return: pyarrow module, or None if pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _write_npy(obj, path):
+    import numpy as np
+    np.save(path, obj, allow_pickle=False)
+
+
+def _read_npy(path, mmap=False):
+    import numpy as np
+    return np.load(path, mmap_mode='c' if mmap else None, allow_pickle=False)
+
+
+def _write_parquet(obj, path):
+    pyarrow = import_pyarrow()
+    pyarrow.parquet.write_table(pyarrow.Table.from_pandas(obj), path)
+
+
+def _read_parquet(path, mmap=False):
+    return import_pyarrow().parquet.read_table(path, memory_map=mmap).to_pandas()
+
+
+def _write_pkl(obj, path):
+    with open(path, 'wb') as obj_file:
+        pickle.dump(obj, obj_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read_pkl(path, mmap=False):
+    with open(path, 'rb') as obj_file:
+        return pickle.load(obj_file)
+
+
+# writer and reader functions by format
+WRITERS = dict(npy=_write_npy, parquet=_write_parquet, pkl=_write_pkl)
+READERS = dict(npy=_read_npy, parquet=_read_parquet, pkl=_read_pkl)
+
+
+def _parquet_round_trip(df):
+    """Check if data frame is read back from Parquet with the same values and types.
+
+    Object columns are only stored faithfully if they hold strings; other
+    Python objects are either rejected or converted by pyarrow.
+    """
+    import pandas as pd
+    levels = [df.index.get_level_values(_) for _ in range(df.index.nlevels)]
+    for col in levels + [df.iloc[:, _] for _ in range(df.shape[1])]:
+        if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ('string', 'empty'):
+            return False
+    return True
+
+
+def object_formats(obj):
+    """Get formats in which an object can be written, in order of preference.
+
+    :param obj: object to write
+    :return: list of format names
+    :rtype: list
+    """
+    # arrays and data frames only exist if NumPy and Pandas have been imported
+    np = sys.modules.get('numpy')
+    pd = sys.modules.get('pandas')
+    if np is not None and type(obj) is np.ndarray and not obj.dtype.hasobject:
+        return ['npy', 'pkl']
+    if pd is not None and isinstance(obj, pd.DataFrame) and all(isinstance(_, str) for _ in obj.columns) \
+            and import_pyarrow() is not None and _parquet_round_trip(obj):
+        return ['parquet', 'pkl']
+    return ['pkl']
+
+
+def write_object(obj, path_base):
+    """Write object to file.
+
+    The object is written in the first format that succeeds.
+
+    :param obj: object to write
+    :param str path_base: path of the file without extension
+    :return: file name and format of the written file
+    :rtype: tuple
+    :raises: Exception if the object cannot be written in any format
+    """
+    formats = object_formats(obj)
+    for fmt in formats:
+        path = '{0:s}.{1:s}'.format(path_base, fmt)
+        try:
+            WRITERS[fmt](obj, path)
+            return os.path.basename(path), fmt
+        except Exception as exc:
+            if os.path.exists(path):
+                os.remove(path)
+            if fmt == formats[-1]:
+                raise exc
+            logger.debug('Unable to write object of type "{type}" as {format}; trying next format.',
+                         type=type(obj).__name__, format=fmt)
+
+
+def read_object(dir_path, entry, mmap=False):
+    """Read object from file.
+
+    :param str dir_path: path of the directory with object files
+    :param dict entry: manifest entry of the object
+    :param bool mmap: memory-map the file, if supported by its format (copy-on-write for npy)
+    :return: object
+    """
+    return READERS[entry['format']](os.path.join(dir_path, entry['file']), mmap=mmap)
+
+
+def link_object(src_dir, entry, path_base):
+    """Link file of a previously written object.
+
+    A hard link to the file is created.  The file is copied if it cannot be
+    linked, e.g. because it is on a different file system.
+
+    :param str src_dir: path of the directory with the previously written file
+    :param dict entry: manifest entry of the previously written object
+    :param str path_base: path of the new file without extension
+    :return: manifest entry of the linked object
+    :rtype: dict
+    """
+    src_path = os.path.join(src_dir, entry['file'])
+    path = '{0:s}.{1:s}'.format(path_base, entry['format'])
+    try:
+        os.link(src_path, path)
+    except OSError:
+        shutil.copyfile(src_path, path)
+
+    return dict(entry, file=os.path.basename(path))
+
+
+def write_objects(keys, get_object, dir_path, n_workers=None, link_from=None, on_written=None):
+    """Write objects to separate files in parallel.
+
+    Objects that cannot be written are skipped with a warning.  Objects that
+    have not changed since they were written before can be linked instead of
+    written again.
+
+    :param list keys: keys of the objects to write
+    :param get_object: function that returns the object for a key
+    :param str dir_path: path of the directory to write the files and manifest to
+    :param int n_workers: number of writer threads (default: number of CPUs)
+    :param dict link_from: directory path and manifest entry by key of unchanged objects
+    :param on_written: function called with the key of each object after it has been written
+    :return: manifest with an entry for each written object
+    :rtype: dict
+    """
+    os.makedirs(dir_path, exist_ok=True)
+    link_from = link_from or {}
+
+    def _write(index, key):
+        entry = _write_entry(index, key)
+        if on_written:
+            on_written(key)
+        return entry
+
+    def _write_entry(index, key):
+        path_base = os.path.join(dir_path, '{:06d}'.format(index))
+        if key in link_from:
+            try:
+                return link_object(*link_from[key], path_base=path_base)
+            except OSError as exc:
+                logger.debug('Unable to link file of object "{key!s}"; writing object: {exc!s}', key=key, exc=exc)
+        obj = get_object(key)
+        try:
+            file_name, fmt = write_object(obj, path_base)
+        except Exception as exc:
+            logger.warning('Failed to persist object "{key!s}": {exc!s}', key=key, exc=exc)
+            return None
+        return dict(file=file_name, format=fmt, type=type(obj))
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        entries = list(executor.map(_write, range(len(keys)), keys))
+
+    manifest = dict(version=MANIFEST_VERSION,
+                    objects=dict((key, entry) for key, entry in zip(keys, entries) if entry is not None))
+    write_manifest(manifest, dir_path)
+
+    return manifest
+
+
+def write_manifest(manifest, dir_path):
+    """Write manifest file.
+
+    :param dict manifest: manifest of object files
+    :param str dir_path: path of the directory with object files
+    """
+    path = os.path.join(dir_path, MANIFEST_FILE)
+    with open(path + '.tmp', 'wb') as manifest_file:
+        pickle.dump(manifest, manifest_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+
+def read_manifest(dir_path):
+    """Read manifest file.
+
+    :param str dir_path: path of the directory with object files
+    :return: manifest of object files
+    :rtype: dict
+    :raises: RuntimeError if the manifest has an unknown version
+    """
+    with open(os.path.join(dir_path, MANIFEST_FILE), 'rb') as manifest_file:
+        manifest = pickle.load(manifest_file)
+    if manifest.get('version') != MANIFEST_VERSION:
+        logger.fatal('Unknown version of manifest in "{path}": {version!s}.',
+                     path=dir_path, version=manifest.get('version'))
+        raise RuntimeError('Unknown manifest version.')
+
+    return manifest
+
+
+def read_objects(dir_path, n_workers=None):
+    """Read all objects in manifest in parallel.
+
+    :param str dir_path: path of the directory with object files
+    :param int n_workers: number of reader threads (default: number of CPUs)
+    :return: objects by key
+    :rtype: dict
+    """
+    entries = read_manifest(dir_path)['objects']
+    keys = list(entries)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        objects = list(executor.map(lambda k: read_object(dir_path, entries[k]), keys))
+
+    return dict(zip(keys, objects))
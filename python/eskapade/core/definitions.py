@@ -22,8 +22,6 @@ import collections
 import os
 from enum import IntEnum, unique
 
-from pkg_resources import resource_filename
-
 from eskapade.logger import LogLevel
 
 
@@ -184,13 +182,21 @@ CONFIG_VARS['run'] = ['analysisName',
                       'interactive',
                       'logLevel',
                       'logFormat',
-                      'doCodeProfiling', ]
+                      'logQueue',
+                      'doCodeProfiling',
+                      'profileTargets',
+                      'profileMemoryTop', ]
 
 CONFIG_VARS['chains'] = ['beginWithChain',
                          'endWithChain',
                          'storeResultsEachChain',
                          'storeResultsOneChain',
-                         'doNotStoreResults', ]
+                         'doNotStoreResults',
+                         'storeResultsInBackground',
+                         'nChainWorkers',
+                         'checkpointInterval',
+                         'resumeFromCheckpoint',
+                         'pushDownSelections', ]
 
 CONFIG_VARS['file_io'] = ['esRoot',
                           'resultsDir',
@@ -205,11 +211,42 @@ CONFIG_VARS['db_io'] = ['all_mongo_collections', ]
 
 CONFIG_VARS['rand_gen'] = ['seeds', ]
 
+CONFIG_VARS['data_store'] = ['dataStoreMemoryBudget',
+                             'dataStoreSpillDir',
+                             'dataStoreReleaseKeys',
+                             'dataStoreKeepKeys',
+                             'dataStorePersistFormat',
+                             'dataStorePersistWorkers',
+                             'dataStoreLazyImport', ]
+
+CONFIG_VARS['link_cache'] = ['linkCacheDir',
+                             'linkCacheSize', ]
+
+CONFIG_VARS['run_metrics'] = ['collectRunMetrics',
+                              'runMetricsKey',
+                              'runMetricsFile',
+                              'runTraceFile', ]
+
 CONFIG_TYPES = dict(version=int,
                     batchMode=bool,
                     interactive=bool,
+                    logQueue=bool,
                     storeResultsEachChain=bool,
                     doNotStoreResults=bool,
+                    storeResultsInBackground=bool,
+                    nChainWorkers=int,
+                    checkpointInterval=float,
+                    resumeFromCheckpoint=bool,
+                    pushDownSelections=bool,
+                    dataStoreMemoryBudget=int,
+                    dataStoreReleaseKeys=bool,
+                    dataStoreKeepKeys=list,
+                    dataStorePersistWorkers=int,
+                    dataStoreLazyImport=bool,
+                    linkCacheSize=int,
+                    collectRunMetrics=bool,
+                    profileTargets=list,
+                    profileMemoryTop=int,
                     all_mongo_collections=list, )
 
 CONFIG_DEFAULTS = dict(version=0,
@@ -217,17 +254,52 @@ CONFIG_DEFAULTS = dict(version=0,
                        interactive=False,
                        logLevel=LogLevel.INFO,
                        logFormat='%(asctime)s %(levelname)s [%(module)s]: %(message)s',
+                       logQueue=False,
                        doCodeProfiling=None,
+                       profileTargets=None,
+                       profileMemoryTop=None,
                        storeResultsEachChain=False,
                        doNotStoreResults=False,
-                       esRoot=os.getcwd() + '/',
-                       resultsDir=os.getcwd() + '/results/',
-                       dataDir=os.getcwd() + '/data/',
-                       macrosDir=os.getcwd() + '/macros/',
-                       templatesDir=resource_filename('eskapade', 'templates') + '/',
-                       configDir=os.getcwd() + '/config/',
+                       storeResultsInBackground=False,
+                       nChainWorkers=1,
+                       checkpointInterval=None,
+                       resumeFromCheckpoint=False,
+                       pushDownSelections=False,
+                       templatesDir=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates') + '/',
                        sparkCfgFile='spark.cfg',
-                       seeds=RandomSeeds(), )
+                       seeds=RandomSeeds(),
+                       dataStoreMemoryBudget=None,
+                       dataStoreSpillDir=None,
+                       dataStoreReleaseKeys=False,
+                       dataStoreKeepKeys=None,
+                       dataStorePersistFormat='pickle',
+                       dataStorePersistWorkers=None,
+                       dataStoreLazyImport=False,
+                       linkCacheDir=None,
+                       linkCacheSize=10 * 1024**3,
+                       collectRunMetrics=False,
+                       runMetricsKey='run_metrics',
+                       runMetricsFile=None,
+                       runTraceFile=None, )
+
+# defaults of directory settings, relative to the working directory
+CWD_DIR_DEFAULTS = dict(esRoot='',
+                        resultsDir='results/',
+                        dataDir='data/',
+                        macrosDir='macros/',
+                        configDir='config/', )
+
+
+def set_cwd_dir_defaults(cwd=None):
+    """Set defaults of directory settings for a working directory.
+
+    :param str cwd: path of the working directory (default: current working directory)
+    """
+    cwd = cwd or os.getcwd()
+    CONFIG_DEFAULTS.update((key, cwd + '/' + sub_dir) for key, sub_dir in CWD_DIR_DEFAULTS.items())
+
+
+set_cwd_dir_defaults()
 
 # user options in command-line arguments
 USER_OPTS = collections.OrderedDict()
@@ -237,8 +309,13 @@ USER_OPTS['run'] = ['analysis_name',
                     'interactive',
                     'log_level',
                     'log_format',
+                    'log_queue',
                     'unpickle_config',
                     'profile',
+                    'profile_target',
+                    'profile_memory',
+                    'metrics',
+                    'trace',
                     'conf_var', ]
 
 USER_OPTS['chains'] = ['begin_with',
@@ -246,7 +323,12 @@ USER_OPTS['chains'] = ['begin_with',
                        'single_chain',
                        'store_all',
                        'store_one',
-                       'store_none', ]
+                       'store_none',
+                       'store_background',
+                       'n_chain_workers',
+                       'checkpoint_interval',
+                       'resume',
+                       'push_down', ]
 
 USER_OPTS['file_io'] = ['results_dir',
                         'data_dir',
@@ -280,12 +362,24 @@ USER_OPTS_KWARGS = dict(analysis_name=dict(help='set name of analysis in run',
                                        metavar='{NOTSET,DEBUG,INFO,WARNING,ERROR,FATAL}'),
                         log_format=dict(help='set log-message format',
                                         metavar='FORMAT'),
+                        log_queue=dict(help='write log messages in a background thread',
+                                       action='store_true'),
                         unpickle_config=dict(help='interpret first CONFIG_FILE as path to pickled settings',
                                              action='store_true'),
                         profile=dict(help='run Python profiler, sort output by specified column',
                                      choices=['stdname', 'nfl', 'pcalls', 'file', 'calls', 'time', 'line',
                                               'cumulative', 'module', 'name'],
                                      metavar='{stdname,nfl,pcalls,file,calls,time,line,cumulative,module,name}'),
+                        profile_target=dict(help='profile links separately, for links or chains with name NAME',
+                                            action='append',
+                                            metavar='NAME'),
+                        profile_memory=dict(help='report top N_LINES of memory allocations of profiled links',
+                                            type=int,
+                                            metavar='N_LINES'),
+                        metrics=dict(help='collect performance metrics of links and chains',
+                                     action='store_true'),
+                        trace=dict(help='write timeline of run to TRACE_FILE, in Trace Event Format',
+                                   metavar='TRACE_FILE'),
                         conf_var=dict(help='set configuration variable',
                                       action='append',
                                       metavar='KEY=VALUE'),
@@ -301,6 +395,19 @@ USER_OPTS_KWARGS = dict(analysis_name=dict(help='set name of analysis in run',
                                        metavar='CHAIN_NAME'),
                         store_none=dict(help='do not store run-process services',
                                         action='store_true'),
+                        store_background=dict(help='store run-process services in a background thread',
+                                              action='store_true'),
+                        n_chain_workers=dict(help='execute independent chains in N_WORKERS parallel processes',
+                                             type=int,
+                                             metavar='N_WORKERS'),
+                        checkpoint_interval=dict(help='checkpoint run-process services after links, at most once '
+                                                      'every SECONDS',
+                                                 type=float,
+                                                 metavar='SECONDS'),
+                        resume=dict(help='resume execution after the latest checkpoint',
+                                    action='store_true'),
+                        push_down=dict(help='push selections down into the links that read the data',
+                                       action='store_true'),
                         results_dir=dict(help='set directory path for results output',
                                          metavar='RESULTS_DIR'),
                         data_dir=dict(help='set directory path for data',
@@ -320,12 +427,22 @@ USER_OPTS_CONF_KEYS = dict(analysis_name='analysisName',
                            batch_mode='batchMode',
                            log_level='logLevel',
                            log_format='logFormat',
+                           log_queue='logQueue',
                            profile='doCodeProfiling',
+                           profile_target='profileTargets',
+                           profile_memory='profileMemoryTop',
+                           metrics='collectRunMetrics',
+                           trace='runTraceFile',
                            begin_with='beginWithChain',
                            end_with='endWithChain',
                            store_all='storeResultsEachChain',
                            store_one='storeResultsOneChain',
                            store_none='doNotStoreResults',
+                           store_background='storeResultsInBackground',
+                           n_chain_workers='nChainWorkers',
+                           checkpoint_interval='checkpointInterval',
+                           resume='resumeFromCheckpoint',
+                           push_down='pushDownSelections',
                            spark_cfg_file='sparkCfgFile',
                            seed='seeds', )
 
@@ -16,9 +16,16 @@ modification, are permitted according to the terms listed in the file
 LICENSE.
 """
 
+import contextlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from eskapade.core.definitions import StatusCode
 from eskapade.core.meta import Processor, ProcessorSequence
 from eskapade.core.mixin import ArgumentsMixin, TimerMixin
+from eskapade.core.process_services import DataStore
+from eskapade.core.run_metrics import RunMetrics
+from eskapade.core.run_profiler import RunProfiler
+from eskapade.core.run_trace import RunTrace
 
 
 class Link(Processor, ArgumentsMixin, TimerMixin):
@@ -73,6 +80,13 @@ class Link(Processor, ArgumentsMixin, TimerMixin):
         # store() return code.
         self.if_output_exists = StatusCode.Success
 
+        # cache results of execute() across runs, see LinkCache
+        self.cache_results = False
+        # link makes its chain repeat, e.g. to iterate over data in chunks, see Chain.repeats
+        self.repeats_chain = False
+        # checkpoint process services after execute(), see ProcessManager.checkpoint
+        self.checkpoint = False
+
     def _process_kwargs(self, kwargs, **name_val):
         """Process the key word arguments.
 
@@ -83,6 +97,159 @@ class Link(Processor, ArgumentsMixin, TimerMixin):
         if name_val:
             self._required_vars += list(name_val.keys())
 
+    @staticmethod
+    def _collect_keys(key_spec):
+        """Collect data-store keys from a key specification.
+
+        :param key_spec: key, link, or (nested) list of keys and links
+        :returns: set of keys or None if keys cannot be determined
+        :rtype: set
+        """
+        if key_spec is None or (isinstance(key_spec, str) and not key_spec):
+            return None
+        if isinstance(key_spec, str):
+            return {key_spec}
+        if isinstance(key_spec, Link):
+            return Link._collect_keys(key_spec.store_key)
+
+        keys = set()
+        for spec in key_spec:
+            spec_keys = Link._collect_keys(spec)
+            if spec_keys is None:
+                return None
+            keys |= spec_keys
+        return keys
+
+    def get_input_keys(self):
+        """Get keys of data-store objects read by the link.
+
+        By default, the keys are taken from the read_key attribute.  Links
+        that read objects from the data store by other means should override
+        this method.  The keys are used to determine the dependencies between
+        links, e.g. for parallel execution of a chain.
+
+        :returns: set of data-store keys or None if the keys are unknown
+        :rtype: set
+        """
+        return self._collect_keys(self.read_key)
+
+    def get_output_keys(self):
+        """Get keys of data-store objects stored or modified by the link.
+
+        By default, the keys are taken from the store_key attribute.  Links
+        that store objects in the data store by other means, or modify their
+        input objects in place, should override this method.
+
+        :returns: set of data-store keys or None if the keys are unknown
+        :rtype: set
+        """
+        return self._collect_keys(self.store_key)
+
+    def push_down(self, link):
+        """Push operations of the link down into the preceding link.
+
+        Called before initialization if the "pushDownSelections" setting is
+        true, for a link that only reads objects stored by the preceding
+        link in the chain, and only if the objects are not read by other
+        links.  A link that selects data may let the preceding link select
+        the data while it reads them, e.g. to avoid storing records that are
+        discarded.  The link must still give the same results if the
+        preceding link does not apply the selection.
+
+        :param Link link: preceding link in the chain
+        :returns: True if operations were pushed down into the preceding link
+        :rtype: bool
+        """
+        return False
+
+    def get_trace_args(self):
+        """Get metadata of the link for the spans in the run trace.
+
+        Links may add metadata about their progress, e.g. the number of the
+        chunk of data that was processed.
+
+        :return: metadata by name
+        :rtype: dict
+        """
+        return dict(read_key=self.read_key, store_key=self.store_key)
+
+    def __measured(self, phase, wrapper, count_rows=False):
+        """Call wrapper of a phase and record its metrics, trace span, and profile if enabled.
+
+        :param str phase: name of the phase
+        :param wrapper: wrapper function of the phase
+        :param bool count_rows: count rows of input and output data frames
+        :return: status code returned by the wrapper
+        :rtype: StatusCode
+        """
+        from eskapade import process_manager
+        metrics = process_manager.service(RunMetrics)
+        trace = process_manager.service(RunTrace)
+        profiler = process_manager.service(RunProfiler)
+        if not metrics.enabled and not trace.enabled and not profiler.enabled:
+            return wrapper()
+
+        chain = str(self.parent) if self.parent is not None else None
+        with contextlib.ExitStack() as stack:
+            if profiler.enabled and profiler.is_target(chain, self.name):
+                stack.enter_context(profiler.profile(chain, self.name, phase))
+            if metrics.enabled:
+                kwargs = {}
+                if count_rows:
+                    kwargs = dict(ds=process_manager.service(DataStore), in_keys=self.get_input_keys(),
+                                  out_keys=self.get_output_keys())
+                stack.enter_context(metrics.measure(chain, self.name, phase, **kwargs))
+            if trace.enabled:
+                stack.enter_context(trace.span('{0:s} {1:s}'.format(self.name, phase), 'link',
+                                               lambda: dict(self.get_trace_args(), chain=chain, phase=phase)))
+            return wrapper()
+
+    def _initialize(self):
+        """Wrapper to call user implemented initialize."""
+        return self.__measured('initialize', super()._initialize)
+
+    def _execute(self):
+        """Wrapper to call user implemented execute.
+
+        If the link caches its results, the results are restored from the
+        link cache if the link was executed before with the same code,
+        settings, and input objects.  Otherwise, the link is executed and its
+        results are stored in the cache.
+        """
+        return self.__measured('execute', self.__execute, count_rows=True)
+
+    def _finalize(self):
+        """Wrapper to call user implemented finalize."""
+        return self.__measured('finalize', super()._finalize)
+
+    def __execute(self):
+        """Execute link or restore its results from the link cache."""
+        if not self.cache_results:
+            return super()._execute()
+
+        # results of links that accumulate state over executions are not determined by their input alone
+        stateful = 'stores results at finalize' if getattr(self, 'store_at_finalize', False) else \
+            'is executed repeatedly' if self.parent is not None and self.parent.repeats else None
+        if stateful:
+            self.logger.warning('Link "{link!s}" {reason}; not caching results.', link=self, reason=stateful)
+            self.cache_results = False
+            return super()._execute()
+
+        from eskapade import process_manager
+        from eskapade.core.link_cache import LinkCache
+        cache = process_manager.service(LinkCache)
+        ds = process_manager.service(DataStore)
+        cache_key = cache.link_key(self, ds) if cache.cache_dir else None
+        if cache_key and cache.restore(cache_key, ds):
+            self.logger.info('Restored results of link "{link!s}" from cache.', link=self)
+            return StatusCode.Success
+
+        status = super()._execute()
+        if cache_key and status == StatusCode.Success:
+            cache.store(cache_key, self.get_output_keys(), ds)
+
+        return status
+
     def summary(self):
         """Print a summary of the main settings of the link."""
         self.logger.debug('Link: {name}', name=self.name)
@@ -273,6 +440,35 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
     >>>
     >>> # Run everything.
     >>> process_manager.run()
+
+    By default, the links are executed one after another.  Links that do not
+    depend on each other can be executed in parallel threads by setting the
+    number of workers of the chain:
+
+    >>> io_chain.n_workers = 8
+
+    The dependencies between links are determined from the data-store keys
+    they read and store, see :meth:`Link.get_input_keys` and
+    :meth:`Link.get_output_keys`.  A link with unknown keys acts as a barrier:
+    it is executed only after all preceding links have finished, and no later
+    link is started before it has finished.  So does a link that repeats the
+    chain, see :attr:`Link.repeats_chain`, because it depends on the settings
+    of the other links, e.g. the repeat request of a reader.  Only execution is done in
+    parallel; links are always initialized and finalized in order.
+
+    Chains may declare the data-store keys they consume and produce:
+
+    >>> io_chain.input_keys = []
+    >>> io_chain.output_keys = ['foo']
+
+    Consecutive chains that declare their keys and do not share any of them
+    are executed in parallel processes if the "nChainWorkers" setting is
+    larger than one.  Only the objects with the declared output keys are
+    merged back into the data store of the main process.
+
+    Data-store objects that are no longer needed can be released by the
+    chain.  The process manager schedules these releases if the
+    "dataStoreReleaseKeys" setting is true, see :attr:`key_releases`.
     """
 
     def __init__(self, name, process_manager=None):
@@ -281,6 +477,23 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
 
         self.prev_chain_name = ''  # type: str
         self.enabled = True  # type: bool
+        self.n_workers = 1  # type: int
+        self.input_keys = None  # type: list
+        self.output_keys = None  # type: list
+
+        # Data-store objects to release after execution of a link, by link
+        # name, or after finalization of the chain, under None.  For each
+        # key, True means delete the object and False means mark it as the
+        # first candidate to be spilled to disk.
+        self.key_releases = {}  # type: dict
+
+        # Name of the link after which execution is resumed from a
+        # checkpoint; the links up to and including this link are skipped
+        # in the first execution of the chain.
+        self.resume_after = None  # type: str
+
+        # A link requested repetition of the chain since initialization.
+        self._repeated = False  # type: bool
 
         # We register ourselves with the process manager.
         # If none is specified register with the default
@@ -290,41 +503,153 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
 
         process_manager.add(self)
 
+    def __check_status(self, link: Link, status: StatusCode) -> bool:
+        """Check the status code returned by a link.
+
+        :return: True if the processing of the chain should be stopped.
+        :rtype: bool
+        """
+        # A link may fail during initialization, execution, and finalization.
+        if status == StatusCode.Failure:
+            self.logger.fatal('Link "{link!s}" returned "{code!s}" in chain "{chain!s}"!',
+                              link=link, code=status, chain=self)
+        # A link may request to skip the rest of the processing during initialization and execution.
+        # Why should a link decide to skip the chain it is in during execution?
+        # When an essential input collection is empty.
+        elif status == StatusCode.SkipChain:
+            self.logger.warning('Skipping chain "{chain!s} as requested by link "{link!s}"!',
+                                chain=self, link=link)
+        # A link may request to skip the rest of the execution of the chain (but do perform finalize).
+        elif status == StatusCode.BreakChain:
+            self.logger.warning('Breaking of exection of chain "{chain!s} as requested by link "{link!s}"!',
+                                chain=self, link=link)
+        # A link may request that the chain needs to be repeated during execution.
+        # When looping over input file in chunks.
+        elif status == StatusCode.RepeatChain:
+            self.logger.warning('Repeating chain "{chain!s}" as requested by link "{link!s}"!',
+                                chain=self, link=link)
+        # Default, is to log an unhandled status code from the chain.
+        elif status != StatusCode.Success:
+            self.logger.fatal('Unhandled StatusCode "{status!s}" from link "{link!s}" in "{chain!s}"!',
+                              status=status, link=link, chain=self)
+        else:
+            return False
+
+        return True
+
+    def release_keys(self, *link_names) -> None:
+        """Release data-store objects scheduled for release.
+
+        :param link_names: names of the links, or None for the chain, for which
+            the scheduled objects are released
+        """
+        releases = [self.key_releases[_] for _ in link_names if _ in self.key_releases]
+        if not releases:
+            return
+
+        ds = self.parent.service(DataStore)
+        for keys in releases:
+            for key, drop in keys.items():
+                if key not in ds:
+                    continue
+                if drop:
+                    self.logger.debug('Releasing data-store object "{key}" after its last use.', key=key)
+                    del ds[key]
+                else:
+                    ds.mark_cold(key)
+
+    def __execute_link(self, link: Link) -> StatusCode:
+        """Execute link, release the objects it was the last to use, and checkpoint if due."""
+        if self.resume_after:
+            # link was executed before the checkpoint
+            self.logger.debug('Skipping link "{link!s}", executed before checkpoint.', link=link)
+            if link.name == self.resume_after:
+                self.resume_after = None
+            return StatusCode.Success
+
+        status = link._execute()
+        if status == StatusCode.Success:
+            self.release_keys(link.name)
+            if self.parent is not None and self.parent.checkpoint_due(link):
+                self.parent.checkpoint(self, link)
+
+        return status
+
     def __exec(self, phase_callback) -> StatusCode:
         status = StatusCode.Success
 
         for _ in self:
             status = phase_callback(_)
-
-            # A link may fail during initialization, execution, and finalization.
-            if status == StatusCode.Failure:
-                self.logger.fatal('Link "{link!s}" returned "{code!s}" in chain "{chain!s}"!',
-                                  link=_, code=status, chain=self)
-                break
-            # A link may request to skip the rest of the processing during initialization and execution.
-            # Why should a link decide to skip the chain it is in during execution? When an essential input collection is empty.
-            elif status == StatusCode.SkipChain:
-                self.logger.warning('Skipping chain "{chain!s} as requested by link "{link!s}"!',
-                                    chain=self, link=_)
-                break
-            # A link may request to skip the rest of the execution of the chain (but do perform finalize).
-            elif status == StatusCode.BreakChain:
-                self.logger.warning('Breaking of exection of chain "{chain!s} as requested by link "{link!s}"!',
-                                    chain=self, link=_)
-                break
-            # A link may request that the chain needs to be repeated during execution. When looping over input file in chunks.
-            elif status == StatusCode.RepeatChain:
-                self.logger.warning('Repeating chain "{chain!s}" as requested by link "{link!s}"!',
-                                    chain=self, link=_)
-                break
-            # Default, is to log an unhandled status code from the chain.
-            elif status != StatusCode.Success:
-                self.logger.fatal('Unhandled StatusCode "{status!s}" from link "{link!s}" in "{chain!s}"!',
-                                  status=status, link=_, chain=self)
+            if self.__check_status(_, status):
                 break
 
         return status
 
+    @staticmethod
+    def __link_dependencies(links) -> list:
+        """Determine on which preceding links each link depends.
+
+        Link B depends on a preceding link A if B reads an object that A
+        stores, or if B stores an object that A reads or stores.  If the keys
+        of either link are unknown, or if either link repeats the chain, B
+        depends on A.
+
+        :param list links: links in order of execution
+        :return: for each link, the set of indices of the links it depends on
+        :rtype: list
+        """
+        link_keys = [(None, None) if _.repeats_chain else (_.get_input_keys(), _.get_output_keys()) for _ in links]
+        deps = []
+        for i, (in_i, out_i) in enumerate(link_keys):
+            deps.append(set())
+            for j, (in_j, out_j) in enumerate(link_keys[:i]):
+                if None in (in_i, out_i, in_j, out_j) or in_i & out_j or out_i & (in_j | out_j):
+                    deps[i].add(j)
+
+        return deps
+
+    def __exec_parallel(self, phase_callback) -> StatusCode:
+        """Execute links in parallel threads, respecting their dependencies.
+
+        No new links are started once a link has returned a status other than
+        success.  The returned status is the status of the first link, in the
+        order of the chain, that did not succeed.
+
+        :return: status code
+        :rtype: StatusCode
+        """
+        links = list(self)
+        deps = self.__link_dependencies(links)
+        self.logger.debug('Executing {n:d} links of chain "{chain!s}" with {n_workers:d} workers.',
+                          n=len(links), chain=self, n_workers=self.n_workers)
+
+        statuses = {}
+        pending = list(range(len(links)))
+        running = {}
+        stop = False
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            while pending or running:
+                # start links for which all dependencies have been executed
+                if not stop:
+                    for i in [_ for _ in pending if deps[_].issubset(statuses)]:
+                        pending.remove(i)
+                        running[executor.submit(phase_callback, links[i])] = i
+                if not running:
+                    break
+
+                # wait for links to finish
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    statuses[i] = future.result()
+                    stop |= statuses[i] != StatusCode.Success
+
+        for i in sorted(statuses):
+            if self.__check_status(links[i], statuses[i]):
+                return statuses[i]
+
+        return StatusCode.Success
+
     def add(self, link: Link) -> None:
         """Add a link to the chain.
 
@@ -384,8 +709,9 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
         self.logger.debug('Initializing chain "{chain!s}".', chain=self)
 
         self.start_timer()
+        self._repeated = False
 
-        status = self.__exec(Processor._initialize)
+        status = self.__exec(Link._initialize)
 
         if status == StatusCode.Success:
             self.logger.debug('Successfully initialized chain "{chain!s}".', chain=self)
@@ -400,10 +726,19 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
         """
         self.logger.debug('Executing chain "{chain!s}".', chain=self)
 
-        status = self.__exec(Processor._execute)
+        if self.n_workers > 1 and not self.resume_after:
+            # Links that read the same object may finish in any order,
+            # so objects are only released after all links have been executed.
+            status = self.__exec_parallel(Link._execute)
+            if status == StatusCode.Success:
+                self.release_keys(*[_.name for _ in self])
+        else:
+            status = self.__exec(self.__execute_link)
 
         if status == StatusCode.Success:
             self.logger.debug('Successfully executed chain "{chain!s}".', chain=self)
+        elif status == StatusCode.RepeatChain:
+            self._repeated = True
 
         return status
 
@@ -415,9 +750,10 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
         """
         self.logger.debug('Finalizing chain "{chain!s}".', chain=self)
 
-        status = self.__exec(Processor._finalize)
+        status = self.__exec(Link._finalize)
 
         if status == StatusCode.Success:
+            self.release_keys(None)
             total_time = self.stop_timer()
             self.logger.debug('Successfully finalized chain "{chain!s}".', chain=self)
             self.logger.debug('Chain "{chain!s}" took {sec:.2f} seconds to complete.',
@@ -430,6 +766,19 @@ class Chain(Processor, ProcessorSequence, TimerMixin):
         self.parent = None
         super().clear()
 
+    @property
+    def repeats(self) -> bool:
+        """Check if the links of the chain may be executed more than once.
+
+        A chain repeats if one of its links is known to repeat it, see
+        :attr:`Link.repeats_chain`, or if a link requested a repetition since
+        the chain was initialized.
+
+        :return: True if the chain repeats
+        :rtype: bool
+        """
+        return self._repeated or any(_.repeats_chain for _ in self)
+
     @property
     def n_links(self) -> int:
         """Return the number of links in the chain.
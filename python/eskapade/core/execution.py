@@ -18,7 +18,7 @@ import sys
 import eskapade.utils
 from eskapade.core.process_manager import process_manager
 from eskapade.core.process_services import ConfigObject
-from eskapade.logger import Logger
+from eskapade.logger import Logger, LogLevel, global_log_publisher
 
 logger = Logger()
 
@@ -34,6 +34,16 @@ def reset_eskapade(skip_config=False):
         process_manager.service(settings)
 
 
+def set_log_level(settings):
+    """Set logging level of Eskapade from the settings.
+
+    :param ConfigObject settings: analysis settings
+    """
+    log_level = settings.get('logLevel')
+    if log_level:
+        global_log_publisher.log_level = LogLevel[log_level] if isinstance(log_level, str) else LogLevel(log_level)
+
+
 def eskapade_run(settings=None):
     """Run Eskapade.
 
@@ -69,6 +79,7 @@ def eskapade_run(settings=None):
                                                                  e_fill=(width - len(msg) - 1) // 2))
         logger.info(fence * width)
 
+    set_log_level(settings)
     message('Welcome to Eskapade!')
 
     # check for batch mode
@@ -90,8 +101,17 @@ def eskapade_run(settings=None):
     if not settings['analysisName']:
         raise RuntimeError('analysis name is not set')
 
+    # set logging level, which may have been set by the macro, and write log
+    # messages in a background thread if requested
+    set_log_level(settings)
+    if settings.get('logQueue'):
+        global_log_publisher.enable_queue()
+
     # standard execution from now on
-    status = process_manager.run()
+    try:
+        status = process_manager.run()
+    finally:
+        global_log_publisher.disable_queue()
 
     message('Leaving Eskapade. Bye!')
 
@@ -0,0 +1,251 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/12
+
+Description:
+    Content-addressed cache of link results
+
+    The results of a link are cached under a key that is computed from the
+    code and settings of the link and from the data-store objects it reads.
+    If a link is executed again with the same code, settings, and input, its
+    results are restored from the cache instead of computed.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import types
+
+from eskapade.core import data_store_io
+from eskapade.core.process_services import ProcessService
+
+# maximum depth of nested objects to fingerprint
+MAX_DEPTH = 32
+
+
+def fingerprint(obj, hasher=None, depth=0):
+    """Compute fingerprint of an object.
+
+    The fingerprint depends on the content of the object.  Functions and
+    classes are fingerprinted by their code.
+
+    :param obj: object to fingerprint
+    :param hasher: hash object to update (default: new SHA-1 hash)
+    :param int depth: depth of object in nested objects
+    :return: updated hash object
+    :raises: TypeError if the object cannot be fingerprinted
+    """
+    if hasher is None:
+        hasher = hashlib.sha1()
+    if depth > MAX_DEPTH:
+        raise TypeError('Object nested too deeply to fingerprint.')
+
+    def _update(*objs):
+        for _ in objs:
+            fingerprint(_, hasher, depth + 1)
+
+    # arrays and data frames only exist if NumPy and Pandas have been imported
+    np = sys.modules.get('numpy')
+    pd = sys.modules.get('pandas')
+
+    hasher.update(type(obj).__qualname__.encode())
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(repr(obj).encode())
+    elif isinstance(obj, (bytes, bytearray)):
+        hasher.update(obj)
+    elif pd is not None and isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        _update([str(_) for _ in getattr(obj, 'columns', [])],
+                str(obj.dtypes if isinstance(obj, pd.DataFrame) else obj.dtype))
+        try:
+            hasher.update(pd.util.hash_pandas_object(obj).values.tobytes())
+        except TypeError:
+            # unhashable values, e.g. lists
+            hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    elif np is not None and isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        _update(obj.dtype.str, obj.shape)
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        _update(len(obj), *obj)
+    elif isinstance(obj, (set, frozenset)):
+        _update(sorted(fingerprint(_).hexdigest() for _ in obj))
+    elif isinstance(obj, dict):
+        _update(sorted((fingerprint(k).hexdigest(), fingerprint(v).hexdigest()) for k, v in obj.items()))
+    elif isinstance(obj, types.CodeType):
+        hasher.update(obj.co_code)
+        _update(obj.co_consts, obj.co_names)
+    elif isinstance(obj, (types.FunctionType, types.MethodType)):
+        func = getattr(obj, '__func__', obj)
+        _update(func.__module__, func.__qualname__, func.__code__, func.__defaults__)
+        for cell in func.__closure__ or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                # empty cell
+                continue
+            # fingerprint classes in closures by name, e.g. the class used by super()
+            _update((value.__module__, value.__qualname__) if isinstance(value, type) else value)
+    elif isinstance(obj, type):
+        _update(obj.__module__, obj.__qualname__,
+                sorted((n, v) for n, v in vars(obj).items() if isinstance(v, types.FunctionType)))
+    else:
+        try:
+            hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as exc:
+            raise TypeError('Unable to fingerprint object of type "{}": {!s}'.format(type(obj).__name__, exc))
+
+    return hasher
+
+
+class LinkCache(ProcessService):
+    """Content-addressed cache of link results.
+
+    The cache is stored in a local directory.  Each entry is a directory
+    with the output objects of one link execution, written with
+    :mod:`eskapade.core.data_store_io`.  When the total size of the entries
+    exceeds the maximum size, the least-recently used entries are evicted.
+
+    Links opt in to caching with their "cache_results" attribute.  The
+    process manager opens the cache from the "linkCacheDir" and
+    "linkCacheSize" settings if any link is cached.  Results of links that
+    accumulate state over executions, i.e. links that store their results
+    at finalize or are in a repeating chain, are not cached.
+    """
+
+    def __init__(self):
+        """Initialize link-cache instance."""
+        self.cache_dir = None
+        self.max_size = None
+        self._lock = threading.Lock()
+        self._class_fingerprints = {}
+
+    def open(self, cache_dir, max_size=None):
+        """Open cache directory.
+
+        :param str cache_dir: path of the cache directory
+        :param int max_size: maximum total size of the cache entries in bytes
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.logger.debug('Using link cache in "{path}".', path=cache_dir)
+
+    def link_key(self, link, ds):
+        """Compute cache key of a link execution.
+
+        The key is computed from the code of the link class, the processed
+        keyword arguments of the link, and the data-store objects it reads.
+
+        :param link: link to compute key for
+        :param dict ds: data store with the input objects of the link
+        :return: cache key or None if the link results cannot be cached
+        :rtype: str
+        """
+        in_keys, out_keys = link.get_input_keys(), link.get_output_keys()
+        if in_keys is None or out_keys is None:
+            self.logger.warning('Keys of link "{link!s}" unknown; not caching results.', link=link)
+            return None
+
+        try:
+            hasher = hashlib.sha1()
+            cls = type(link)
+            if cls not in self._class_fingerprints:
+                self._class_fingerprints[cls] = fingerprint([_ for _ in cls.__mro__ if _ is not object]).digest()
+            hasher.update(self._class_fingerprints[cls])
+            fingerprint(dict((name, getattr(link, name, None)) for name in link._required_vars), hasher)
+            fingerprint((link.read_key, link.store_key, sorted(out_keys)), hasher)
+            for key in sorted(in_keys):
+                fingerprint((key, ds[key]) if key in ds else key, hasher)
+        except TypeError as exc:
+            self.logger.warning('Unable to compute cache key of link "{link!s}"; not caching results: {exc!s}',
+                                link=link, exc=exc)
+            return None
+
+        return hasher.hexdigest()
+
+    def restore(self, cache_key, ds):
+        """Restore link results from cache.
+
+        :param str cache_key: cache key of the link execution
+        :param dict ds: data store to restore the results in
+        :return: True if the results were found in the cache
+        :rtype: bool
+        """
+        entry_dir = os.path.join(self.cache_dir, cache_key)
+        if not os.path.isfile(os.path.join(entry_dir, data_store_io.MANIFEST_FILE)):
+            return False
+        try:
+            objects = data_store_io.read_objects(entry_dir)
+        except Exception as exc:
+            self.logger.warning('Unable to read link-cache entry "{key}": {exc!s}', key=cache_key, exc=exc)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return False
+
+        # mark entry as recently used
+        os.utime(os.path.join(entry_dir, data_store_io.MANIFEST_FILE))
+        ds.update(objects)
+
+        return True
+
+    def store(self, cache_key, keys, ds):
+        """Store link results in cache.
+
+        :param str cache_key: cache key of the link execution
+        :param set keys: keys of the output objects of the link
+        :param dict ds: data store with the output objects
+        """
+        missing = sorted(_ for _ in keys if _ not in ds)
+        if missing:
+            self.logger.warning('Results {keys} of link-cache entry "{key}" not in data store; not caching.',
+                                keys=', '.join('"{}"'.format(_) for _ in missing), key=cache_key)
+            return
+        keys = sorted(keys)
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp_', dir=self.cache_dir)
+        try:
+            manifest = data_store_io.write_objects(keys, ds.get, tmp_dir)
+            if len(manifest['objects']) != len(keys):
+                self.logger.warning('Unable to write all results of link-cache entry "{key}"; not caching.',
+                                    key=cache_key)
+                return
+            os.rename(tmp_dir, os.path.join(self.cache_dir, cache_key))
+        except OSError:
+            # entry stored by another process
+            pass
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self):
+        """Evict least-recently used entries until the cache is within its maximum size."""
+        if not self.max_size:
+            return
+
+        with self._lock:
+            entries = []
+            for manifest_path in glob.glob(os.path.join(self.cache_dir, '*', data_store_io.MANIFEST_FILE)):
+                entry_dir = os.path.dirname(manifest_path)
+                try:
+                    size = sum(os.path.getsize(_) for _ in glob.glob(os.path.join(entry_dir, '*')))
+                    entries.append((os.path.getmtime(manifest_path), size, entry_dir))
+                except OSError:
+                    continue
+
+            total_size = sum(_[1] for _ in entries)
+            for _, size, entry_dir in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                self.logger.debug('Evicting link-cache entry "{path}" ({size:d} bytes).', path=entry_dir, size=size)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total_size -= size
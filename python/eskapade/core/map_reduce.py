@@ -0,0 +1,191 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/04/03
+
+Description:
+    Runner that maps a macro over input files and reduces the results
+
+    The macro is run once for each input file (shard), in a pool of worker
+    processes.  The path of the ReadToDf link of the macro is set to the
+    shard before the run.  The designated data-store objects of the runs
+    are sent back to the main process, where they are merged in the order
+    of the input files.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import collections
+import glob
+import multiprocessing
+import os
+
+from eskapade.core.merging import merge_objects
+from eskapade.logger import Logger
+
+logger = Logger()
+
+
+def expand_paths(patterns):
+    """Expand paths and glob patterns of input files.
+
+    The files of each pattern are sorted by path; the order of the patterns
+    is kept.
+
+    :param list patterns: paths and glob patterns
+    :return: paths of the input files
+    :rtype: list
+    :raises RuntimeError: if a pattern does not match any file
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise RuntimeError('no input files found for "{}"'.format(pattern))
+        paths += matches
+
+    return paths
+
+
+def find_read_link(name=None):
+    """Find the ReadToDf link of the configured chains.
+
+    :param str name: name of the link; if not specified, there must be exactly one ReadToDf link
+    :return: the ReadToDf link
+    :rtype: ReadToDf
+    :raises RuntimeError: if no unique link is found
+    """
+    from eskapade.analysis import ReadToDf
+    from eskapade.core.process_manager import process_manager
+
+    links = [link for chain in process_manager for link in chain
+             if isinstance(link, ReadToDf) and (name is None or link.name == name)]
+    if len(links) != 1:
+        raise RuntimeError('found {:d} ReadToDf links{} in macro; expected one'
+                           .format(len(links), ' with name "{}"'.format(name) if name else ''))
+
+    return links[0]
+
+
+def map_shard(task):
+    """Run the macro on one input file.
+
+    This function is executed in the worker processes.  Results are not
+    persisted by the runs.
+
+    :param tuple task: settings, input file, keys of the results, and name of the ReadToDf link
+    :return: input file, status code of the run, and objects in the data store with the result keys
+    :rtype: tuple
+    """
+    import eskapade.utils
+    from eskapade.core import execution
+    from eskapade.core.process_manager import process_manager
+    from eskapade.core.process_services import DataStore
+
+    settings, path, keys, read_link = task
+    execution.reset_eskapade()
+    settings['doNotStoreResults'] = True
+    process_manager.service(settings)
+    execution.set_log_level(settings)
+    eskapade.utils.set_matplotlib_backend(batch=True)
+
+    process_manager.execute_macro(settings['macro'], copyfile=False)
+    find_read_link(read_link).path = path
+    status = process_manager.run()
+
+    ds = process_manager.service(DataStore)
+    results = dict((key, ds[key]) for key in keys if key in ds) if status.is_success() else {}
+    execution.reset_eskapade()
+
+    return path, status, results
+
+
+def map_reduce(settings, paths, keys, n_workers=None, reducer=None, read_link=None):
+    """Run macro on each input file and merge the results.
+
+    The results of the runs are merged in the order of the input files as
+    they come in, so the results of at most a few runs are kept in memory.
+    By default, results are merged with merge_objects, which supports the
+    Eskapade merge protocol.
+
+    :param ConfigObject settings: settings of the runs, with the macro to execute
+    :param list paths: paths and glob patterns of the input files
+    :param list keys: data-store keys of the results of a run
+    :param int n_workers: number of worker processes (default: number of CPUs)
+    :param reducer: function that merges two results, or dictionary of such functions by key (default: merge_objects)
+    :param str read_link: name of the ReadToDf link to set the input file of (default: the only ReadToDf link)
+    :return: merged results by key
+    :rtype: dict
+    :raises RuntimeError: if the runs of one or more input files fail
+    """
+    paths = expand_paths(paths)
+    reducers = reducer if isinstance(reducer, dict) else {}
+    default_reducer = reducer if callable(reducer) else merge_objects
+    n_workers = min(n_workers or os.cpu_count() or 1, len(paths))
+    start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+    logger.info('Running macro on {n_paths:d} input files in {n_workers:d} processes.', n_paths=len(paths),
+                n_workers=n_workers)
+    merged = collections.OrderedDict()
+    failed = []
+    with multiprocessing.get_context(start_method).Pool(n_workers) as pool:
+        tasks = ((settings, path, keys, read_link) for path in paths)
+        for it, (path, status, results) in enumerate(pool.imap(map_shard, tasks, chunksize=1)):
+            if not status.is_success():
+                logger.error('Run on input file "{path}" failed with status "{status!s}".', path=path, status=status)
+                failed.append(path)
+                continue
+            logger.debug('Merging results of input file "{path}" ({it:d}/{n:d}).', path=path, it=it + 1, n=len(paths))
+            for key, obj in results.items():
+                merged[key] = reducers.get(key, default_reducer)(merged[key], obj) if key in merged else obj
+
+    if failed:
+        raise RuntimeError('runs on {:d} input files failed: {}'.format(len(failed), ', '.join(failed)))
+    missing = [key for key in keys if key not in merged]
+    if missing:
+        logger.warning('No results found with keys {keys}.', keys=', '.join('"{}"'.format(_) for _ in missing))
+
+    return merged
+
+
+def run_map_reduce(settings, paths, keys, n_workers=None, reducer=None, read_link=None):
+    """Run macro on input files and store the merged results.
+
+    The macro is executed in the main process first, to configure the
+    settings and to check its ReadToDf link, but its chains are not run.
+    The merged results are stored in the data store, and the run-process
+    services are persisted, unless the "doNotStoreResults" setting is true.
+
+    :param ConfigObject settings: settings of the runs, with the macro to execute
+    :param list paths: paths and glob patterns of the input files
+    :param list keys: data-store keys of the results of a run
+    :param int n_workers: number of worker processes (default: number of CPUs)
+    :param reducer: function that merges two results, or dictionary of such functions by key (default: merge_objects)
+    :param str read_link: name of the ReadToDf link to set the input file of (default: the only ReadToDf link)
+    :return: merged results by key
+    :rtype: dict
+    """
+    from eskapade.core import execution
+    from eskapade.core.process_manager import process_manager
+    from eskapade.core.process_services import DataStore
+
+    execution.reset_eskapade()
+    process_manager.service(settings)
+    execution.set_log_level(settings)
+    if not settings['macro']:
+        raise RuntimeError('macro is not set')
+    process_manager.execute_macro(settings['macro'])
+    find_read_link(read_link)
+
+    results = map_reduce(settings, paths, keys, n_workers, reducer, read_link)
+
+    process_manager.service(DataStore).update(results)
+    if not settings.get('doNotStoreResults'):
+        process_manager.persist_services(settings.io_conf())
+    logger.info('Merged results with keys {keys}.', keys=', '.join('"{}"'.format(_) for _ in results))
+
+    return results
@@ -0,0 +1,94 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/04/05
+
+Description:
+    Merging of data-store objects
+
+    Results of runs on different parts of the data, e.g. histograms filled
+    from different input files, are combined by merging the objects in their
+    data stores.  A class supports merging by implementing the method
+    "__eskapade_merge__(self, other)", which returns a new object with the
+    combined contents of both objects, and leaves the objects unchanged.
+    Common types without this method, such as counters, dictionaries, and
+    data frames, are merged by type.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import collections
+import copy
+import sys
+
+# name of the merge method of mergeable classes
+MERGE_METHOD = '__eskapade_merge__'
+
+
+def is_mergeable(obj):
+    """Check if an object implements the merge protocol.
+
+    :param obj: object to check
+    :rtype: bool
+    """
+    return callable(getattr(type(obj), MERGE_METHOD, None))
+
+
+def merge_objects(obj, other):
+    """Merge two data-store objects.
+
+    Objects that implement the merge protocol are merged with their merge
+    method.  Otherwise, counters are added, dictionaries merged key by key,
+    data frames and lists concatenated, and other objects added with the "+"
+    operator, e.g. numbers and histogrammar histograms.  The objects are not
+    modified.
+
+    :param obj: first object
+    :param other: second object
+    :return: merged object
+    :raises TypeError: if the objects cannot be merged
+    """
+    if is_mergeable(obj):
+        return getattr(obj, MERGE_METHOD)(other)
+    if isinstance(obj, collections.Counter):
+        merged = obj.copy()
+        merged.update(other)
+        return merged
+    if isinstance(obj, dict):
+        merged = copy.copy(obj)
+        for key, value in other.items():
+            merged[key] = merge_objects(merged[key], value) if key in merged else value
+        return merged
+
+    # data frames only exist if Pandas has been imported
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series)):
+        return pd.concat([obj, other])
+
+    if isinstance(obj, (str, bytes, tuple)) or not hasattr(obj, '__add__'):
+        raise TypeError('unable to merge objects of type "{}"'.format(type(obj).__name__))
+
+    return obj + other
+
+
+def merge_data_stores(ds, other, keys=None):
+    """Merge the objects of another data store into a data store.
+
+    Objects with keys that exist in both data stores are merged with
+    merge_objects; other objects are added to the data store.
+
+    :param dict ds: data store to merge into
+    :param dict other: data store with objects to merge
+    :param keys: keys of the objects to merge (default: all keys of the other data store)
+    :return: keys of the merged objects
+    :rtype: list
+    """
+    keys = list(other.keys()) if keys is None else [_ for _ in keys if _ in other]
+    for key in keys:
+        ds[key] = merge_objects(ds[key], other[key]) if key in ds else other[key]
+
+    return keys
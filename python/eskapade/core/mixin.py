@@ -19,6 +19,7 @@ LICENSE.
 """
 
 import configparser
+import time
 import timeit
 
 
@@ -145,13 +146,18 @@ class ArgumentsMixin:
 
 
 class TimerMixin:
-    """Mixin base class for timing."""
+    """Mixin base class for timing.
+
+    Both the wall-clock time and the CPU time of the process are recorded.
+    """
 
     def __init__(self):
         """Initialize timer."""
         self._start_time = 0.
         self._stop_time = 0.
         self._total_time = 0.
+        self._start_cpu_time = 0.
+        self._total_cpu_time = 0.
 
     def start_timer(self):
         """Start run timer.
@@ -163,6 +169,7 @@ class TimerMixin:
         :returns: start time in seconds
         :rtype: float
         """
+        self._start_cpu_time = time.process_time()
         self._start_time = timeit.default_timer()
         return self._start_time
 
@@ -177,6 +184,7 @@ class TimerMixin:
         :rtype: float
         """
         self._stop_time = timeit.default_timer()
+        self._total_cpu_time += time.process_time() - self._start_cpu_time
 
         diff_time = self._stop_time - (start_time if start_time is not None else self._start_time)
         self._total_time += diff_time
@@ -191,6 +199,14 @@ class TimerMixin:
         """
         return self._total_time
 
+    def total_cpu_time(self):
+        """Return the total CPU time of the process while the timer was running.
+
+        :returns: total CPU time in seconds
+        :rtype: float
+        """
+        return self._total_cpu_time
+
 
 class ConfigMixin:
     """Mixin base class for configuration settings."""
@@ -19,7 +19,6 @@ import os
 import re
 from collections import defaultdict
 
-from eskapade.core.process_manager import process_manager
 from eskapade.core.process_services import ConfigObject
 from eskapade.logger import Logger
 
@@ -33,6 +32,7 @@ IO_LOCS = dict(config='config_dir',
                ana_results='results_dir',
                ana_plots='results_dir',
                proc_service_data='results_dir',
+               link_cache='results_dir',
                results_data='results_dir',
                results_ml_data='results_dir',
                results_config='results_dir',
@@ -44,6 +44,7 @@ IO_SUB_DIRS = defaultdict(lambda: '',
                           ana_results='{ana_name:s}',
                           ana_plots='{ana_name:s}/plots',
                           proc_service_data='{ana_name:s}/proc_service_data/v{ana_version:s}',
+                          link_cache='link_cache',
                           results_data='{ana_name:s}/data/v{ana_version:s}',
                           results_ml_data='{ana_name:s}/data/v{ana_version:s}',
                           results_config='{ana_name:s}/config/v{ana_version:s}',
@@ -73,6 +74,14 @@ def create_dir(dir_path):
     os.makedirs(dir_path)
 
 
+def _settings_io_conf():
+    """Get IO configuration from the settings of the process manager."""
+    # imported here, because the process manager imports this module
+    from eskapade.core.process_manager import process_manager
+
+    return process_manager.service(ConfigObject).io_conf()
+
+
 def io_dir(io_type, io_conf=None):
     """Construct directory path.
 
@@ -82,7 +91,7 @@ def io_dir(io_type, io_conf=None):
     :rtype: str
     """
     if not io_conf:
-        io_conf = process_manager.service(ConfigObject).io_conf()
+        io_conf = _settings_io_conf()
     # check inputs
     if io_type not in IO_LOCS:
         logger.fatal('Unknown IO type: "{type!s}".', type=io_type)
@@ -112,7 +121,7 @@ def io_path(io_type, sub_path, io_conf=None):
     :rtype: str
     """
     if not io_conf:
-        io_conf = process_manager.service(ConfigObject).io_conf()
+        io_conf = _settings_io_conf()
     # check inputs
     if not isinstance(sub_path, str):
         logger.fatal('Specified sub path/file name must be a string, but has type "{type!s}"',
@@ -138,7 +147,7 @@ def record_file_number(file_name_base, file_name_ext, io_conf=None):
     :rtype: int
     """
     if not io_conf:
-        io_conf = process_manager.service(ConfigObject).io_conf()
+        io_conf = _settings_io_conf()
     file_name_base = repl_whites(file_name_base)
     file_name_ext = repl_whites(file_name_ext)
     records_dir = io_dir('records', io_conf)
@@ -17,16 +17,28 @@ modification, are permitted according to the terms listed in the file
 LICENSE.
 """
 
+import contextlib
 import glob
 import importlib
+import json
+import multiprocessing
 import os
+import shutil
+import time
 
-from eskapade.core import persistence
+from eskapade.core import data_store_io, merging, persistence
 from eskapade.core.definitions import StatusCode
 from eskapade.core.element import Chain
+from eskapade.core.link_cache import LinkCache
 from eskapade.core.meta import Processor, ProcessorSequence
 from eskapade.core.mixin import TimerMixin
-from eskapade.core.process_services import ConfigObject, ProcessService
+from eskapade.core.process_services import ConfigObject, DataStore, ProcessService
+from eskapade.core.run_metrics import RunMetrics
+from eskapade.core.run_profiler import RunProfiler
+from eskapade.core.run_trace import RunTrace
+
+# file with record of latest link checkpoint
+CHECKPOINT_FILE = 'checkpoint.json'
 
 
 class ProcessManager(Processor, ProcessorSequence, TimerMixin):
@@ -72,6 +84,9 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
 
         self.prev_chain_name = ''
         self._services = {}
+        self._checkpoints = True
+        self._checkpoint_time = time.time()
+        self._checkpoint_path = None
 
     def service(self, service_spec):
         """Get or register process service.
@@ -196,17 +211,32 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
             # use data from latest chain if not specified
             chain = 'latest'
 
-        # get list of persisted files
         base_path = persistence.io_dir('proc_service_data', io_conf)
-        service_paths = glob.glob('{0:s}/{1:s}/*.pkl'.format(base_path, chain))
-        self.logger.debug('Importing process services from "{path}/{chain}" (found {n:d} files).',
-                          path=base_path, chain=chain, n=len(service_paths))
+        self.__import_services_in('{0:s}/{1:s}'.format(base_path, chain), force_set)
+
+    def __import_services_in(self, chain_path, force_set, lazy=None):
+        """Import process services from files in a directory.
+
+        :param str chain_path: path of the directory with persisted services
+        :param set force_set: services for which import is forced if already registered
+        :param bool lazy: import data-store objects lazily (default: "dataStoreLazyImport" setting)
+        """
+        # get list of persisted files and directories
+        service_paths = glob.glob('{}/*.pkl'.format(chain_path))
+        service_paths += [os.path.dirname(_) for _ in
+                          glob.glob('{0:s}/*/{1:s}'.format(chain_path, data_store_io.MANIFEST_FILE))]
+        self.logger.debug('Importing process services from "{path}" (found {n:d} files).',
+                          path=chain_path, n=len(service_paths))
 
         # read and register services
+        settings = self.service(ConfigObject)
+        n_workers = settings.get('dataStorePersistWorkers')
+        lazy = settings.get('dataStoreLazyImport') if lazy is None else lazy
         for path in service_paths:
             try:
                 # try to import service module
-                cls_spec = os.path.splitext(os.path.basename(path))[0].split('.')
+                cls_spec = os.path.basename(path)
+                cls_spec = (cls_spec if os.path.isdir(path) else os.path.splitext(cls_spec)[0]).split('.')
                 mod = importlib.import_module('.'.join(cls_spec[:-1]))
                 cls = getattr(mod, cls_spec[-1])
             except Exception as exc:
@@ -225,16 +255,20 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
                                       cls=cls, path=path)
                     continue
 
-            # read service instance from file
-            inst = cls.import_from_file(path)
+            # read service instance from file or directory with object files
+            if os.path.isdir(path):
+                inst = cls.import_from_dir(path, n_workers=n_workers, lazy=lazy)
+            else:
+                inst = cls.import_from_file(path)
             if inst:
                 self.service(inst)
 
-    def persist_services(self, io_conf, chain=None):
+    def persist_services(self, io_conf, chain=None, exclude_keys=None):
         """Persist process services in files.
 
         :param dict io_conf: I/O config as returned by ConfigObject.io_conf
         :param str chain: name of chain for which data is persisted
+        :param set exclude_keys: keys of data-store objects that are not persisted
         """
         # parse I/O config
         io_conf = ConfigObject.IoConfig(**io_conf)
@@ -265,18 +299,190 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
                               path=base_path)
             raise exc
 
+        settings = self.service(ConfigObject)
+        with self.__traced('persist services', dict(path=chain_path)):
+            self.__persist_services_in(chain_path, background=bool(settings.get('storeResultsInBackground')),
+                                       exclude_keys=exclude_keys)
+
+    def merge_data_store(self, other, keys=None):
+        """Merge objects of another data store into the data store.
+
+        Objects that exist in both data stores are merged, e.g. histograms
+        filled from different input files; see eskapade.core.merging.  Other
+        objects are added to the data store.
+
+        :param dict other: data store with the objects to merge, e.g. of another run
+        :param keys: keys of the objects to merge (default: all keys of the other data store)
+        :return: keys of the merged objects
+        :rtype: list
+        """
+        keys = merging.merge_data_stores(self.service(DataStore), other, keys)
+        self.logger.debug('Merged data-store objects [{keys}].', keys=', '.join(keys))
+
+        return keys
+
+    def __traced(self, name, args=None):
+        """Get context manager to record a persistence step in the run trace, if enabled.
+
+        :param str name: name of the step
+        :param dict args: metadata of the span
+        :return: context manager
+        """
+        trace = self.service(RunTrace)
+        return trace.span(name, 'persistence', args) if trace.enabled else contextlib.ExitStack()
+
+    def __persist_services_in(self, chain_path, background=False, exclude_keys=None):
+        """Persist process services in files in a directory.
+
+        :param str chain_path: path of the directory to persist services in
+        :param bool background: persist the data store in a background thread
+        :param set exclude_keys: keys of data-store objects that are not persisted
+        """
         # remove old data
         service_paths = glob.glob('{}/*.pkl'.format(chain_path))
+        service_dirs = [_ for _ in glob.glob('{}/*'.format(chain_path)) if os.path.isdir(_)]
         try:
             for path in service_paths:
                 os.remove(path)
+            for path in service_dirs:
+                shutil.rmtree(path)
         except Exception as exc:
             self.logger.fatal('Unable to remove previously persisted process services.')
             raise exc
 
         # persist services
+        settings = self.service(ConfigObject)
+        per_object = settings.get('dataStorePersistFormat') == 'files'
         for cls in self.get_services():
-            self.service(cls).persist_in_file('{0:s}/{1!s}.pkl'.format(chain_path, cls))
+            if not issubclass(cls, DataStore) or not cls.persist:
+                self.service(cls).persist_in_file('{0:s}/{1!s}.pkl'.format(chain_path, cls))
+            elif per_object:
+                # persist data-store objects in separate files
+                self.service(cls).persist_in_dir('{0:s}/{1!s}'.format(chain_path, cls),
+                                                 n_workers=settings.get('dataStorePersistWorkers'),
+                                                 background=background, exclude_keys=exclude_keys)
+            else:
+                self.service(cls).persist_in_file('{0:s}/{1!s}.pkl'.format(chain_path, cls), background=background,
+                                                  exclude_keys=exclude_keys)
+
+    def checkpoint_due(self, link):
+        """Check if a checkpoint is due after execution of a link.
+
+        A checkpoint is due if the link requests one, or if the time since
+        the previous checkpoint exceeds the "checkpointInterval" setting.
+        Checkpoints are never due in chains that repeat, e.g. to read data in
+        chunks, because the state of an iteration cannot be resumed.
+
+        :param link: the executed link
+        :return: True if a checkpoint is due
+        :rtype: bool
+        """
+        if not self._checkpoints:
+            return False
+        if link.parent is not None and link.parent.repeats:
+            if link.checkpoint:
+                self.logger.warning('Not checkpointing after link "{link!s}" in repeating chain "{chain!s}".',
+                                    link=link, chain=link.parent)
+            return False
+        if link.checkpoint:
+            return True
+        interval = self.service(ConfigObject).get('checkpointInterval')
+
+        return bool(interval) and time.time() - self._checkpoint_time >= interval
+
+    def checkpoint(self, chain, link):
+        """Persist process services after execution of a link.
+
+        The services are persisted in one of two checkpoint directories, in
+        turn, so the previous checkpoint remains valid until the new one is
+        complete.  The checkpoint is then recorded with the names of the
+        chain and link, for resumption with the "resumeFromCheckpoint"
+        setting.
+
+        :param chain: chain of the executed link
+        :param link: the executed link
+        """
+        settings = self.service(ConfigObject)
+        base_path = persistence.io_dir('proc_service_data', settings.io_conf())
+        record = self.__read_checkpoint(base_path)
+        ckp_dir = 'checkpoint_1' if record and record.get('dir') == 'checkpoint_0' else 'checkpoint_0'
+        ckp_path = '{0:s}/{1:s}'.format(base_path, ckp_dir)
+        self.logger.info('Checkpointing process services after link "{link!s}" in chain "{chain!s}".',
+                         link=link, chain=chain)
+
+        # mark objects that may have been modified in place by the links executed so far
+        out_keys = []
+        for _ in chain:
+            out_keys.append(_.get_output_keys())
+            if _ is link:
+                break
+        self.service(DataStore).mark_dirty(None if None in out_keys else set().union(*out_keys))
+
+        persistence.create_dir(ckp_path)
+        with self.__traced('checkpoint', dict(chain=chain.name, link=link.name)):
+            self.__persist_services_in(ckp_path)
+        self._checkpoint_path = base_path
+
+        # record checkpoint after all services have been written
+        record_path = '{0:s}/{1:s}'.format(base_path, CHECKPOINT_FILE)
+        with open(record_path + '.tmp', 'w') as record_file:
+            json.dump(dict(chain=chain.name, link=link.name, dir=ckp_dir, time=time.time()), record_file)
+        os.replace(record_path + '.tmp', record_path)
+        self._checkpoint_time = time.time()
+
+    def __read_checkpoint(self, base_path):
+        """Read record of latest checkpoint.
+
+        :param str base_path: path of the directory with persisted services
+        :return: names of chain and link, and checkpoint directory; None if there is no checkpoint
+        :rtype: dict
+        """
+        try:
+            with open('{0:s}/{1:s}'.format(base_path, CHECKPOINT_FILE)) as record_file:
+                return json.load(record_file)
+        except FileNotFoundError:
+            return None
+
+    def __resume(self, settings):
+        """Prepare resumption of a run after the latest checkpoint.
+
+        Chains before the checkpointed chain are disabled, the checkpointed
+        services are imported, and execution of the checkpointed chain is set
+        to begin after the checkpointed link.
+
+        :param ConfigObject settings: run configuration
+        :return: True if a checkpoint was found
+        :rtype: bool
+        """
+        base_path = persistence.io_dir('proc_service_data', settings.io_conf())
+        record = self.__read_checkpoint(base_path)
+        if not record:
+            self.logger.warning('No checkpoint found in "{path}"; executing all chains.', path=base_path)
+            return False
+
+        self._checkpoint_path = base_path
+        chain = self.__disable(record['chain'])
+        chain.resume_after = chain.get(record['link']).name
+        self.logger.info('Resuming after link "{link}" in chain "{chain}".', link=record['link'], chain=chain)
+        force_set = set(self.get_services()) - {ConfigObject}
+        # import objects eagerly, because the checkpoint directory is overwritten by later checkpoints
+        self.__import_services_in('{0:s}/{1:s}'.format(base_path, record['dir']), force_set, lazy=False)
+
+        return True
+
+    def __remove_checkpoints(self):
+        """Remove checkpoints of the run."""
+        base_path = self._checkpoint_path
+        if not base_path:
+            return
+        self.logger.debug('Removing checkpoints in "{path}".', path=base_path)
+        try:
+            os.remove('{0:s}/{1:s}'.format(base_path, CHECKPOINT_FILE))
+        except FileNotFoundError:
+            pass
+        for ckp_dir in ('checkpoint_0', 'checkpoint_1'):
+            shutil.rmtree('{0:s}/{1:s}'.format(base_path, ckp_dir), ignore_errors=True)
+        self._checkpoint_path = None
 
     def execute_macro(self, filename, copyfile=True):
         """Execute an input python configuration file.
@@ -295,7 +501,6 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         # make copy of macro for bookkeeping purposes
         settings = self.service(ConfigObject)
         if not settings.get('doNotStoreResults') and copyfile:
-            import shutil
             shutil.copy(filename, persistence.io_dir('results_config'))
 
     def add(self, chain: Chain) -> None:
@@ -391,6 +596,17 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         # Disable chains that do not need to be executed.
         settings = self.service(ConfigObject)
         begin_chain = settings.get('beginWithChain', None)
+        if settings.get('resumeFromCheckpoint'):
+            # Resume after the latest checkpoint of a previous run.
+            for c in self:
+                c.resume_after = None
+            try:
+                if self.__resume(settings):
+                    begin_chain = None
+            except Exception as exc:
+                self.logger.error('Unable to resume from checkpoint:')
+                self.logger.error('Caught exception: "{exc}".', exc=exc)
+                return StatusCode.Failure
         if begin_chain:
             chain = self.__disable(begin_chain)
 
@@ -408,6 +624,46 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         if end_chain:
             self.__disable(end_chain, True)
 
+        # Bound the memory used by the data store.
+        # This is done after the import of services, which may replace the data store.
+        memory_budget = settings.get('dataStoreMemoryBudget')
+        if memory_budget:
+            self.service(DataStore).set_memory_budget(memory_budget, spill_dir=settings.get('dataStoreSpillDir'))
+
+        # Open the cache of link results if any link caches its results.
+        if any(link.cache_results for c in self if c.enabled for link in c):
+            cache_dir = settings.get('linkCacheDir') or persistence.io_dir('link_cache', settings.io_conf())
+            self.service(LinkCache).open(cache_dir, max_size=settings.get('linkCacheSize'))
+
+        # Push selections down into the links that read the data.
+        if settings.get('pushDownSelections'):
+            self.__push_down([_ for _ in self if _.enabled], keep_keys=settings.get('dataStoreKeepKeys'))
+
+        # Schedule release of data-store objects after their last use.
+        for c in self:
+            c.key_releases = {}
+        if settings.get('dataStoreReleaseKeys'):
+            self.__plan_key_releases([_ for _ in self if _.enabled], keep_keys=settings.get('dataStoreKeepKeys'),
+                                     mark_cold=bool(memory_budget))
+
+        self._checkpoint_time = time.time()
+
+        # Collect performance metrics and a timeline of links and chains.
+        self.service(RunMetrics).enabled = bool(settings.get('collectRunMetrics'))
+        trace = self.service(RunTrace)
+        trace.enabled = bool(settings.get('runTraceFile'))
+        self.service(DataStore).set_trace(trace if trace.enabled else None)
+
+        # Profile targeted links separately.
+        run_profiler = self.service(RunProfiler)
+        run_profiler.targets = set(settings.get('profileTargets') or [])
+        run_profiler.sort_key = settings.get('doCodeProfiling') or 'time'
+        run_profiler.memory_top = settings.get('profileMemoryTop')
+        unknown = run_profiler.targets - set(_.name for _ in self) - set(link.name for chain in self for link in chain)
+        if unknown:
+            self.logger.warning('No chains or links found to profile with names {names}.',
+                                names=', '.join('"{}"'.format(_) for _ in sorted(unknown)))
+
         # Print the run configuration
         self.summary()
         settings.Print()
@@ -416,8 +672,120 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
 
         return status
 
+    def __push_down(self, chains, keep_keys=None):
+        """Push operations of links down into the preceding links.
+
+        A link may push its operations down into the preceding link in the
+        chain if it only reads objects stored by that link, see
+        Link.push_down.  The objects stored by the preceding link then
+        change, so each of these objects must be stored again by the link
+        or not be read by any other link nor be kept.  A link with unknown
+        input keys may read any object.
+
+        :param list chains: chains in order of execution
+        :param list keep_keys: keys of objects that are kept as results of the run
+        """
+        keep_keys = set(keep_keys or [])
+        links = [link for chain in chains for link in chain]
+        n_pushed = 0
+        for chain in chains:
+            chain_links = list(chain)
+            for prev_link, link in zip(chain_links[:-1], chain_links[1:]):
+                in_keys, out_keys = link.get_input_keys(), link.get_output_keys()
+                prev_keys = prev_link.get_output_keys()
+                if not in_keys or prev_keys is None or not in_keys <= prev_keys:
+                    continue
+
+                # objects that change must be stored again by the link or not be used elsewhere
+                changed = prev_keys - (out_keys or set())
+                if changed & keep_keys:
+                    continue
+                other_in_keys = [_.get_input_keys() for _ in links if _ is not link and _ is not prev_link]
+                if changed and any(_ is None or _ & changed for _ in other_in_keys):
+                    continue
+
+                if link.push_down(prev_link):
+                    n_pushed += 1
+                    self.logger.debug('Pushed operations of link "{link!s}" down into link "{prev!s}" in chain '
+                                      '"{chain!s}".', link=link, prev=prev_link, chain=chain)
+
+        self.logger.info('Pushed operations of {n:d} links down into preceding links.', n=n_pushed)
+
+    def __plan_key_releases(self, chains, keep_keys=None, mark_cold=False):
+        """Schedule release of data-store objects after their last use.
+
+        The keys read and stored by the links of the chains are analyzed to
+        find the link that is the last to read each object.  An object is
+        released after the execution of that link if the object is also
+        stored by a preceding link in the same chain.  Otherwise, the chain
+        may be repeated and the object is released after finalization of the
+        chain.  Objects that are stored by the last link that reads them, or
+        by any later link, are the results of the run and are never released.
+
+        A link with unknown input keys may read any object, and a link with
+        unknown output keys may store any object.
+
+        :param list chains: chains in order of execution
+        :param list keep_keys: keys of objects that are never released
+        :param bool mark_cold: mark objects that are kept as first candidates to be spilled to disk
+        """
+        keep_keys = set(keep_keys or [])
+        last_read = {}
+        writes = {}
+        last_any_read = last_any_write = None
+        for i_chain, chain in enumerate(chains):
+            for i_link, link in enumerate(chain):
+                pos = (i_chain, i_link)
+                in_keys, out_keys = link.get_input_keys(), link.get_output_keys()
+                if in_keys is None:
+                    last_any_read = pos
+                if out_keys is None:
+                    last_any_write = pos
+                for key in in_keys or ():
+                    last_read[key] = pos
+                for key in out_keys or ():
+                    writes.setdefault(key, []).append(pos)
+
+        n_released = 0
+        for key, read_pos in sorted(last_read.items()):
+            # determine position of last use
+            read_pos = max(read_pos, last_any_read or read_pos)
+            write_pos = max(writes.get(key, []) + ([last_any_write] if last_any_write else []), default=None)
+            if write_pos is not None and write_pos >= read_pos:
+                continue
+            if key in keep_keys and not mark_cold:
+                continue
+
+            # release after link if object is stored earlier in the same chain
+            chain = chains[read_pos[0]]
+            link = list(chain)[read_pos[1]]
+            if any(p[0] == read_pos[0] and p[1] < read_pos[1] for p in writes.get(key, [])):
+                chain.key_releases.setdefault(link.name, {})[key] = key not in keep_keys
+                self.logger.debug('Data-store object "{key}" will be released after link "{link!s}" in chain '
+                                  '"{chain!s}".', key=key, link=link, chain=chain)
+            else:
+                chain.key_releases.setdefault(None, {})[key] = key not in keep_keys
+                self.logger.debug('Data-store object "{key}" will be released after chain "{chain!s}".',
+                                  key=key, chain=chain)
+            n_released += key not in keep_keys
+
+        self.logger.info('Scheduled release of {n:d} data-store objects after their last use.', n=n_released)
+
     def __exec(self, chain):
-        """Execute a particular chain.
+        """Execute a particular chain, in a span of the run trace if enabled.
+
+        :param chain: The chain to execute
+        :returns: status code of execution attempt
+        :rtype: StatusCode
+        """
+        trace = self.service(RunTrace)
+        if not trace.enabled:
+            return self.__exec_phases(chain)
+        with trace.span(chain.name, 'chain', dict(n_links=chain.n_links, n_workers=chain.n_workers)):
+            return self.__exec_phases(chain)
+
+    def __exec_phases(self, chain):
+        """Execute the phases of a particular chain.
 
         Execution of a chain comprises:
 
@@ -436,7 +804,7 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         :rtype: StatusCode
         """
         #  first initialize
-        status = chain.initialize()
+        status = self.__measured(chain, 'initialize', chain.initialize)
         if status.is_failure():
             return status
         elif status.is_skip_chain():
@@ -446,9 +814,11 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         # execute() of a chain can be called to be repeated.
         # Note: by default this is not done. i.e. chains are only executed once
         status = StatusCode.RepeatChain
+        iteration = 0
         while status.is_repeat_chain():
             self.logger.debug('Executing chain={chain}', chain=chain.name)
-            status = chain.execute()
+            status = self.__measured(chain, 'execute', chain.execute, dict(iteration=iteration))
+            iteration += 1
         if status.is_failure():
             return status
         elif status.is_break_chain():
@@ -459,7 +829,7 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
             return status
 
         # finalize.
-        status = chain.finalize()
+        status = self.__measured(chain, 'finalize', chain.finalize)
         if status.is_failure():
             return status
 
@@ -470,9 +840,135 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
 
         return status
 
+    def __measured(self, chain, phase, method, args=None):
+        """Call method of a chain phase and record its metrics and trace span if enabled.
+
+        :param chain: the chain
+        :param str phase: name of the phase
+        :param method: method of the phase
+        :param dict args: metadata of the trace span
+        :return: status code returned by the method
+        :rtype: StatusCode
+        """
+        metrics = self.service(RunMetrics)
+        trace = self.service(RunTrace)
+        if not metrics.enabled and not trace.enabled:
+            return method()
+
+        with contextlib.ExitStack() as stack:
+            if metrics.enabled:
+                stack.enter_context(metrics.measure(chain.name, None, phase))
+            if trace.enabled:
+                stack.enter_context(trace.span('{0:s} {1:s}'.format(chain.name, phase), 'chain', args))
+            return method()
+
+    @staticmethod
+    def __chain_groups(chains):
+        """Group consecutive chains that can be executed in parallel.
+
+        A chain can be executed in parallel with the other chains in a group
+        if it declares its input and output keys and does not read or store
+        any of the objects stored by the other chains.
+
+        :param list chains: chains in order of execution
+        :return: list of chain groups
+        :rtype: list
+        """
+        groups = []
+        group_in = group_out = None
+        for chain in chains:
+            if chain.input_keys is None or chain.output_keys is None:
+                # keys unknown: execute chain on its own
+                groups.append([chain])
+                group_in = group_out = None
+                continue
+
+            chain_in, chain_out = set(chain.input_keys), set(chain.output_keys)
+            if group_in is None or chain_in & group_out or chain_out & (group_in | group_out):
+                # dependency on chains in group: start new group
+                groups.append([])
+                group_in, group_out = set(), set()
+            groups[-1].append(chain)
+            group_in |= chain_in
+            group_out |= chain_out
+
+        return groups
+
+    # process manager that executes chains in a forked worker process
+    _forked_instance = None
+
+    @staticmethod
+    def _init_forked_worker(instance):
+        """Initialize forked worker process with the process manager that executes the chains.
+
+        :param ProcessManager instance: process manager that scheduled the chains; inherited, not pickled, by fork
+        """
+        ProcessManager._forked_instance = instance
+
+    @staticmethod
+    def _exec_forked_chain(chain_name):
+        """Execute a chain in a forked worker process.
+
+        :param str chain_name: name of the chain to execute
+        :return: status code, objects with the declared output keys, and run metrics and trace events of the chain
+        :rtype: tuple
+        """
+        manager = ProcessManager._forked_instance
+        chain = manager.get(chain_name)
+        manager._checkpoints = False
+        metrics = manager.service(RunMetrics)
+        metrics.clear()
+        trace = manager.service(RunTrace)
+        trace.clear()
+        status = manager.__exec(chain)
+        ds = manager.service(DataStore)
+
+        return (status, dict((key, ds[key]) for key in chain.output_keys if key in ds), metrics.records(),
+                trace.events())
+
+    def __exec_group(self, chains, n_workers):
+        """Execute a group of independent chains in parallel processes.
+
+        The objects with the output keys of the chains are merged into the
+        data store of this process.
+
+        :param list chains: chains to execute
+        :param int n_workers: maximum number of worker processes
+        :return: status codes of chain executions
+        :rtype: list
+        """
+        if len(chains) == 1:
+            return [self.__exec(chains[0])]
+
+        self.logger.info('Executing chains {chains} in {n:d} parallel processes.',
+                         chains=', '.join('"{!s}"'.format(_) for _ in chains), n=min(n_workers, len(chains)))
+        with multiprocessing.get_context('fork').Pool(min(n_workers, len(chains)), ProcessManager._init_forked_worker,
+                                                      (self,)) as pool:
+            results = pool.map(ProcessManager._exec_forked_chain, [_.name for _ in chains], chunksize=1)
+
+        ds = self.service(DataStore)
+        statuses = []
+        for chain, (status, output, records, events) in zip(chains, results):
+            statuses.append(status)
+            self.service(RunMetrics).merge(records)
+            self.service(RunTrace).merge(events)
+            if status.is_failure():
+                continue
+            self.logger.debug('Merging objects [{keys}] from chain "{chain!s}".',
+                              keys=', '.join(sorted(output)), chain=chain)
+            ds.update(output)
+            chain.release_keys(*chain.key_releases)
+            self.prev_chain_name = chain.name
+
+        return statuses
+
     def execute(self):
         """Execute all chains in order.
 
+        Consecutive chains that declare their input and output keys and do
+        not depend on each other are executed in parallel processes if the
+        "nChainWorkers" setting is larger than one.
+
         :return: status code of execution attempt
         :rtype: StatusCode
         """
@@ -482,18 +978,42 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
 
         settings = self.service(ConfigObject)
 
+        # group chains that can be executed in parallel
+        chains = [_ for _ in self if _.enabled]
+        n_workers = settings.get('nChainWorkers') or 1
+        if n_workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            self.logger.warning('Forking processes is not supported on this platform; executing chains in order.')
+            n_workers = 1
+        groups = self.__chain_groups(chains) if n_workers > 1 else [[_] for _ in chains]
+
         # execute chains
         last_chain = None
         persist_results = settings.get('storeResultsEachChain')
 
-        for chain in self:
-            if chain.enabled:
-                # execute chain and check exit status
-                status = self.__exec(chain)
-                chain.exitStatus = status
-                if status == StatusCode.Failure:
-                    break
-
+        for group in groups:
+            # wait for background persistence of objects that may be modified in place
+            ds = self.service(DataStore)
+            out_keys = [_.get_output_keys() for chain in group for _ in chain]
+            with self.__traced('wait for persistence'):
+                ds.wait_persisted(None if None in out_keys or len(group) > 1 else set().union(*out_keys))
+
+            # execute chains and check exit statuses
+            statuses = self.__exec_group(group, n_workers)
+            for chain, chain_status in zip(group, statuses):
+                chain.exitStatus = chain_status
+            failed = [s for s in statuses if s == StatusCode.Failure]
+            if failed:
+                status = failed[0]
+                break
+            status = statuses[-1]
+
+            # mark objects that may have been modified in place by the executed chains
+            ds = self.service(DataStore)
+            for chain in group:
+                out_keys = [_.get_output_keys() for _ in chain]
+                ds.mark_dirty(None if None in out_keys else set().union(*out_keys))
+
+            for index, chain in enumerate(group):
                 # check if we need to persist process services
                 if settings.get('doNotStoreResults'):
                     # never persist anything
@@ -504,8 +1024,10 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
                     last_chain = chain
                     continue
 
-                # persist process services with the output of this chain
-                self.persist_services(io_conf=settings.io_conf(), chain=chain.name)
+                # persist process services as after serial execution, without the output of later parallel chains
+                later_keys = set().union(*(_.output_keys for _ in group[index + 1:]))
+                done_keys = set().union(*(_.output_keys or () for _ in group[:index + 1]))
+                self.persist_services(io_conf=settings.io_conf(), chain=chain.name, exclude_keys=later_keys - done_keys)
                 last_chain = None
 
         # TODO (janos4276) I don't like this. We need to rethink this.
@@ -528,6 +1050,35 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         """
         self.logger.info('Finalizing process manager.')
 
+        # The run is complete, so checkpoints are no longer needed.
+        self.__remove_checkpoints()
+
+        # Wait for the persistence of services in the background.
+        ds = self.service(DataStore)
+        with self.__traced('wait for persistence'):
+            wait_time = ds.wait_persisted()
+        if self.service(ConfigObject).get('storeResultsInBackground'):
+            self.logger.info('Persisting data store took {write:.2f} seconds; waited {wait:.2f} seconds for '
+                             'background writes to finish.', write=ds.write_time, wait=wait_time)
+
+        # Report the performance metrics of links and chains.
+        settings = self.service(ConfigObject)
+        metrics = self.service(RunMetrics)
+        if metrics.enabled:
+            metrics.print_summary()
+            ds[settings.get('runMetricsKey')] = metrics.to_frame()
+            metrics_file = settings.get('runMetricsFile')
+            if not metrics_file and not settings.get('doNotStoreResults'):
+                metrics_file = persistence.io_path('results_data', 'run_metrics.json', settings.io_conf())
+            if metrics_file:
+                metrics.dump(metrics_file)
+        trace = self.service(RunTrace)
+        if trace.enabled:
+            trace.dump(settings.get('runTraceFile'))
+        run_profiler = self.service(RunProfiler)
+        if run_profiler.enabled:
+            run_profiler.dump(persistence.io_path('results_data', 'profiles', settings.io_conf()))
+
         # Stop the timer when the Process Manager is done and print.
         total_time = self.stop_timer()
         self.logger.info('Total runtime: {time:.2f} seconds', time=total_time)
@@ -605,7 +1156,7 @@ class ProcessManager(Processor, ProcessorSequence, TimerMixin):
         if status == StatusCode.Success:
             settings = self.service(ConfigObject)
             profile_code = settings.get('doCodeProfiling', False)
-            if profile_code:
+            if profile_code and not settings.get('profileTargets'):
                 from cProfile import Profile
                 profiler = Profile()
                 profiler.enable()
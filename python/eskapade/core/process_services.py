@@ -16,10 +16,17 @@ LICENSE.
 import os
 import pickle
 import re
-from collections import defaultdict
+import shutil
+import sys
+import tempfile
+import threading
+import timeit
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import eskapade.utils
+from eskapade.core import data_store_io
 from eskapade.core.definitions import CONFIG_DEFAULTS
 from eskapade.core.definitions import CONFIG_OPTS_SETTERS
 from eskapade.core.definitions import CONFIG_VARS
@@ -354,6 +361,69 @@ class ConfigObject(ProcessService):
             self['analysis_version'] = str(self['analysis_version'])
 
 
+def object_size(obj) -> int:
+    """Estimate the memory size of an object.
+
+    The deep memory usage is used for Pandas objects and the number of bytes
+    for NumPy arrays.  For other objects the size of the object itself is
+    returned, without the objects it refers to.
+
+    :param obj: object to estimate the size of
+    :return: approximate size in bytes
+    :rtype: int
+    """
+    memory_usage = getattr(obj, 'memory_usage', None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, 'sum') else usage)
+        except Exception:
+            pass
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    return sys.getsizeof(obj)
+
+
+class _DeferredObject(object):
+    """Reference to a data-store object that is loaded on first access."""
+
+    __slots__ = 'dir_path', 'entry', 'mmap'
+
+    def __init__(self, dir_path: str, entry: dict, mmap: bool = False) -> None:
+        self.dir_path = dir_path
+        self.entry = entry
+        self.mmap = mmap
+
+    @property
+    def path(self):
+        """Path of the file with the object."""
+        return os.path.join(self.dir_path, self.entry['file'])
+
+    @property
+    def obj_type(self):
+        """Type of the object."""
+        return self.entry['type']
+
+    def load(self):
+        """Load the object from its persisted file.
+
+        :return: the object
+        """
+        return data_store_io.read_object(self.dir_path, self.entry, mmap=self.mmap)
+
+
+class _SpilledObject(_DeferredObject):
+    """Reference to a data-store object that has been spilled to disk."""
+
+    __slots__ = 'size',
+
+    def __init__(self, path: str, size: int, obj_type: type) -> None:
+        super().__init__(os.path.dirname(path), dict(file=os.path.basename(path), format='pkl', type=obj_type))
+        self.size = size
+
+
 class DataStore(ProcessService, dict):
     """Store for transient data sets and related objects.
 
@@ -391,10 +461,540 @@ class DataStore(ProcessService, dict):
     And reload from the pickle file with:
 
     >>> ds = DataStore.import_from_file(file_path)
+
+    The memory used by the objects in the datastore can be bounded:
+
+    >>> ds.set_memory_budget(8 * 1024**3)
+
+    When the approximate total size of the objects exceeds the budget, the
+    least-recently used large objects are spilled to disk.  Spilled objects
+    are loaded again transparently when they are accessed, also when the data
+    store is copied, e.g. with ds.copy(), dict(ds), or {**ds}.  The budget is
+    set by the process manager from the "dataStoreMemoryBudget" setting.
     """
 
     _persist = True
 
+    # bookkeeping of spilled and deferred objects; only set on instances
+    # with a memory budget or lazily imported objects
+    _managed = False
+    _memory_budget = None
+    _min_spill_size = 0
+    _spill_dir = None
+    _spill_pid = None
+    _spill_count = 0
+    _resident = None
+    _memory_usage = 0
+    _lock = None
+
+    # last persisted snapshot and objects changed since
+    _snapshot_dir = None
+    _snapshot_entries = None
+    _dirty = None
+
+    # background persistence
+    _writer = None
+    _pending = None
+    _pending_cond = None
+    _n_writes = 0
+    _write_time = 0.
+    _trace = None
+
+    def __getstate__(self):
+        """Get state for pickling.
+
+        The memory-budget configuration is not persisted.
+        """
+        return {}
+
+    def __setstate__(self, state):
+        """Set state after unpickling."""
+        pass
+
+    def __manage(self):
+        """Start bookkeeping of objects in memory."""
+        if self._managed:
+            return
+        self._lock = threading.RLock()
+        self._resident = OrderedDict()
+        self._memory_usage = 0
+        self._pending = set()
+        self._pending_cond = threading.Condition(self._lock)
+        self._managed = True
+
+    def set_memory_budget(self, budget, spill_dir=None, min_spill_size=1024**2):
+        """Set memory budget of the data store.
+
+        :param int budget: approximate maximum size of the objects in memory in bytes
+        :param str spill_dir: directory in which to create a directory for spilled objects
+        :param int min_spill_size: minimum size of an object to be spilled in bytes
+        """
+        self.__manage()
+        with self._lock:
+            if self._memory_budget is None:
+                # initialize bookkeeping of objects in memory
+                if spill_dir:
+                    os.makedirs(spill_dir, exist_ok=True)
+                self._spill_dir = tempfile.mkdtemp(prefix='eskapade_spill_', dir=spill_dir)
+                self._spill_pid = os.getpid()
+                self._memory_budget = int(budget)
+                for key in dict.keys(self):
+                    self.__track(key, dict.__getitem__(self, key))
+            self._memory_budget = int(budget)
+            self._min_spill_size = int(min_spill_size)
+            self.logger.debug('Memory budget of data store set to {budget:d} bytes; spilling to "{path}".',
+                              budget=self._memory_budget, path=self._spill_dir)
+            self.__enforce_budget()
+
+    @property
+    def memory_budget(self):
+        """Memory budget of the data store in bytes (None if not bounded)."""
+        return self._memory_budget
+
+    @property
+    def memory_usage(self):
+        """Approximate size of the objects in memory in bytes."""
+        return self._memory_usage
+
+    def is_spilled(self, key) -> bool:
+        """Check if the object with the specified key has been spilled to disk.
+
+        :param key: data-store key
+        :rtype: bool
+        """
+        return isinstance(dict.get(self, key), _SpilledObject)
+
+    def is_loaded(self, key) -> bool:
+        """Check if the object with the specified key is in memory.
+
+        Objects are not in memory if they have been spilled to disk or if
+        they have been imported lazily and not accessed yet.
+
+        :param key: data-store key
+        :rtype: bool
+        """
+        return key in self and not isinstance(dict.get(self, key), _DeferredObject)
+
+    def mark_cold(self, key):
+        """Mark object as the first candidate to be spilled to disk.
+
+        The object is moved to the least-recently used position.  Nothing is
+        done if the data store has no memory budget.
+
+        :param key: data-store key
+        """
+        if self._memory_budget is None:
+            return
+        with self._lock:
+            if key in self._resident:
+                self._resident.move_to_end(key, last=False)
+
+    def __track(self, key, value):
+        """Start tracking the size of an object in memory."""
+        self.__untrack(key)
+        if self._memory_budget is None or isinstance(value, _DeferredObject):
+            return
+        size = object_size(value)
+        self._resident[key] = size
+        self._memory_usage += size
+
+    def __untrack(self, key):
+        """Stop tracking the size of an object in memory."""
+        self._memory_usage -= self._resident.pop(key, 0)
+
+    def __remove_spill_file(self, key):
+        """Remove the file of a spilled object.
+
+        The file is not removed while the object is waiting to be persisted;
+        it is then removed with the spill directory.
+        """
+        value = dict.get(self, key)
+        if isinstance(value, _SpilledObject) and os.getpid() == self._spill_pid and key not in self._pending:
+            try:
+                os.remove(value.path)
+            except OSError:
+                pass
+
+    def __spill(self, key):
+        """Spill object to disk."""
+        value = dict.__getitem__(self, key)
+        self._spill_count += 1
+        path = os.path.join(self._spill_dir, '{0:d}_{1:d}.pkl'.format(os.getpid(), self._spill_count))
+        self.logger.debug('Spilling data-store object "{key}" ({size:d} bytes) to "{path}".',
+                          key=key, size=self._resident[key], path=path)
+        with open(path, 'wb') as obj_file:
+            pickle.dump(value, obj_file, protocol=pickle.HIGHEST_PROTOCOL)
+        dict.__setitem__(self, key, _SpilledObject(path, self._resident[key], type(value)))
+        self.__untrack(key)
+
+    def __enforce_budget(self, keep=None):
+        """Spill least-recently used objects until memory usage is within budget."""
+        if self._memory_budget is None or self._memory_usage <= self._memory_budget:
+            return
+        for key, size in list(self._resident.items()):
+            if key == keep or size < self._min_spill_size:
+                continue
+            self.__spill(key)
+            if self._memory_usage <= self._memory_budget:
+                break
+
+    def __load(self, key, value):
+        """Load spilled or deferred object and keep it in memory."""
+        self.logger.debug('Loading data-store object "{key}" from "{path}".', key=key, path=value.path)
+        obj = value.load()
+        self.__remove_spill_file(key)
+        dict.__setitem__(self, key, obj)
+        self.__track(key, obj)
+        self.__enforce_budget(keep=key)
+        return obj
+
+    def __set_snapshot(self, dir_path, entries):
+        """Set persisted snapshot of objects that have not changed since."""
+        self.__manage()
+        self._snapshot_dir = dir_path
+        self._snapshot_entries = entries
+        self._dirty = set()
+
+    def __take_snapshot(self, reset_dirty=True, exclude_keys=None):
+        """Take snapshot of the objects to persist.
+
+        The snapshot contains references to the objects in the data store.
+        Objects that are replaced after the snapshot was taken are persisted
+        with their old value.  The snapshot objects are marked as pending
+        until they have been persisted.
+
+        :param bool reset_dirty: start tracking changes since this snapshot
+        :param set exclude_keys: keys of objects that are not in the snapshot; these stay marked as changed
+        :return: objects by key and keys of objects changed since the last snapshot
+        :rtype: tuple
+        """
+        self.__manage()
+        exclude_keys = set(exclude_keys or ())
+        with self._lock:
+            objects = dict((k, v) for k, v in dict.items(self) if k not in exclude_keys)
+            dirty = self._dirty
+            if reset_dirty:
+                self._dirty = (dirty & exclude_keys) if dirty is not None else set()
+            self._pending.update(objects)
+
+        return objects, dirty
+
+    def __persisted(self, keys):
+        """Mark objects as persisted."""
+        with self._lock:
+            self._pending.difference_update(keys)
+            self._pending_cond.notify_all()
+
+    def __submit(self, write_func, background):
+        """Execute write function, in the background writer thread if requested.
+
+        Writes are executed one after another, in the order in which they are
+        submitted.
+        """
+        def _write():
+            start = timeit.default_timer()
+            try:
+                write_func()
+            except Exception as exc:
+                self.logger.warning('Caught exception while persisting data store: "{exc!s}".', exc=exc)
+            finally:
+                duration = timeit.default_timer() - start
+                if self._trace is not None:
+                    self._trace.add_span('write data store', 'persistence', start, duration,
+                                         dict(background=background))
+                with self._lock:
+                    self._write_time += duration
+                    self._n_writes -= 1
+                    self._pending_cond.notify_all()
+
+        with self._lock:
+            self._n_writes += 1
+        if not background:
+            return _write()
+
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1)
+        self._writer.submit(_write)
+
+    def set_trace(self, trace):
+        """Record persistence of the data store in a run trace.
+
+        :param trace: run trace (RunTrace instance), or None to stop recording
+        """
+        self._trace = trace
+
+    def wait_persisted(self, keys=None):
+        """Wait until objects have been persisted by the background writer.
+
+        Objects may be replaced in the data store while they are being
+        persisted in the background, but they should not be modified in place
+        before they have been persisted.  Without keys, wait until all writes
+        have finished.
+
+        :param keys: keys of the objects to wait for (default: all objects)
+        :return: time spent waiting in seconds
+        :rtype: float
+        """
+        if not self._n_writes:
+            return 0.
+
+        start = timeit.default_timer()
+        with self._lock:
+            if keys is None:
+                self._pending_cond.wait_for(lambda: not self._n_writes)
+            else:
+                keys = set(keys)
+                self._pending_cond.wait_for(lambda: not self._pending & keys)
+
+        return timeit.default_timer() - start
+
+    @property
+    def write_time(self):
+        """Total time spent persisting the data store in seconds."""
+        return self._write_time
+
+    def mark_dirty(self, keys=None):
+        """Mark objects as changed since the last persisted snapshot.
+
+        Objects that are stored in the data store are marked automatically.
+        Objects that are modified in place must be marked explicitly.  The
+        process manager marks the output keys of the links in each executed
+        chain, see :meth:`Link.get_output_keys`.
+
+        :param keys: keys of changed objects (default: all objects)
+        """
+        if self._dirty is None:
+            return
+        with self._lock:
+            self._dirty.update(self.keys() if keys is None else keys)
+
+    def __getitem__(self, key):
+        if not self._managed:
+            return dict.__getitem__(self, key)
+
+        with self._lock:
+            value = dict.__getitem__(self, key)
+            if isinstance(value, _DeferredObject):
+                return self.__load(key, value)
+            if key in self._resident:
+                self._resident.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        if not self._managed:
+            return dict.__setitem__(self, key, value)
+
+        with self._lock:
+            self.__remove_spill_file(key)
+            dict.__setitem__(self, key, value)
+            if self._dirty is not None:
+                self._dirty.add(key)
+            self.__track(key, value)
+            self.__enforce_budget(keep=key)
+
+    def __delitem__(self, key):
+        if not self._managed:
+            return dict.__delitem__(self, key)
+
+        with self._lock:
+            self.__remove_spill_file(key)
+            dict.__delitem__(self, key)
+            self.__untrack(key)
+
+    def get(self, key, default=None):
+        """Get object by key, return default if key does not exist."""
+        if not self._managed:
+            return dict.get(self, key, default)
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        """Get object by key, store default if key does not exist."""
+        if not self._managed:
+            return dict.setdefault(self, key, default)
+        with self._lock:
+            if key not in self:
+                self[key] = default
+            return self[key]
+
+    def pop(self, key, *default):
+        """Remove object by key and return it."""
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def update(self, *args, **kwargs):
+        """Update data store from mapping or iterable of key-value pairs."""
+        if not self._managed:
+            return dict.update(self, *args, **kwargs)
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        """Remove all objects."""
+        if not self._managed:
+            return dict.clear(self)
+        for key in list(self.keys()):
+            del self[key]
+
+    def __iter__(self):
+        # Overriding iteration makes dict(ds) and {**ds} get the objects with
+        # __getitem__, which loads spilled and deferred objects, instead of
+        # reading the values from the dictionary directly.
+        return dict.__iter__(self)
+
+    def copy(self):
+        """Get shallow copy of the data store as dictionary, with spilled and deferred objects loaded."""
+        if not self._managed:
+            return dict.copy(self)
+        return dict(self.items())
+
+    def __peek(self, key):
+        """Get object by key, without keeping a spilled or deferred object in memory."""
+        return self.__load_copy(dict.__getitem__(self, key))
+
+    @staticmethod
+    def __load_copy(value):
+        """Load copy of spilled or deferred object."""
+        return value.load() if isinstance(value, _DeferredObject) else value
+
+    def items(self):
+        """Get key-value pairs.
+
+        Spilled and deferred objects are loaded one at a time, without keeping
+        them in memory.
+        """
+        if not self._managed:
+            return dict.items(self)
+        return ((key, self.__peek(key)) for key in list(self.keys()))
+
+    def values(self):
+        """Get objects.
+
+        Spilled and deferred objects are loaded one at a time, without keeping
+        them in memory.
+        """
+        if not self._managed:
+            return dict.values(self)
+        return (self.__peek(key) for key in list(self.keys()))
+
+    def persist_in_dir(self, dir_path, n_workers=None, background=False, exclude_keys=None):
+        """Persist data-store objects in separate files.
+
+        Each object is written to its own file, in parallel threads.  Data
+        frames are written as Parquet (if pyarrow is installed), NumPy arrays
+        as npy, and other objects with pickle, see
+        :mod:`eskapade.core.data_store_io`.
+
+        Objects that have not changed since the last snapshot was persisted
+        or imported are not written again, but hard-linked to their files in
+        the directory of that snapshot, see :meth:`mark_dirty`.
+
+        Objects can be persisted in a background thread.  The data store can
+        then be used while the objects are written, see :meth:`wait_persisted`.
+
+        :param str dir_path: path of the directory to write the object files to
+        :param int n_workers: number of writer threads
+        :param bool background: persist in the background writer thread
+        :param set exclude_keys: keys of objects that are not persisted
+        """
+        if not background:
+            self.wait_persisted()
+        objects, dirty = self.__take_snapshot(exclude_keys=exclude_keys)
+        self.logger.debug('Persisting {n:d} data-store objects in directory "{path}"{bg}.',
+                          n=len(objects), path=dir_path, bg=' in the background' if background else '')
+
+        def _write():
+            try:
+                # link files of objects that have not changed since the previous snapshot
+                link_from = {}
+                prev_dir = self._snapshot_dir
+                if dirty is not None and prev_dir and os.path.abspath(prev_dir) != os.path.abspath(dir_path):
+                    link_from = dict((key, (prev_dir, entry)) for key, entry in
+                                     self._snapshot_entries.items() if key in objects and key not in dirty)
+                manifest = data_store_io.write_objects(list(objects), lambda k: self.__load_copy(objects[k]),
+                                                       dir_path, n_workers=n_workers, link_from=link_from,
+                                                       on_written=lambda k: self.__persisted([k]))
+                self._snapshot_dir, self._snapshot_entries = dir_path, manifest['objects']
+            except Exception as exc:
+                # changes since the previous snapshot are lost: write all objects next time
+                self._snapshot_dir = None
+                raise exc
+            finally:
+                self.__persisted(objects)
+
+        self.__submit(_write, background)
+
+    def persist_in_file(self, file_path, background=False, exclude_keys=None):
+        """Persist data store in Pickle file.
+
+        :param str file_path: path of Pickle file
+        :param bool background: persist in the background writer thread, see :meth:`wait_persisted`
+        :param set exclude_keys: keys of objects that are not persisted
+        """
+        if not background:
+            self.wait_persisted()
+            if not exclude_keys:
+                return super().persist_in_file(file_path)
+
+        # persist a snapshot data store with references to the current objects
+        objects, _ = self.__take_snapshot(reset_dirty=False, exclude_keys=exclude_keys)
+        snapshot = type(self).create()
+        snapshot.__manage()
+        dict.update(snapshot, objects)
+
+        def _write():
+            try:
+                ProcessService.persist_in_file(snapshot, file_path)
+            finally:
+                self.__persisted(objects)
+
+        self.logger.debug('Persisting data store in file "{path}" in the background.', path=file_path)
+        self.__submit(_write, background)
+
+    @classmethod
+    def import_from_dir(cls, dir_path, n_workers=None, lazy=False):
+        """Import data store from separate object files.
+
+        With lazy import, only the manifest of the object files is read.  Each
+        object is loaded from its file when it is accessed for the first
+        time.  NumPy arrays are then memory-mapped (copy-on-write) and Parquet
+        files are read with memory mapping.
+
+        :param str dir_path: path of the directory with the object files
+        :param int n_workers: number of reader threads
+        :param bool lazy: load objects on first access
+        :returns: imported data store
+        :rtype: DataStore
+        """
+        cls.logger.debug('Importing data store from directory "{path}"{lazy}.', path=dir_path,
+                         lazy=' (lazy)' if lazy else '')
+        inst = cls.create()
+        entries = data_store_io.read_manifest(dir_path)['objects']
+        if lazy:
+            dict.update(inst, ((key, _DeferredObject(dir_path, entry, mmap=True)) for key, entry in entries.items()))
+        else:
+            dict.update(inst, data_store_io.read_objects(dir_path, n_workers=n_workers))
+        inst.__set_snapshot(dir_path, entries)
+
+        return inst
+
+    def finish(self):
+        """Finish current processes.
+
+        Wait for the background writer and remove the directory with spilled
+        objects.
+        """
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
+        if self._spill_dir and os.getpid() == self._spill_pid:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+
     def Print(self):
         """Print a summary the data store contents."""
         self.logger.info('Summary of data store ({n:d} objects)', n=len(self))
@@ -403,8 +1003,13 @@ class DataStore(ProcessService, dict):
 
         max_key_len = max(len(k) for k in self.keys())
         for key in sorted(self.keys()):
-            self.logger.info('  {{0:<{:d}s}}  <{{1:s}}.{{2:s}} at {{3:x}}>'.
+            value = dict.__getitem__(self, key)
+            deferred = isinstance(value, _DeferredObject)
+            obj_type = value.obj_type if deferred else type(value)
+            self.logger.info('  {{0:<{:d}s}}  <{{1:s}}.{{2:s}} at {{3:x}}>{{4:s}}'.
                              format(max_key_len).format(key,
-                                                        type(self[key]).__module__,
-                                                        type(self[key]).__name__,
-                                                        id(self[key])))
+                                                        obj_type.__module__,
+                                                        obj_type.__name__,
+                                                        id(value),
+                                                        ' (spilled)' if isinstance(value, _SpilledObject)
+                                                        else ' (not loaded)' if deferred else ''))
@@ -0,0 +1,242 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/28
+
+Description:
+    Benchmark of the runs of a macro
+
+    A macro is run a number of times in the same process, after one or more
+    warm-up runs, with a reset of Eskapade in between.  The wall time of the
+    runs and of each chain and link is collected with the run metrics, and
+    summarized by the median and the 95th percentile.  Benchmark results can
+    be compared with a baseline to detect performance regressions.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import json
+import math
+import statistics
+import timeit
+from collections import OrderedDict
+
+from eskapade.logger import Logger
+
+# fields of a comparison of benchmark results
+COMPARE_FIELDS = ['name', 'baseline', 'value', 'change', 'regression']
+
+# absolute increase of a time below which it is not a regression
+MIN_TIME_INCREASE = 1e-3
+
+logger = Logger()
+
+
+def percentile(values, pct):
+    """Compute percentile of values, interpolating between the closest ranks.
+
+    :param list values: values
+    :param float pct: percentile, between 0 and 100
+    :return: percentile of the values
+    :rtype: float
+    """
+    values = sorted(values)
+    if not values:
+        raise ValueError('no values to compute percentile of')
+    rank = (len(values) - 1) * pct / 100.
+    low, high = int(math.floor(rank)), int(math.ceil(rank))
+
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def data_store_size(ds):
+    """Estimate memory size of the objects in the data store.
+
+    Objects that are not in memory are not counted.
+
+    :param DataStore ds: data store
+    :return: approximate size in bytes
+    :rtype: int
+    """
+    from eskapade.core.process_services import object_size, _DeferredObject
+
+    return sum(object_size(obj) for obj in dict.values(ds) if not isinstance(obj, _DeferredObject))
+
+
+def run_once(settings):
+    """Run macro once and collect its metrics.
+
+    :param ConfigObject settings: settings of the run
+    :return: wall time of the run, metrics records, peak memory, and data-store size
+    :rtype: dict
+    """
+    from eskapade.core import execution
+    from eskapade.core.definitions import StatusCode
+    from eskapade.core.process_manager import process_manager
+    from eskapade.core.process_services import DataStore
+    from eskapade.core.run_metrics import RunMetrics, peak_rss
+
+    execution.reset_eskapade()
+    settings['collectRunMetrics'] = True
+    settings['interactive'] = False
+    start = timeit.default_timer()
+    status = execution.eskapade_run(settings)
+    wall_time = timeit.default_timer() - start
+    if status != StatusCode.Success:
+        raise RuntimeError('benchmark run failed with status "{}"'.format(status))
+
+    result = dict(wall_time=wall_time, records=process_manager.service(RunMetrics).records(), peak_rss=peak_rss(),
+                  data_store_size=data_store_size(process_manager.service(DataStore)))
+    execution.reset_eskapade()
+
+    return result
+
+
+def summarize_times(name, chain, link, times):
+    """Summarize times of a benchmarked element.
+
+    :param str name: name of the element, e.g. "chain/link"
+    :param str chain: name of the chain
+    :param str link: name of the link
+    :param list times: times of the benchmark runs
+    :return: times with their median and 95th percentile
+    :rtype: dict
+    """
+    return OrderedDict([('name', name), ('chain', chain), ('link', link), ('median', statistics.median(times)),
+                        ('p95', percentile(times, 95)), ('times', list(times))])
+
+
+def benchmark_macro(create_settings, n_runs=5, n_warmup=1):
+    """Benchmark the runs of a macro.
+
+    The settings of each run are created by a function, which is called
+    before the run.  The wall time of a chain or link is the sum of the
+    times of its initialize, execute, and finalize phases.  The peak memory
+    is the peak resident set size of the process, which includes the
+    memory used by preceding runs.
+
+    :param create_settings: function that creates the settings of a run
+    :param int n_runs: number of benchmark runs
+    :param int n_warmup: number of warm-up runs, which are not included in the results
+    :return: benchmark results
+    :rtype: dict
+    """
+    if n_runs < 1:
+        raise ValueError('number of benchmark runs must be positive')
+
+    for it in range(n_warmup):
+        logger.info('Warm-up run {it:d}/{n:d}.', it=it + 1, n=n_warmup)
+        run_once(create_settings())
+
+    runs = []
+    for it in range(n_runs):
+        logger.info('Benchmark run {it:d}/{n:d}.', it=it + 1, n=n_runs)
+        runs.append(run_once(create_settings()))
+
+    # collect times of chains and links in order of first execution
+    times = OrderedDict()
+    for run in runs:
+        elem_times = OrderedDict()
+        for rec in run['records']:
+            key = (rec['chain'], rec['link'])
+            elem_times[key] = elem_times.get(key, 0.) + rec['wall_time']
+        for key, wall_time in elem_times.items():
+            times.setdefault(key, []).append(wall_time)
+
+    timings = [summarize_times('run', None, None, [_['wall_time'] for _ in runs])]
+    timings += [summarize_times(chain if link is None else '{}/{}'.format(chain, link), chain, link, elem_times)
+                for (chain, link), elem_times in times.items()]
+    peak_rss = [_['peak_rss'] for _ in runs if _['peak_rss'] is not None]
+
+    return OrderedDict([('runs', n_runs), ('warmup', n_warmup), ('timings', timings),
+                        ('peak_rss', max(peak_rss) if peak_rss else None),
+                        ('data_store_size', max(_['data_store_size'] for _ in runs))])
+
+
+def print_results(results):
+    """Print benchmark results.
+
+    :param dict results: benchmark results
+    """
+    logger.info('Wall time of {n:d} runs (median, 95th percentile):', n=results['runs'])
+    for timing in results['timings']:
+        logger.info('  {median:9.3f} s {p95:9.3f} s  {name}', **timing)
+    if results['peak_rss'] is not None:
+        logger.info('Peak memory: {size:.1f} MB.', size=results['peak_rss'] / 1024**2)
+    logger.info('Data-store size: {size:.1f} MB.', size=results['data_store_size'] / 1024**2)
+
+
+def write_results(results, path):
+    """Write benchmark results to JSON file.
+
+    :param dict results: benchmark results
+    :param str path: path of the output file
+    """
+    with open(path, 'w') as out_file:
+        json.dump(results, out_file, indent=2)
+    logger.info('Benchmark results written to "{path}".', path=path)
+
+
+def read_results(path):
+    """Read benchmark results from JSON file.
+
+    :param str path: path of the input file
+    :return: benchmark results
+    :rtype: dict
+    """
+    with open(path) as in_file:
+        return json.load(in_file)
+
+
+def compare_results(baseline, results, threshold=0.1):
+    """Compare benchmark results with baseline results.
+
+    The median times of the run, the chains, and the links, the peak memory,
+    and the data-store size are compared.  An increase of more than the
+    threshold, relative to the baseline, is a regression.  Time increases
+    below a millisecond are ignored.
+
+    :param dict baseline: baseline benchmark results
+    :param dict results: benchmark results to compare
+    :param float threshold: maximum relative increase that is not a regression
+    :return: comparisons of the values in both results
+    :rtype: list
+    """
+    base_values = OrderedDict((_['name'], _['median']) for _ in baseline['timings'])
+    values = OrderedDict((_['name'], _['median']) for _ in results['timings'])
+    min_increase = dict.fromkeys(values, MIN_TIME_INCREASE)
+    for key in ('peak_rss', 'data_store_size'):
+        base_values[key], values[key], min_increase[key] = baseline.get(key), results.get(key), 0
+
+    comparisons = []
+    for name, value in values.items():
+        base_value = base_values.get(name)
+        if value is None or base_value is None:
+            continue
+        change = (value - base_value) / base_value if base_value else 0.
+        regression = change > threshold and value - base_value > min_increase[name]
+        comparisons.append(OrderedDict(zip(COMPARE_FIELDS, (name, base_value, value, change, regression))))
+
+    return comparisons
+
+
+def print_comparison(comparisons, threshold):
+    """Print comparison of benchmark results.
+
+    :param list comparisons: comparisons of the values in both results
+    :param float threshold: maximum relative increase that is not a regression
+    """
+    logger.info('Change with respect to baseline (baseline, value, change):')
+    for comp in comparisons:
+        log = logger.warning if comp['regression'] else logger.info
+        log('  {baseline:12.6g} {value:12.6g} {change:+8.1%}  {name}{flag}', flag=' REGRESSION' if comp['regression']
+            else '', **comp)
+    n_regr = sum(_['regression'] for _ in comparisons)
+    if n_regr:
+        logger.warning('Found {n:d} regression(s) above threshold of {thr:.1%}.', n=n_regr, thr=threshold)
+    else:
+        logger.info('No regressions above threshold of {thr:.1%}.', thr=threshold)
@@ -0,0 +1,199 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/19
+
+Description:
+    Registry of performance metrics of a run
+
+    For each phase (initialize, execute, finalize) of each link and chain,
+    the wall-clock time, the CPU time, the increase of the peak memory
+    usage, and the number of calls are recorded.  For link execution, also
+    the numbers of rows of the input and output data frames are counted.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import contextlib
+import csv
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+from eskapade.core.mixin import TimerMixin
+from eskapade.core.process_services import ProcessService
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+# metrics recorded for each phase, in order of output
+METRIC_FIELDS = ['chain', 'link', 'phase', 'calls', 'wall_time', 'cpu_time', 'max_rss_delta', 'rows_in', 'rows_out']
+
+
+def peak_rss():
+    """Get peak resident set size of the process.
+
+    :return: peak resident set size in bytes (None if unknown)
+    :rtype: int
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def count_rows(ds, keys):
+    """Count rows of data frames in data store.
+
+    Objects that are not in memory are not loaded and not counted.
+
+    :param dict ds: data store
+    :param keys: keys of objects to count rows of
+    :return: total number of rows of the data frames and series
+    :rtype: int
+    """
+    # data frames only exist if Pandas has been imported
+    pd = sys.modules.get('pandas')
+    if pd is None:
+        return 0
+
+    n_rows = 0
+    for key in keys or ():
+        obj = dict.get(ds, key)
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            n_rows += len(obj)
+
+    return n_rows
+
+
+class RunMetrics(ProcessService):
+    """Registry of performance metrics of a run.
+
+    Metrics are collected if the registry is enabled, which the process
+    manager does if the "collectRunMetrics" setting is true.  The metrics
+    of all calls of a phase of a link or chain are accumulated in one
+    record.  The number of calls of the "execute" phase of a chain is the
+    number of times the chain was executed, including repeats.
+
+    The CPU time is the CPU time of the whole process, which includes the
+    time spent by other threads, e.g. of links executed in parallel.
+    """
+
+    def __init__(self):
+        """Initialize run-metrics instance."""
+        self.enabled = False
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure(self, chain, link, phase, ds=None, in_keys=None, out_keys=None):
+        """Measure a phase of a link or chain.
+
+        :param str chain: name of the chain
+        :param str link: name of the link (None for the chain itself)
+        :param str phase: name of the phase, e.g. "execute"
+        :param dict ds: data store to count rows of input and output data frames in
+        :param in_keys: keys of the input objects
+        :param out_keys: keys of the output objects
+        """
+        rows_in = count_rows(ds, in_keys) if ds is not None else 0
+        rss = peak_rss()
+        timer = TimerMixin()
+        timer.start_timer()
+        try:
+            yield
+        finally:
+            timer.stop_timer()
+            rss_delta = peak_rss() - rss if rss is not None else 0
+            rows_out = count_rows(ds, out_keys) if ds is not None else 0
+            self.add(dict(chain=chain, link=link, phase=phase, calls=1, wall_time=timer.total_time(),
+                          cpu_time=timer.total_cpu_time(), max_rss_delta=rss_delta, rows_in=rows_in,
+                          rows_out=rows_out))
+
+    def add(self, record):
+        """Add metrics of a call to the registry.
+
+        :param dict record: metrics, with a value for each of the fields in METRIC_FIELDS
+        """
+        key = (record['chain'], record['link'], record['phase'])
+        with self._lock:
+            acc = self._records.get(key)
+            if acc is None:
+                self._records[key] = dict(record)
+                return
+            for field in ('calls', 'wall_time', 'cpu_time', 'rows_in', 'rows_out'):
+                acc[field] += record[field]
+            acc['max_rss_delta'] = max(acc['max_rss_delta'], record['max_rss_delta'])
+
+    def merge(self, records):
+        """Merge metrics records, e.g. collected in another process.
+
+        :param list records: accumulated metrics records
+        """
+        for record in records:
+            self.add(record)
+
+    def clear(self):
+        """Remove all metrics records."""
+        with self._lock:
+            self._records.clear()
+
+    def records(self):
+        """Get accumulated metrics.
+
+        :return: metrics records, in order of first call
+        :rtype: list
+        """
+        with self._lock:
+            return [dict(_) for _ in self._records.values()]
+
+    def to_frame(self):
+        """Get accumulated metrics as data frame.
+
+        :return: metrics with one row per phase of each link and chain
+        :rtype: pandas.DataFrame
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.records(), columns=METRIC_FIELDS)
+
+    def dump(self, path):
+        """Write accumulated metrics to file.
+
+        The metrics are written in CSV format if the file name ends with
+        ".csv" and in JSON format otherwise.
+
+        :param str path: path of the output file
+        """
+        with open(path, 'w') as out_file:
+            if path.lower().endswith('.csv'):
+                writer = csv.DictWriter(out_file, fieldnames=METRIC_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.records())
+            else:
+                json.dump(self.records(), out_file, indent=2)
+        self.logger.info('Run metrics written to "{path}".', path=path)
+
+    def print_summary(self, n_max=10):
+        """Print the link executions that took the most time.
+
+        :param int n_max: maximum number of links to print
+        """
+        records = sorted((_ for _ in self.records() if _['link'] is not None and _['phase'] == 'execute'),
+                         key=lambda r: r['wall_time'], reverse=True)
+        if not records:
+            return
+        self.logger.info('Slowest link executions (wall time, CPU time, calls):')
+        for rec in records[:n_max]:
+            self.logger.info('  {wall:9.2f} s {cpu:9.2f} s {calls:6d}  {chain}/{link}', wall=rec['wall_time'],
+                             cpu=rec['cpu_time'], calls=rec['calls'], chain=rec['chain'], link=rec['link'])
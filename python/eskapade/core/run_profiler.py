@@ -0,0 +1,136 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/23
+
+Description:
+    Profiling of targeted links
+
+    Links that are targeted by name, or by the name of their chain, are
+    profiled separately with cProfile.  Optionally, the memory allocations
+    of each execution of a targeted link are traced with tracemalloc.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import threading
+import tracemalloc
+from collections import OrderedDict
+
+from eskapade.core.process_services import ProcessService
+
+
+class RunProfiler(ProcessService):
+    """Profiler of targeted links.
+
+    The profiler is configured by the process manager from the
+    "profileTargets", "doCodeProfiling", and "profileMemoryTop" settings.
+    Each targeted link gets its own cProfile profile, which accumulates the
+    statistics of all phases and repeats of the link.
+
+    Only one profile can be active at a time, so a targeted link that is
+    executed while another targeted link is profiled, e.g. in a chain with
+    parallel workers, is not profiled.
+    """
+
+    def __init__(self):
+        """Initialize profiler instance."""
+        self.targets = set()
+        self.sort_key = 'time'
+        self.memory_top = None
+        self._profiles = OrderedDict()
+        self._memory_reports = OrderedDict()
+        self._active = False
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Check if any links are targeted."""
+        return bool(self.targets)
+
+    def is_target(self, chain, link):
+        """Check if a link is targeted.
+
+        :param str chain: name of the chain of the link
+        :param str link: name of the link
+        :rtype: bool
+        """
+        return link in self.targets or chain in self.targets
+
+    @contextlib.contextmanager
+    def profile(self, chain, link, phase):
+        """Profile a phase of a link.
+
+        :param str chain: name of the chain of the link
+        :param str link: name of the link
+        :param str phase: name of the phase, e.g. "execute"
+        """
+        with self._lock:
+            active, self._active = self._active, True
+        if active:
+            self.logger.debug('Another link is profiled; not profiling link "{link}".', link=link)
+            yield
+            return
+
+        key = (chain, link)
+        profile = self._profiles.setdefault(key, cProfile.Profile())
+        trace_memory = self.memory_top and phase == 'execute'
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            before = tracemalloc.take_snapshot()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            if trace_memory:
+                stats = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+                reports = self._memory_reports.setdefault(key, [])
+                reports.append('Execution {0:d}, top {1:d} allocations:\n{2:s}\n'.format(
+                    len(reports) + 1, self.memory_top, '\n'.join(str(_) for _ in stats[:self.memory_top])))
+            with self._lock:
+                self._active = False
+
+    def dump(self, dir_path):
+        """Write profiles and memory reports of the targeted links.
+
+        For each link, the profile statistics are written to a pstats file,
+        which can be read with pstats.Stats, and the allocation reports to a
+        text file.  The top of each profile is printed.
+
+        :param str dir_path: path of the output directory
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        os.makedirs(dir_path, exist_ok=True)
+        for (chain, link), profile in self._profiles.items():
+            base_name = '_'.join('{0!s}.{1!s}'.format(chain, link).replace('/', '_').split())
+            stats_path = os.path.join(dir_path, base_name + '.pstats')
+            profile.dump_stats(stats_path)
+            output = io.StringIO()
+            pstats.Stats(profile, stream=output).sort_stats(self.sort_key).print_stats(20)
+            self.logger.info('Profile of link "{link}" in chain "{chain}" (sorted by {key}, written to "{path}"):\n'
+                             '{stats}', link=link, chain=chain, key=self.sort_key, path=stats_path,
+                             stats=output.getvalue())
+
+            reports = self._memory_reports.get((chain, link))
+            if reports:
+                mem_path = os.path.join(dir_path, base_name + '.memory.txt')
+                with open(mem_path, 'w') as mem_file:
+                    mem_file.write('\n'.join(reports))
+                self.logger.info('Memory allocations of link "{link}" in chain "{chain}" written to "{path}".',
+                                 link=link, chain=chain, path=mem_path)
@@ -0,0 +1,248 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/26
+
+Description:
+    Server that runs Eskapade macros in a warm interpreter
+
+    The server imports Eskapade and the modules used by the macros once, and
+    listens on a local Unix socket.  Each run request is executed in a
+    forked child process, which starts with a fresh process manager.  The
+    output of the run is streamed back to the client, followed by its exit
+    code.
+
+    Protocol: the client sends one line with a JSON object with the
+    command-line arguments of eskapade_run ("args"), the working directory
+    ("cwd"), and the environment ("env").  The server sends the output of
+    the run, followed by a NUL byte and a JSON object with the exit code
+    ("exit_code").
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import traceback
+
+from eskapade.logger import Logger, ConsoleHandler, ConsoleErrHandler, global_log_publisher
+
+# modules imported by the server before accepting requests
+DEFAULT_PRELOAD = ['numpy', 'pandas', 'matplotlib', 'eskapade.core_ops', 'eskapade.analysis', 'eskapade.visualization']
+
+# separator between run output and exit code
+END_OF_OUTPUT = b'\0'
+
+logger = Logger()
+
+
+def default_socket_path():
+    """Get default path of the server socket.
+
+    :return: path in the temporary directory, specific to the user
+    :rtype: str
+    """
+    return os.path.join(tempfile.gettempdir(), 'eskapade-{:d}.sock'.format(os.getuid()))
+
+
+def redirect_output(fd):
+    """Redirect standard output and error of the current process.
+
+    Both the file descriptors and the Python streams are redirected, which
+    includes the streams of the Eskapade console log handlers.
+
+    :param int fd: file descriptor to write the output to
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    sys.stdout = open(1, 'w', buffering=1, closefd=False)
+    sys.stderr = open(2, 'w', buffering=1, closefd=False)
+    for handler in global_log_publisher.handlers:
+        if isinstance(handler, ConsoleHandler):
+            handler.setStream(sys.stdout)
+        elif isinstance(handler, ConsoleErrHandler):
+            handler.setStream(sys.stderr)
+
+
+def run_request(request):
+    """Execute run request in the current process.
+
+    The process is set up for the run with the working directory and
+    environment of the client.  This function is called in the forked child
+    process of a request.
+
+    :param dict request: run request, with arguments, working directory, and environment
+    :return: exit code of the run
+    :rtype: int
+    """
+    from eskapade.core import execution
+    from eskapade.core.definitions import StatusCode, set_cwd_dir_defaults
+    from eskapade.core.run_utils import create_arg_parser, create_settings
+
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    set_cwd_dir_defaults()
+    args = list(request['args'])
+    sys.argv = ['eskapade_run'] + args
+
+    try:
+        user_args = create_arg_parser().parse_args(args)
+    except SystemExit as exc:
+        # invalid arguments or help requested
+        return exc.code or 0
+    if user_args.interactive:
+        logger.error('Interactive sessions are not supported by the Eskapade server.')
+        return 1
+
+    try:
+        execution.reset_eskapade()
+        status = execution.eskapade_run(create_settings(user_args))
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+    return 0 if status == StatusCode.Success else 1
+
+
+class RunRequestHandler(socketserver.StreamRequestHandler):
+    """Handler of run requests, executed in a forked child process."""
+
+    def handle(self):
+        """Execute run request and send its output and exit code."""
+        try:
+            request = json.loads(self.rfile.readline().decode())
+        except ValueError:
+            self.wfile.write(b'Invalid run request.\n' + END_OF_OUTPUT + json.dumps(dict(exit_code=2)).encode())
+            return
+
+        redirect_output(self.connection.fileno())
+        try:
+            exit_code = run_request(request)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        self.wfile.write(END_OF_OUTPUT + json.dumps(dict(exit_code=exit_code)).encode())
+
+
+class RunServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Server of run requests on a Unix socket."""
+
+    def __init__(self, socket_path):
+        """Initialize server.
+
+        A stale socket file is removed.  The socket is only accessible by the
+        user.
+
+        :param str socket_path: path of the socket
+        """
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, RunRequestHandler)
+        finally:
+            os.umask(old_umask)
+        self.socket_path = socket_path
+
+    def server_close(self):
+        """Close server and remove socket."""
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def preload_modules(modules):
+    """Import modules in the server process.
+
+    The exported attributes of the modules, e.g. the link classes of
+    Eskapade packages, which are imported on first access, are imported too.
+
+    :param list modules: names of the modules to import
+    """
+    import eskapade.utils
+    eskapade.utils.set_matplotlib_backend(batch=True)
+    for module in modules:
+        try:
+            mod = importlib.import_module(module)
+            for attr in getattr(mod, '__all__', ()):
+                getattr(mod, attr)
+        except (ImportError, AttributeError) as exc:
+            logger.warning('Unable to preload module "{module}": {exc!s}', module=module, exc=exc)
+        else:
+            logger.debug('Preloaded module "{module}".', module=module)
+
+
+def serve(socket_path=None, preload=None):
+    """Serve run requests until the server is terminated.
+
+    :param str socket_path: path of the server socket (default: see default_socket_path)
+    :param list preload: names of modules to import before serving (default: DEFAULT_PRELOAD)
+    """
+    socket_path = socket_path or default_socket_path()
+    preload_modules(DEFAULT_PRELOAD if preload is None else preload)
+
+    server = RunServer(socket_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logger.info('Serving Eskapade runs on "{path}".', path=socket_path)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        logger.info('Stopped serving Eskapade runs.')
+
+
+def submit(args, socket_path=None, out_stream=None):
+    """Submit run request to the server.
+
+    The output of the run is written to the output stream while the run is
+    executed.
+
+    :param list args: command-line arguments of eskapade_run
+    :param str socket_path: path of the server socket (default: see default_socket_path)
+    :param out_stream: binary stream to write the output to (default: standard output)
+    :return: exit code of the run
+    :rtype: int
+    :raises: OSError if the server cannot be reached
+    """
+    socket_path = socket_path or default_socket_path()
+    out_stream = out_stream or sys.stdout.buffer
+    request = dict(args=list(args), cwd=os.getcwd(), env=dict(os.environ))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(request).encode() + b'\n')
+        # hold back data from the last separator, which may be the start of the exit code
+        pending = b''
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                break
+            pending += data
+            sep_pos = pending.rfind(END_OF_OUTPUT)
+            sep_pos = len(pending) if sep_pos < 0 else sep_pos
+            out_stream.write(pending[:sep_pos])
+            out_stream.flush()
+            pending = pending[sep_pos:]
+
+    try:
+        return int(json.loads(pending[len(END_OF_OUTPUT):].decode())['exit_code'])
+    except (ValueError, KeyError, TypeError):
+        # run process terminated without exit code
+        out_stream.write(pending)
+        out_stream.flush()
+        return 1
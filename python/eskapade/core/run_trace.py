@@ -0,0 +1,117 @@
+"""Project: Eskapade - A python-based package for data analysis.
+
+Created: 2018/03/21
+
+Description:
+    Timeline of a run in Trace Event Format
+
+    Spans are recorded for chains, link phases, chain repeats, and
+    persistence steps, and written as a JSON file that can be viewed in
+    chrome://tracing or Perfetto.
+
+Authors:
+    KPMG Advanced Analytics & Big Data team, Amstelveen, The Netherlands
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted according to the terms listed in the file
+LICENSE.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import timeit
+
+from eskapade.core.process_services import ProcessService
+
+
+class RunTrace(ProcessService):
+    """Timeline of a run in Trace Event Format.
+
+    Spans are recorded as complete events ("ph": "X") if the trace is
+    enabled, which the process manager does if the "runTraceFile" setting is
+    set.  Times are relative to the creation of the trace, in microseconds.
+    Spans recorded in forked worker processes, which share the clock of
+    the main process, are merged with their own process ID.
+    """
+
+    def __init__(self):
+        """Initialize run-trace instance."""
+        self.enabled = False
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._start_time = timeit.default_timer()
+
+    @contextlib.contextmanager
+    def span(self, name, cat, args=None):
+        """Record span of a block of code.
+
+        :param str name: name of the span
+        :param str cat: category of the span, e.g. "link"
+        :param args: metadata of the span, or function that returns the metadata after the block
+        :type args: dict or callable
+        """
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            end = timeit.default_timer()
+            self.add_span(name, cat, start, end - start, args() if callable(args) else args)
+
+    def add_span(self, name, cat, start, duration, args=None):
+        """Add span to the trace.
+
+        :param str name: name of the span
+        :param str cat: category of the span
+        :param float start: start time of the span, from timeit.default_timer, in seconds
+        :param float duration: duration of the span in seconds
+        :param dict args: metadata of the span
+        """
+        thread = threading.current_thread()
+        event = dict(name=name, cat=cat, ph='X', ts=(start - self._start_time) * 1e6, dur=duration * 1e6,
+                     pid=os.getpid(), tid=thread.ident)
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._events.append(event)
+            self._threads[(event['pid'], event['tid'])] = thread.name
+
+    def merge(self, events):
+        """Merge trace events, e.g. recorded in another process.
+
+        :param list events: trace events
+        """
+        with self._lock:
+            self._events.extend(events)
+            for event in events:
+                self._threads.setdefault((event['pid'], event['tid']), 'pid {:d}'.format(event['pid']))
+
+    def clear(self):
+        """Remove all trace events."""
+        with self._lock:
+            del self._events[:]
+            self._threads.clear()
+
+    def events(self):
+        """Get recorded trace events.
+
+        :return: trace events
+        :rtype: list
+        """
+        with self._lock:
+            return list(self._events)
+
+    def dump(self, path):
+        """Write trace to JSON file.
+
+        :param str path: path of the output file
+        """
+        with self._lock:
+            events = list(self._events)
+            events += [dict(name='thread_name', ph='M', pid=pid, tid=tid, args=dict(name=thread_name))
+                       for (pid, tid), thread_name in sorted(self._threads.items())]
+        with open(path, 'w') as trace_file:
+            json.dump(dict(traceEvents=events, displayTimeUnit='ms'), trace_file, default=str)
+        self.logger.info('Run trace written to "{path}".', path=path)
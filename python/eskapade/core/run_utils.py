@@ -39,3 +39,31 @@ def create_arg_parser():
             parser.add_argument(*args, **USER_OPTS_KWARGS.get(opt_key, {}))
 
     return parser
+
+
+def create_settings(user_args):
+    """Create configuration object from parsed user arguments.
+
+    :param argparse.Namespace user_args: user arguments, as parsed by the parser from create_arg_parser
+    :returns: configuration object
+    :rtype: ConfigObject
+    """
+    from eskapade.core.process_services import ConfigObject
+
+    # create config object for settings
+    if not user_args.unpickle_config:
+        # create new config
+        settings = ConfigObject()
+    else:
+        # read previously persisted settings if pickled file is specified
+        conf_path = user_args.config_files.pop(0)
+        settings = ConfigObject.import_from_file(conf_path)
+    del user_args.unpickle_config
+
+    # set configuration macros
+    settings.add_macros(user_args.config_files)
+
+    # set user options
+    settings.set_user_opts(user_args)
+
+    return settings
@@ -1,2 +1,7 @@
 # flake8: noqa
-from eskapade.core_ops.links import *
+from eskapade._lazy import lazy_attributes
+from eskapade.core_ops import links
+
+# link classes are imported on first access
+lazy_attributes(__name__, {cls: 'eskapade.core_ops.links:' + cls for cls in links.__all__})
+__all__ = links.__all__
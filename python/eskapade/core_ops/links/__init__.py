@@ -1,15 +1,18 @@
-from eskapade.core_ops.links.assert_in_ds import AssertInDs
-from eskapade.core_ops.links.break_link import Break
-from eskapade.core_ops.links.ds_object_deleter import DsObjectDeleter
-from eskapade.core_ops.links.ds_to_ds import DsToDs
-from eskapade.core_ops.links.event_looper import EventLooper
-from eskapade.core_ops.links.hello_world import HelloWorld
-from eskapade.core_ops.links.ipython_embed import IPythonEmbed
-from eskapade.core_ops.links.line_printer import LinePrinter
-from eskapade.core_ops.links.print_ds import PrintDs
-from eskapade.core_ops.links.repeat_chain import RepeatChain
-from eskapade.core_ops.links.skip_chain_if_empty import SkipChainIfEmpty
-from eskapade.core_ops.links.to_ds_dict import ToDsDict
+from eskapade._lazy import lazy_links
+
+lazy_links(__name__, dict(
+    AssertInDs='assert_in_ds',
+    Break='break_link',
+    DsObjectDeleter='ds_object_deleter',
+    DsToDs='ds_to_ds',
+    EventLooper='event_looper',
+    HelloWorld='hello_world',
+    IPythonEmbed='ipython_embed',
+    LinePrinter='line_printer',
+    PrintDs='print_ds',
+    RepeatChain='repeat_chain',
+    SkipChainIfEmpty='skip_chain_if_empty',
+    ToDsDict='to_ds_dict'))
 
 __all__ = ['AssertInDs',
            'Break',
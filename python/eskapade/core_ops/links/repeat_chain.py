@@ -40,6 +40,15 @@ class RepeatChain(Link):
         self.check_extra_kwargs(kwargs)
 
         self._counter = 0
+        self.repeats_chain = True
+
+    def get_input_keys(self):
+        """Get keys of data-store objects read by the link."""
+        return set()
+
+    def get_output_keys(self):
+        """Get keys of data-store objects stored by the link."""
+        return set()
 
     def initialize(self):
         """Initialize the link."""
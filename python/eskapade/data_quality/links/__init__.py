@@ -1,3 +1,6 @@
-from eskapade.data_quality.links.fix_pandas_dataframe import FixPandasDataFrame
+from eskapade._lazy import lazy_links
+
+lazy_links(__name__, dict(
+    FixPandasDataFrame='fix_pandas_dataframe'))
 
 __all__ = ['FixPandasDataFrame']
@@ -317,7 +317,7 @@ class FixPandasDataFrame(Link):
                 continue
             # store most common datatype
             # first convert to consistent types
-            for dtp in dtype_cnt:
+            for dtp in list(dtype_cnt):
                 ndt = np.dtype(dtp).type
                 if ndt is np.str_ or ndt is np.object_:
                     ndt = str
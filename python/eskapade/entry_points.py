@@ -13,7 +13,6 @@ modification, are permitted according to the terms listed in the file
 LICENSE.
 """
 
-from eskapade import _bootstrap as bootstrap
 from eskapade.logger import LogLevel, Logger, global_log_publisher, ConsoleHandler, ConsoleErrHandler
 
 publisher = global_log_publisher
@@ -41,32 +40,16 @@ def eskapade_run():
     converted to settings in the configuration object.  Optionally, an
     interactive IPython session is started when the run is finished.
     """
-    import IPython
-    import pandas as pd
-
-    from eskapade import process_manager, ConfigObject, DataStore
-    from eskapade.core import execution
-    from eskapade.core.run_utils import create_arg_parser
+    from eskapade.core.run_utils import create_arg_parser, create_settings
 
     # create parser for command-line arguments
     parser = create_arg_parser()
     user_args = parser.parse_args()
 
-    # create config object for settings
-    if not user_args.unpickle_config:
-        # create new config
-        settings = ConfigObject()
-    else:
-        # read previously persisted settings if pickled file is specified
-        conf_path = user_args.config_files.pop(0)
-        settings = ConfigObject.import_from_file(conf_path)
-    del user_args.unpickle_config
-
-    # set configuration macros
-    settings.add_macros(user_args.config_files)
+    from eskapade.core import execution
 
-    # set user options
-    settings.set_user_opts(user_args)
+    # create config object for settings
+    settings = create_settings(user_args)
 
     try:
         # run Eskapade
@@ -77,6 +60,11 @@ def eskapade_run():
 
     # start interpreter if requested (--interactive on command line)
     if settings.get('interactive'):
+        import IPython
+        import pandas as pd
+
+        from eskapade import process_manager, DataStore
+
         # set Pandas display options
         pd.set_option('display.width', 120)
         pd.set_option('display.max_columns', 50)
@@ -87,6 +75,130 @@ def eskapade_run():
         IPython.embed()
 
 
+def eskapade_bench():
+    """Benchmark Eskapade runs.
+
+    The macro is run a number of times with the arguments of eskapade_run,
+    and the timing distributions of the runs, chains, and links are
+    reported.  With the --compare option, the benchmark results in two
+    files are compared instead, and the exit code is nonzero if the second
+    file shows regressions with respect to the first.
+    """
+    import copy
+    import sys
+
+    from eskapade.core import run_bench
+    from eskapade.core.run_utils import create_arg_parser, create_settings
+
+    parser = create_arg_parser()
+    parser.prog = 'eskapade_bench'
+    group = parser.add_argument_group('benchmark arguments')
+    group.add_argument('--runs', type=int, default=5, help='number of benchmark runs (default: 5)')
+    group.add_argument('--warmup', type=int, default=1, help='number of warm-up runs (default: 1)')
+    group.add_argument('--bench-file', metavar='FILE', help='write benchmark results to JSON file FILE')
+    group.add_argument('--compare', action='store_true',
+                       help='compare benchmark results in the files BASELINE_FILE and RESULTS_FILE, '
+                            'specified instead of configuration files')
+    group.add_argument('--threshold', type=float, default=0.1,
+                       help='relative increase with respect to the baseline that is a regression (default: 0.1)')
+    user_args = parser.parse_args()
+
+    if user_args.compare:
+        if len(user_args.config_files) != 2:
+            parser.error('--compare requires two files with benchmark results')
+        baseline, results = (run_bench.read_results(_) for _ in user_args.config_files)
+        comparisons = run_bench.compare_results(baseline, results, user_args.threshold)
+        run_bench.print_comparison(comparisons, user_args.threshold)
+        sys.exit(1 if any(_['regression'] for _ in comparisons) else 0)
+
+    # settings are created from a copy of the arguments, which are modified in the process
+    results = run_bench.benchmark_macro(lambda: create_settings(copy.deepcopy(user_args)), user_args.runs,
+                                        user_args.warmup)
+    # report results regardless of the logging level of the runs
+    publisher.log_level = LogLevel.INFO
+    run_bench.print_results(results)
+    if user_args.bench_file:
+        run_bench.write_results(results, user_args.bench_file)
+
+
+def eskapade_map_reduce():
+    """Run Eskapade macro on input files in parallel and merge the results.
+
+    The macro is run once for each input file, with the arguments of
+    eskapade_run, in a pool of worker processes.  The results of the runs
+    are merged and stored in the data store, which is persisted as in a
+    normal run.
+    """
+    import importlib
+
+    from eskapade.core import map_reduce
+    from eskapade.core.run_utils import create_arg_parser, create_settings
+
+    parser = create_arg_parser()
+    parser.prog = 'eskapade_map_reduce'
+    group = parser.add_argument_group('map-reduce arguments')
+    group.add_argument('--input', action='append', required=True, metavar='PATH',
+                       help='input file or glob pattern of input files; the macro is run on each file')
+    group.add_argument('--result-key', action='append', required=True, metavar='KEY',
+                       help='data-store key of the results to merge')
+    group.add_argument('--workers', type=int, help='number of worker processes (default: number of CPUs)')
+    group.add_argument('--read-link', metavar='NAME',
+                       help='name of the ReadToDf link that reads the input files (default: the only ReadToDf link)')
+    group.add_argument('--reducer', metavar='MODULE:FUNCTION',
+                       help='function that merges the results of two runs (default: merge by type)')
+    user_args = parser.parse_args()
+
+    reducer = None
+    if user_args.reducer:
+        module, _, func = user_args.reducer.partition(':')
+        reducer = getattr(importlib.import_module(module), func)
+
+    map_reduce.run_map_reduce(create_settings(user_args), user_args.input, user_args.result_key, user_args.workers,
+                              reducer, user_args.read_link)
+
+
+def eskapade_serve():
+    """Serve Eskapade runs from a warm interpreter.
+
+    Eskapade and the modules used by the macros are imported once.  Runs
+    are submitted with eskapade_submit and executed in forked processes.
+    """
+    import argparse
+
+    from eskapade.core import run_server
+
+    parser = argparse.ArgumentParser('eskapade_serve', description='Serve Eskapade runs from a warm interpreter.')
+    parser.add_argument('--socket', default=run_server.default_socket_path(),
+                        help='Path of the server socket. Default is: {}.'.format(run_server.default_socket_path()))
+    parser.add_argument('--preload', nargs='*', metavar='MODULE', default=run_server.DEFAULT_PRELOAD,
+                        help='Modules to import before serving. Default is: {}.'
+                        .format(' '.join(run_server.DEFAULT_PRELOAD)))
+    args = parser.parse_args()
+
+    run_server.serve(args.socket, args.preload)
+
+
+def eskapade_submit():
+    """Submit Eskapade run to the server.
+
+    The command-line arguments are those of eskapade_run.  The socket of the
+    server is specified by the ESKAPADE_SOCKET environment variable, which
+    defaults to the default socket of eskapade_serve.
+    """
+    import os
+    import sys
+
+    from eskapade.core import run_server
+
+    socket_path = os.environ.get('ESKAPADE_SOCKET')
+    try:
+        exit_code = run_server.submit(sys.argv[1:], socket_path)
+    except OSError as exc:
+        logger.fatal('Unable to submit run to Eskapade server: {exc!s}', exc=exc)
+        exit_code = 1
+    sys.exit(exit_code)
+
+
 def eskapade_trial():
     """Run Eskapade tests.
 
@@ -128,6 +240,8 @@ def eskapade_generate_link():
     """
     import argparse
 
+    from eskapade import _bootstrap as bootstrap
+
     parser = argparse.ArgumentParser('eskapade_generate_link',
                                      description='Generate Eskapade link.')
     parser.add_argument('name',
@@ -153,6 +267,8 @@ def eskapade_generate_macro():
     """Generate Eskapade macro."""
     import argparse
 
+    from eskapade import _bootstrap as bootstrap
+
     parser = argparse.ArgumentParser('eskapade_generate_macro',
                                      description='Generate Eskapade macro.')
     parser.add_argument('name',
@@ -170,6 +286,8 @@ def eskapade_generate_notebook():
     """Generate Eskapade notebook."""
     import argparse
 
+    from eskapade import _bootstrap as bootstrap
+
     parser = argparse.ArgumentParser('eskapade_generate_notebook',
                                      description='Generate Eskapade notebook.')
     parser.add_argument('name',
@@ -187,6 +305,8 @@ def eskapade_bootstrap():
     """Generate Eskapade project structure."""
     import argparse
 
+    from eskapade import _bootstrap as bootstrap
+
     parser = argparse.ArgumentParser('eskapade_bootstrap',
                                      description='Generate Eskapade project structure.',
                                      epilog='Please note, existing files with the same names will be rewritten.')
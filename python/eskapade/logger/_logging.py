@@ -23,15 +23,17 @@ modification, are permitted according to the terms listed in the file
 LICENSE.
 """
 
+import datetime
 import inspect
 import logging
+import logging.handlers
+import queue
 import sys
 import time
+import weakref
 from enum import IntEnum, unique
 from typing import Union, Any
 
-import pendulum
-
 
 # Protected. Should not be exported.
 class _Message(object):
@@ -78,8 +80,13 @@ class LogLevel(IntEnum):
 class LogPublisher(logging.getLoggerClass()):
     """Logging publisher that listens for log events."""
 
-    def __init__(self, name: str = '', level: Union[int, LogLevel] = LogLevel.INFO):
-        """Initialize the publisher."""
+    _queue_listener = None
+
+    def __init__(self, name: str = '', level: Union[int, LogLevel] = LogLevel.NOTSET):
+        """Initialize the publisher.
+
+        By default, the publisher has the logging level of its parent.
+        """
         super().__init__(name, level)
 
     def log(self, _level: LogLevel, _msg: str, *args, **kwargs):
@@ -89,8 +96,8 @@ class LogPublisher(logging.getLoggerClass()):
             extra = kwargs.pop('extra', None)
             stack_info = kwargs.pop('stack_info', False)
 
-            human_time = pendulum.utcfromtimestamp(kwargs.get('log_time', time.time()))
-            kwargs['log_time'] = str(human_time)
+            human_time = datetime.datetime.fromtimestamp(kwargs.get('log_time', time.time()), datetime.timezone.utc)
+            kwargs['log_time'] = human_time.isoformat()
             # We need LogLevel(level) to convert logging level from logging to LogLevel
             # and get its str representation.
             kwargs['log_level'] = str(kwargs.get('log_level', LogLevel(_level)))
@@ -118,6 +125,41 @@ class LogPublisher(logging.getLoggerClass()):
         """
         self.removeHandler(handler)
 
+    def enable_queue(self) -> None:
+        """Write log records in a background thread.
+
+        The handlers of the publisher are replaced by a handler that puts the
+        formatted records on a queue, which is processed by the original
+        handlers in a listener thread.  Logging calls then never wait for
+        console or file output.
+        """
+        if self._queue_listener is not None:
+            return
+        handlers = list(self.handlers)
+        log_queue = queue.Queue(-1)
+        for handler in handlers:
+            self.removeHandler(handler)
+        self.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._queue_listener.start()
+
+    def disable_queue(self) -> None:
+        """Write log records in the logging thread again.
+
+        The records on the queue are written before the original handlers are
+        restored.
+        """
+        listener = self._queue_listener
+        if listener is None:
+            return
+        self._queue_listener = None
+        for handler in listener.handlers:
+            self.addHandler(handler)
+        for handler in list(self.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+                self.removeHandler(handler)
+        listener.stop()
+
     def event(self, event: dict) -> None:
         """Log a logging event.
 
@@ -132,10 +174,10 @@ class LogPublisher(logging.getLoggerClass()):
     def log_level(self):
         """Get logging level.
 
-        :return: The logging level.
+        :return: The logging level, which is that of the parent if the level is not set.
         :rtype: LogLevel
         """
-        return LogLevel(self.level)
+        return LogLevel(self.getEffectiveLevel())
 
     @log_level.setter
     def log_level(self, level: LogLevel):
@@ -156,6 +198,11 @@ logging.setLoggerClass(LogPublisher)
 
 # The global application publisher. There should be only one.
 global_log_publisher = logging.getLogger('eskapade')
+global_log_publisher.log_level = LogLevel.INFO
+
+
+# Loggers of classes with a Logger descriptor, by class.
+_class_observers = weakref.WeakKeyDictionary()
 
 
 # Handlers
@@ -229,7 +276,8 @@ class Logger(object):
 
     Furthermore, logging events are only formatted and evaluated for logging
     levels that are enabled. So, there's no need to check the logging level
-    before logging. It's also efficient.
+    before logging. It's also efficient: the level is checked before a log
+    event is created.
     """
 
     @staticmethod
@@ -272,16 +320,22 @@ class Logger(object):
         :class:`a_module.Klass` and :attr:`Klass().logger.source` would be an instance of
         :class:`a_module.Klass`.
 
-        Note that :func:`logging.getLogger` will either create or get a logger with said name.
+        Note that :func:`logging.getLogger` will either create or get a logger with said name.  The
+        logger of each class is looked up once.
         """
         source = instance or instance_type
-        paths = [instance_type.__module__, instance_type.__name__]
-        if global_log_publisher.name not in instance_type.__module__:
-            paths.insert(0, global_log_publisher.name)
-        name = '.'.join(paths)
+        try:
+            name, observer = _class_observers[instance_type]
+        except KeyError:
+            paths = [instance_type.__module__, instance_type.__name__]
+            if global_log_publisher.name not in instance_type.__module__:
+                paths.insert(0, global_log_publisher.name)
+            name = '.'.join(paths)
+            observer = logging.getLogger(name)
+            _class_observers[instance_type] = name, observer
         return self.__class__(name=name,
                               source=source,
-                              observer=logging.getLogger(name))
+                              observer=observer)
 
     def __set__(self, instance: Any, value):
         raise AttributeError('Cannot redefine logger for {instance!s}!'.format(instance=instance))
@@ -299,7 +353,7 @@ class Logger(object):
                                        observer_level=self.observer.log_level,
                                        id=id(self), )
 
-    def __log(self, log_level: LogLevel, fmt: str = '', **kwargs):
+    def __log(self, log_level: LogLevel, fmt: str, kwargs: dict):
         # In Python 3.6 the order of kwargs is preserved, see PEP 468.
         # So, we are not going to bother to fix it here.
         event = kwargs
@@ -322,7 +376,8 @@ class Logger(object):
         :type fmt: str
         :param kwargs: The placeholder keywords and their values.
         """
-        self.__log(LogLevel.DEBUG, fmt, **kwargs)
+        if self.observer.isEnabledFor(LogLevel.DEBUG):
+            self.__log(LogLevel.DEBUG, fmt, kwargs)
 
     def info(self, fmt: str = '', **kwargs) -> None:
         """Emit a log event at the INFO level.
@@ -333,7 +388,8 @@ class Logger(object):
         :type fmt: str
         :param kwargs: The placeholder keywords and their values.
         """
-        self.__log(LogLevel.INFO, fmt, **kwargs)
+        if self.observer.isEnabledFor(LogLevel.INFO):
+            self.__log(LogLevel.INFO, fmt, kwargs)
 
     def warning(self, fmt: str = '', **kwargs) -> None:
         """Emit a log event at the WARNING level.
@@ -344,7 +400,8 @@ class Logger(object):
         :type fmt: str
         :param kwargs: The placeholder keywords and their values.
         """
-        self.__log(LogLevel.WARNING, fmt, **kwargs)
+        if self.observer.isEnabledFor(LogLevel.WARNING):
+            self.__log(LogLevel.WARNING, fmt, kwargs)
 
     def error(self, fmt: str = '', **kwargs) -> None:
         """Emit a log event at the ERROR level.
@@ -355,7 +412,8 @@ class Logger(object):
         :type fmt: str
         :param kwargs: The placeholder keywords and their values.
         """
-        self.__log(LogLevel.ERROR, fmt, **kwargs)
+        if self.observer.isEnabledFor(LogLevel.ERROR):
+            self.__log(LogLevel.ERROR, fmt, kwargs)
 
     def fatal(self, fmt: str = '', **kwargs) -> None:
         """Emit a log event at the FATAL level.
@@ -366,7 +424,8 @@ class Logger(object):
         :type fmt: str
         :param kwargs: The placeholder keywords and their values.
         """
-        self.__log(LogLevel.FATAL, fmt, **kwargs)
+        if self.observer.isEnabledFor(LogLevel.FATAL):
+            self.__log(LogLevel.FATAL, fmt, kwargs)
 
     @property
     def log_level(self) -> LogLevel:
@@ -1,4 +1,6 @@
 # flake8: noqa
+from eskapade._lazy import lazy_attributes
+
 try:
     import ROOT
 except ImportError:
@@ -29,5 +31,9 @@ except ImportError:
         raise MissingRooStatsError()
 
 from eskapade.root_analysis import decorators, style
-from eskapade.root_analysis.links import *
+from eskapade.root_analysis import links
 from eskapade.root_analysis.roofit_manager import RooFitManager
+
+# link classes are imported on first access
+lazy_attributes(__name__, {cls: 'eskapade.root_analysis.links:' + cls for cls in links.__all__})
+__all__ = links.__all__ + ['RooFitManager', 'decorators', 'style']
@@ -1,18 +1,21 @@
-from eskapade.root_analysis.links.add_propagated_error_to_roodataset import AddPropagatedErrorToRooDataSet
-from eskapade.root_analysis.links.convert_dataframe_2_roodataset import ConvertDataFrame2RooDataSet
-from eskapade.root_analysis.links.convert_roodataset_2_dataframe import ConvertRooDataSet2DataFrame
-from eskapade.root_analysis.links.convert_roodataset_2_roodatahist import ConvertRooDataSet2RooDataHist
-from eskapade.root_analysis.links.convert_root_hist_2_roodatahist import ConvertRootHist2RooDataHist
-from eskapade.root_analysis.links.convert_root_hist_2_roodataset import ConvertRootHist2RooDataSet
-from eskapade.root_analysis.links.print_ws import PrintWs
-from eskapade.root_analysis.links.read_from_root_file import ReadFromRootFile
-from eskapade.root_analysis.links.roodatahist_filler import RooDataHistFiller
-from eskapade.root_analysis.links.roofit_percentile_binning import RooFitPercentileBinning
-from eskapade.root_analysis.links.root_hist_filler import RootHistFiller
-from eskapade.root_analysis.links.trunc_exp_fit import TruncExpFit
-from eskapade.root_analysis.links.trunc_exp_gen import TruncExpGen
-from eskapade.root_analysis.links.uncorrelation_hypothesis_tester import UncorrelationHypothesisTester
-from eskapade.root_analysis.links.ws_utils import WsUtils
+from eskapade._lazy import lazy_links
+
+lazy_links(__name__, dict(
+    AddPropagatedErrorToRooDataSet='add_propagated_error_to_roodataset',
+    ConvertDataFrame2RooDataSet='convert_dataframe_2_roodataset',
+    ConvertRooDataSet2DataFrame='convert_roodataset_2_dataframe',
+    ConvertRooDataSet2RooDataHist='convert_roodataset_2_roodatahist',
+    ConvertRootHist2RooDataHist='convert_root_hist_2_roodatahist',
+    ConvertRootHist2RooDataSet='convert_root_hist_2_roodataset',
+    PrintWs='print_ws',
+    ReadFromRootFile='read_from_root_file',
+    RooDataHistFiller='roodatahist_filler',
+    RooFitPercentileBinning='roofit_percentile_binning',
+    RootHistFiller='root_hist_filler',
+    TruncExpFit='trunc_exp_fit',
+    TruncExpGen='trunc_exp_gen',
+    UncorrelationHypothesisTester='uncorrelation_hypothesis_tester',
+    WsUtils='ws_utils'))
 
 __all__ = ['AddPropagatedErrorToRooDataSet',
            'ConvertDataFrame2RooDataSet',
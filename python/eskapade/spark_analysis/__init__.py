@@ -1,4 +1,6 @@
 # flake8: noqa
+from eskapade._lazy import lazy_attributes
+
 try:
     import pyspark
 except ImportError:
@@ -13,7 +15,11 @@ except ImportError:
 
 from eskapade.spark_analysis import decorators, data_conversion, functions
 from eskapade.spark_analysis.spark_manager import SparkManager
-from eskapade.spark_analysis.links import *
+from eskapade.spark_analysis import links
+
+# link classes are imported on first access
+lazy_attributes(__name__, {cls: 'eskapade.spark_analysis.links:' + cls for cls in links.__all__})
+__all__ = links.__all__ + ['SparkManager', 'data_conversion', 'decorators', 'functions']
 
 import eskapade.utils
 eskapade.utils.set_matplotlib_backend(silent=False)
@@ -1,18 +1,21 @@
-from eskapade.spark_analysis.links.rdd_group_mapper import RddGroupMapper
-from eskapade.spark_analysis.links.spark_configurator import SparkConfigurator
-from eskapade.spark_analysis.links.spark_data_to_csv import SparkDataToCsv
-from eskapade.spark_analysis.links.spark_df_converter import SparkDfConverter
-from eskapade.spark_analysis.links.spark_df_creator import SparkDfCreator
-from eskapade.spark_analysis.links.spark_df_reader import SparkDfReader
-from eskapade.spark_analysis.links.spark_df_writer import SparkDfWriter
-from eskapade.spark_analysis.links.spark_execute_query import SparkExecuteQuery
-from eskapade.spark_analysis.links.spark_histogrammar_filler import SparkHistogrammarFiller
-from eskapade.spark_analysis.links.spark_streaming_controller import SparkStreamingController
-from eskapade.spark_analysis.links.spark_streaming_wordcount import SparkStreamingWordCount
-from eskapade.spark_analysis.links.spark_streaming_writer import SparkStreamingWriter
-from eskapade.spark_analysis.links.spark_with_column import SparkWithColumn
-from eskapade.spark_analysis.links.sparkgeneralfuncprocessor import SparkGeneralFuncProcessor
-from eskapade.spark_analysis.links.sparkhister import SparkHister
+from eskapade._lazy import lazy_links
+
+lazy_links(__name__, dict(
+    RddGroupMapper='rdd_group_mapper',
+    SparkConfigurator='spark_configurator',
+    SparkDataToCsv='spark_data_to_csv',
+    SparkDfConverter='spark_df_converter',
+    SparkDfCreator='spark_df_creator',
+    SparkDfReader='spark_df_reader',
+    SparkDfWriter='spark_df_writer',
+    SparkExecuteQuery='spark_execute_query',
+    SparkHistogrammarFiller='spark_histogrammar_filler',
+    SparkStreamingController='spark_streaming_controller',
+    SparkStreamingWordCount='spark_streaming_wordcount',
+    SparkStreamingWriter='spark_streaming_writer',
+    SparkWithColumn='spark_with_column',
+    SparkGeneralFuncProcessor='sparkgeneralfuncprocessor',
+    SparkHister='sparkhister'))
 
 __all__ = ['RddGroupMapper',
            'SparkConfigurator',
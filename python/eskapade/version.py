@@ -0,0 +1,6 @@
+"""THIS FILE IS AUTO-GENERATED BY ESKAPADE SETUP.PY."""
+
+name = 'eskapade'
+version = '0.7.0'
+full_version = '0.7.0'
+release = True
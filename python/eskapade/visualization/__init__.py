@@ -1,7 +1,12 @@
 # flake8: noqa
-from eskapade.visualization import vis_utils
-from eskapade.visualization.links import *
+from eskapade._lazy import lazy_attributes
+from eskapade.visualization import links
 
 import eskapade.utils
 
 eskapade.utils.set_matplotlib_backend(silent=False)
+
+# link classes and plotting utilities are imported on first access
+lazy_attributes(__name__, {cls: 'eskapade.visualization.links:' + cls for cls in links.__all__})
+lazy_attributes(__name__, dict(vis_utils='eskapade.visualization.vis_utils'))
+__all__ = links.__all__
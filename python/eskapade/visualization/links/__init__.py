@@ -1,5 +1,8 @@
-from eskapade.visualization.links.correlation_summary import CorrelationSummary
-from eskapade.visualization.links.df_boxplot import DfBoxplot
-from eskapade.visualization.links.df_summary import DfSummary
+from eskapade._lazy import lazy_links
+
+lazy_links(__name__, dict(
+    CorrelationSummary='correlation_summary',
+    DfBoxplot='df_boxplot',
+    DfSummary='df_summary'))
 
 __all__ = ['CorrelationSummary', 'DfBoxplot', 'DfSummary']
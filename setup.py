@@ -35,7 +35,6 @@ if DEV:
     FULL_VERSION += '.dev'
 
 REQUIREMENTS = [
-    'pendulum==1.2.5',
     'jupyter==1.0.0',
     'matplotlib==2.0.2',
     'numpy==1.12.1',
@@ -201,6 +200,10 @@ def setup_package() -> None:
               'console_scripts': [
                   'eskapade_ignite = eskapade.entry_points:eskapade_ignite',
                   'eskapade_run = eskapade.entry_points:eskapade_run',
+                  'eskapade_bench = eskapade.entry_points:eskapade_bench',
+                  'eskapade_map_reduce = eskapade.entry_points:eskapade_map_reduce',
+                  'eskapade_serve = eskapade.entry_points:eskapade_serve',
+                  'eskapade_submit = eskapade.entry_points:eskapade_submit',
                   'eskapade_trial = eskapade.entry_points:eskapade_trial',
                   'eskapade_generate_link = eskapade.entry_points:eskapade_generate_link',
                   'eskapade_generate_macro = eskapade.entry_points:eskapade_generate_macro',
@@ -0,0 +1,172 @@
+"""Benchmarks of core links and persistence on synthetic data.
+
+Each benchmark executes a link, or persists the data store, on a synthetic
+data frame of 1e4 to 1e7 rows and records the execution time, the peak
+memory and the throughput in rows per second.  Larger scales are skipped
+if the environment variable ESKAPADE_BENCH_MAX_ROWS is set to a lower
+number of rows.
+
+The benchmarks follow the conventions of airspeed velocity (asv), with
+"time_", "peakmem_" and "track_" methods.  They can also be run without
+asv, with "python -m benchmarks.run" in the tests directory.
+"""
+
+import os
+import shutil
+import tempfile
+import timeit
+
+from eskapade import process_manager, ConfigObject, DataStore
+from eskapade import analysis, data_quality, visualization
+from eskapade.logger import LogLevel
+
+from .synthetic import synthetic_frame
+
+# numbers of rows of the synthetic data
+ROWS = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+# environment variable with the maximum number of rows
+MAX_ROWS_VAR = 'ESKAPADE_BENCH_MAX_ROWS'
+
+
+def _sum_x(df):
+    return df['x0'] + df['x1']
+
+
+def _label(cat):
+    return cat.upper()
+
+
+class _Suite(object):
+    """Base class of benchmarks that process a synthetic data frame.
+
+    Subclasses prepare the benchmark in "prepare" and implement the
+    benchmarked operation in "run".  The synthetic frame is stored in the
+    data store under the key "data".
+    """
+
+    params = ROWS
+    param_names = ['rows']
+    number = 1
+    timeout = 1800
+
+    def setup(self, rows):
+        max_rows = float(os.environ.get(MAX_ROWS_VAR, 'inf'))
+        if rows > max_rows:
+            # skip benchmark
+            raise NotImplementedError('{:d} rows exceeds maximum of {:g}'.format(rows, max_rows))
+
+        self.rows = rows
+        self.tmp_dir = tempfile.mkdtemp(prefix='eskapade_bench_')
+        process_manager.reset()
+        settings = process_manager.service(ConfigObject)
+        settings['analysisName'] = 'benchmark'
+        settings['resultsDir'] = self.tmp_dir
+        settings['batchMode'] = True
+        settings['logLevel'] = LogLevel.WARNING
+        self.ds = process_manager.service(DataStore)
+        self.ds['data'] = synthetic_frame(rows)
+        self.prepare()
+
+    def teardown(self, rows):
+        process_manager.reset()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def prepare(self):
+        """Prepare benchmark after creating the synthetic data."""
+        pass
+
+    def run(self):
+        """Execute benchmarked operation."""
+        raise NotImplementedError('run not implemented for {}'.format(type(self).__name__))
+
+    def time_run(self, rows):
+        self.run()
+
+    def peakmem_run(self, rows):
+        self.run()
+
+    def track_throughput(self, rows):
+        start = timeit.default_timer()
+        self.run()
+        return rows / (timeit.default_timer() - start)
+
+    track_throughput.unit = 'rows/s'
+
+
+class _LinkSuite(_Suite):
+    """Base class of benchmarks of the execution of a link."""
+
+    def create_link(self):
+        """Create benchmarked link."""
+        raise NotImplementedError('create_link not implemented for {}'.format(type(self).__name__))
+
+    def prepare(self):
+        self.link = self.create_link()
+        self.link.logger.log_level = LogLevel.WARNING
+        self.link.initialize()
+
+    def run(self):
+        self.link.execute()
+
+
+class ReadToDf(_LinkSuite):
+    def create_link(self):
+        path = os.path.join(self.tmp_dir, 'data.csv')
+        self.ds.pop('data').to_csv(path, index=False)
+        return analysis.ReadToDf(key='data', path=path, reader='csv')
+
+
+class ValueCounter(_LinkSuite):
+    def create_link(self):
+        return analysis.ValueCounter(read_key='data', store_key_hists='hists',
+                                     columns=['n0', 'c0', 'c1', ['c0', 'c1']])
+
+
+class HistogrammarFiller(_LinkSuite):
+    def create_link(self):
+        bin_specs = dict(bin_width=0.1, bin_offset=0.)
+        return analysis.HistogrammarFiller(read_key='data', store_key='hists',
+                                           columns=['x0', 'n0', 'c0', ['x0', 'x1']],
+                                           bin_specs=dict(x0=bin_specs, x1=bin_specs))
+
+
+class RecordFactorizer(_LinkSuite):
+    def create_link(self):
+        return analysis.RecordFactorizer(read_key='data', store_key='data_fact', columns=['c0', 'c1'])
+
+
+class RecordVectorizer(_LinkSuite):
+    def create_link(self):
+        return analysis.RecordVectorizer(read_key='data', store_key='data_vect', columns=['c0'],
+                                         column_compare_with=dict(c0=sorted(self.ds['data']['c0'].unique())))
+
+
+class FixPandasDataFrame(_LinkSuite):
+    def create_link(self):
+        return data_quality.FixPandasDataFrame(read_key='data', store_key='data_fixed')
+
+
+class ApplyFuncToDf(_LinkSuite):
+    def create_link(self):
+        return analysis.ApplyFuncToDf(read_key='data', store_key='data_func',
+                                      apply_funcs=[dict(func=_sum_x, colout='sum_x', entire=True),
+                                                   dict(func=_label, colin='c0', colout='label')])
+
+
+class DfSummary(_LinkSuite):
+    def create_link(self):
+        return visualization.DfSummary(read_key='data', results_path=self.tmp_dir, columns=['x0', 'n0', 'c0'])
+
+    def run(self):
+        # the link accumulates report pages, so each run uses a new link
+        self.prepare()
+        self.link.execute()
+
+
+class PersistServices(_Suite):
+    def prepare(self):
+        self.io_conf = process_manager.service(ConfigObject).io_conf()
+
+    def run(self):
+        process_manager.persist_services(self.io_conf)
@@ -0,0 +1,134 @@
+"""Run the benchmarks without airspeed velocity.
+
+Usage, in the tests directory:
+
+    python -m benchmarks.run [--bench REGEX] [--max-rows N] [--repeat N] [--output FILE]
+
+Each "time_" method is run a number of times, of which the median and
+minimum time are reported.  The peak memory of the "peakmem_" methods is
+the peak of the memory allocated during the call, as traced by
+tracemalloc, which includes the allocations of NumPy and Pandas.  The
+"track_" methods report their return values.
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import re
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+import benchmarks
+
+
+def discover(pattern=None):
+    """Discover benchmarks in the benchmark modules.
+
+    :param str pattern: regular expression that benchmark names should match
+    :return: benchmark names, classes and method names
+    :rtype: list
+    """
+    found = []
+    for mod_info in pkgutil.iter_modules(benchmarks.__path__):
+        if not mod_info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module('{}.{}'.format(benchmarks.__name__, mod_info.name))
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls_name.startswith('_') or cls.__module__ != module.__name__:
+                continue
+            for meth_name in sorted(dir(cls)):
+                if not meth_name.startswith(('time_', 'peakmem_', 'track_')):
+                    continue
+                name = '{}.{}.{}'.format(mod_info.name, cls_name, meth_name)
+                if pattern is None or re.search(pattern, name):
+                    found.append((name, cls, meth_name))
+    return found
+
+
+def measure(bench, method, args, repeat):
+    """Measure a benchmark method.
+
+    :return: measured values and unit
+    :rtype: tuple
+    """
+    func = getattr(bench, method)
+    if method.startswith('time_'):
+        times = []
+        for _ in range(repeat):
+            start = timeit.default_timer()
+            func(*args)
+            times.append(timeit.default_timer() - start)
+        return dict(median=statistics.median(times), min=min(times)), 's'
+    if method.startswith('peakmem_'):
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return dict(peak=peak), 'bytes'
+    return dict(value=func(*args)), getattr(func, 'unit', '')
+
+
+def run(pattern=None, repeat=3):
+    """Run benchmarks.
+
+    :param str pattern: regular expression that benchmark names should match
+    :param int repeat: number of timing repetitions
+    :return: results, one per benchmark and parameter combination
+    :rtype: list
+    """
+    results = []
+    for name, cls, method in discover(pattern):
+        params = getattr(cls, 'params', [])
+        params = params if params and isinstance(params[0], list) else [params] if params else []
+        param_names = getattr(cls, 'param_names', ['param{:d}'.format(i) for i in range(len(params))])
+        for args in itertools.product(*params):
+            bench = cls()
+            try:
+                bench.setup(*args)
+            except NotImplementedError:
+                continue
+            result = dict(name=name, params=dict(zip(param_names, args)))
+            try:
+                values, unit = measure(bench, method, args, repeat)
+                result.update(values, unit=unit)
+                report = '{} {}'.format(' '.join('{}={:.6g}'.format(*_) for _ in sorted(values.items())), unit)
+            except Exception as exc:
+                # report failure and continue with the next benchmark
+                result['error'] = '{}: {!s}'.format(type(exc).__name__, exc)
+                report = 'failed ({})'.format(result['error'].splitlines()[0])
+            finally:
+                bench.teardown(*args)
+            results.append(result)
+            print('{name:<50s} {params:<20s} {report}'.format(
+                name=name, params=' '.join('{}={}'.format(*_) for _ in result['params'].items()), report=report))
+            sys.stdout.flush()
+    return results
+
+
+def main():
+    """Run benchmarks from the command line."""
+    parser = argparse.ArgumentParser('benchmarks.run', description='Run Eskapade benchmarks without asv.')
+    parser.add_argument('--bench', '-b', metavar='REGEX', help='run benchmarks with names that match REGEX')
+    parser.add_argument('--max-rows', type=float, help='skip benchmarks with more rows')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing repetitions (default: 3)')
+    parser.add_argument('--output', '-o', metavar='FILE', help='write results to JSON file FILE')
+    args = parser.parse_args()
+
+    if args.max_rows is not None:
+        os.environ['ESKAPADE_BENCH_MAX_ROWS'] = str(args.max_rows)
+    results = run(args.bench, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as out_file:
+            json.dump(results, out_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
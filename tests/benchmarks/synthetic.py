@@ -0,0 +1,52 @@
+"""Synthetic data for the benchmarks.
+
+Data frames are generated with the distributions of the BasicGenerator
+link: normal distributions for the numeric columns and uniform choices
+for the categorical columns.
+"""
+
+import numpy as np
+
+from eskapade.analysis.links.basic_generator import generate_data
+
+
+def synthetic_columns(n_float=2, n_int=1, n_cat=2):
+    """Get names of synthetic columns.
+
+    :param int n_float: number of float columns ("x0", "x1", ...)
+    :param int n_int: number of integer columns ("n0", "n1", ...)
+    :param int n_cat: number of categorical string columns ("c0", "c1", ...)
+    :return: column names
+    :rtype: list
+    """
+    names = ['x{:d}'.format(i) for i in range(n_float)] + ['n{:d}'.format(i) for i in range(n_int)]
+    return names + ['c{:d}'.format(i) for i in range(n_cat)]
+
+
+def synthetic_frame(n_rows, n_float=2, n_int=1, n_cat=2, cardinality=20, seed=1):
+    """Generate synthetic data frame.
+
+    Integer columns have approximately "cardinality" distinct values, and
+    categorical columns exactly "cardinality" categories.
+
+    :param int n_rows: number of rows
+    :param int n_float: number of float columns
+    :param int n_int: number of integer columns
+    :param int n_cat: number of categorical columns
+    :param int cardinality: number of distinct values of integer and categorical columns
+    :param int seed: seed of the random generator
+    :rtype: pandas.DataFrame
+    """
+    columns = synthetic_columns(n_float, n_int, n_cat)
+    categories = ['cat{:d}'.format(i) for i in range(cardinality)]
+    gen_config = {}
+    for col in columns:
+        if col.startswith('x'):
+            gen_config[col] = dict(mean=0., std=1.)
+        elif col.startswith('n'):
+            gen_config[col] = dict(dtype=int, mean=cardinality / 2, std=cardinality / 6)
+        else:
+            gen_config[col] = dict(dtype=str, choice=categories)
+
+    np.random.seed(seed)
+    return generate_data(columns, n_rows, gen_config)
@@ -0,0 +1,236 @@
+import functools
+import importlib.util
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import pandas as pd
+
+from eskapade import process_manager, ConfigObject, DataStore
+from eskapade import Chain, Link, StatusCode
+from eskapade.analysis import ApplySelectionToDf, ReadToDf
+from eskapade.core import execution
+from eskapade.core.data_store_io import import_pyarrow
+from eskapade.core_ops import RepeatChain
+
+
+class ReadToDfTest(unittest.TestCase):
+    """Tests for reading dataframes from files"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.paths = []
+        for it in range(4):
+            self.paths.append(os.path.join(self.dir_path, 'input_{:d}.csv'.format(it)))
+            pd.DataFrame(dict(x=range(it * 10, it * 10 + it + 1), y='a')).to_csv(self.paths[-1], index=False)
+
+    def tearDown(self):
+        execution.reset_eskapade()
+        shutil.rmtree(self.dir_path)
+
+    def read(self, path=None, **kwargs):
+        """Execute ReadToDf link and return the contents of the data store"""
+        link = ReadToDf(key='df', path=path or self.paths, **kwargs)
+        link.initialize()
+        link.execute()
+        return process_manager.service(DataStore)
+
+    def test_read_workers(self):
+        """Test reading files with multiple workers"""
+
+        expected = [0, 10, 11, 20, 21, 22, 30, 31, 32, 33]
+        for kwargs in (dict(), dict(n_workers=3), dict(n_workers=3, worker_processes=True)):
+            ds = self.read(usecols=['x'], **kwargs)
+            self.assertListEqual(ds['df']['x'].tolist(), expected)
+            self.assertListEqual(list(ds['df'].columns), ['x'])
+            self.assertEqual(ds['n_df'], 10)
+
+        with self.assertRaises(AssertionError):
+            self.read(n_workers=0)
+
+    def iterate(self, paths=None, **kwargs):
+        """Execute ReadToDf link until all datasets are read and return the values of x per dataset"""
+        link = ReadToDf(key='df', path=paths or self.paths, **kwargs)
+        link.initialize()
+        ds = process_manager.service(DataStore)
+        settings = process_manager.service(ConfigObject)
+        datasets = []
+        settings['chainRepeatRequestBy_ReadToDf'] = True
+        while settings['chainRepeatRequestBy_ReadToDf']:
+            link.execute()
+            datasets.append(list(ds['df'].get('x', [])))
+        link.finalize()
+        self.assertEqual(ds['n_sum_df'], 10)
+        return datasets
+
+    def test_prefetch(self):
+        """Test reading datasets ahead when iterating"""
+
+        for kwargs in (dict(itr_over_files=True), dict(chunksize=2), dict(chunksize=4)):
+            datasets = self.iterate(**kwargs)
+            self.assertListEqual(self.iterate(prefetch=1, **kwargs), datasets)
+            self.assertListEqual(self.iterate(prefetch=3, **kwargs), datasets)
+        # the last file fills a chunk, so an empty dataset is read at the end
+        self.assertListEqual(datasets, [[0], [10, 11], [20, 21, 22], [30, 31, 32, 33], []])
+
+        def fail(path, **kwargs):
+            raise ValueError(path)
+
+        with self.assertRaises(ValueError):
+            self.iterate(prefetch=2, itr_over_files=True, reader=fail)
+
+    @unittest.skipIf(import_pyarrow() is None, 'pyarrow not installed')
+    def test_read_columnar(self):
+        """Test reading Parquet, Feather, and Arrow IPC files"""
+
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+
+        df = pd.concat(pd.read_csv(p) for p in self.paths).reset_index(drop=True)
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        paths = [os.path.join(self.dir_path, 'input.{}'.format(ext)) for ext in ('parquet', 'feather', 'arrow')]
+        pyarrow.parquet.write_table(table, paths[0], row_group_size=3)
+        pyarrow.feather.write_feather(table, paths[1], chunksize=3)
+        pyarrow.feather.write_feather(table, paths[2], chunksize=3)
+
+        for path in paths:
+            ds = self.read(path=path, usecols=['x'])
+            self.assertListEqual(list(ds['df'].columns), ['x'])
+            self.assertListEqual(ds['df']['x'].tolist(), df['x'].tolist())
+
+            # chunks have chunksize records, independent of the row groups or record batches in the file
+            self.assertListEqual(self.iterate(path, chunksize=4, usecols=['x']),
+                                 [[0, 10, 11, 20], [21, 22, 30, 31], [32, 33]])
+            self.assertListEqual(process_manager.service(DataStore)['df'].index.tolist(), [8, 9])
+
+    def test_read_chunks(self):
+        """Test reading JSON-lines, SQL, pickle, and HDF5 files in chunks"""
+
+        frames = [pd.read_csv(p) for p in self.paths]
+        df = pd.concat(frames).reset_index(drop=True)
+        expected = [[0, 10, 11, 20], [21, 22, 30, 31], [32, 33]]
+
+        paths = dict(jsonl=os.path.join(self.dir_path, 'input.jsonl'), sql=os.path.join(self.dir_path, 'input.sql'),
+                     pkl=os.path.join(self.dir_path, 'input.pkl'))
+        df.to_json(paths['jsonl'], orient='records', lines=True)
+        db_path = os.path.join(self.dir_path, 'input.db')
+        with sqlite3.connect(db_path) as con:
+            df.to_sql('input', con, index=False)
+        with open(paths['sql'], 'w') as query_file:
+            query_file.write('SELECT x FROM input ORDER BY x')
+        with open(paths['pkl'], 'wb') as pickle_file:
+            pickle.dump(frames[:2], pickle_file)
+            pickle.dump(frames[2], pickle_file)
+            pickle.dump(frames[3:], pickle_file)
+        kwargs = dict(sql=dict(con=functools.partial(sqlite3.connect, db_path)))
+
+        for ext, path in paths.items():
+            self.assertListEqual(self.iterate(path, chunksize=4, **kwargs.get(ext, {})), expected)
+        with open(paths['pkl'], 'wb') as pickle_file:
+            pickle.dump(frames, pickle_file)
+        for ext, path in paths.items():
+            ds = self.read(path, **kwargs.get(ext, {}))
+            self.assertListEqual(ds['df']['x'].tolist(), df['x'].tolist())
+
+    @unittest.skipIf(importlib.util.find_spec('tables') is None, 'PyTables not installed')
+    def test_read_hdf_chunks(self):
+        """Test reading HDF5 tables in chunks"""
+
+        expected = [[0, 10, 11, 20], [21, 22, 30, 31], [32, 33]]
+        path = os.path.join(self.dir_path, 'input.h5')
+        pd.concat(pd.read_csv(p) for p in self.paths).to_hdf(path, 'input', format='table')
+        self.assertListEqual(self.iterate(path, chunksize=4), expected)
+        self.assertListEqual(self.iterate(path, chunksize=4, start=2, stop=8), [[11, 20, 21, 22], [30, 31]])
+
+    def test_select(self):
+        """Test selecting records and columns while reading"""
+
+        link = ReadToDf(key='df', path=self.paths, query_set=['x > 10', 'x < 30'], select_columns='y')
+        link.initialize()
+        self.assertListEqual(link.kwargs['usecols'], ['y', 'x'])
+        link.execute()
+        ds = process_manager.service(DataStore)
+        self.assertListEqual(list(ds['df'].columns), ['y'])
+        self.assertEqual(ds['n_df'], 4)
+
+        # records are selected after counting the records read, which determines the end of the iteration
+        self.assertListEqual(self.iterate(chunksize=2, query_set='x % 2 == 0'),
+                             [[0], [10], [20], [22], [30], [32], []])
+
+    def test_repeat_parallel(self):
+        """Test repeating chain with chunked reader and parallel links"""
+
+        class Collect(Link):
+            def get_input_keys(self):
+                return {'df'}
+
+            def get_output_keys(self):
+                return {'x'}
+
+            def execute(self):
+                ds = process_manager.service(DataStore)
+                ds['x'] = ds.get('x', []) + list(ds['df'].get('x', []))
+                return StatusCode.Success
+
+        for n_workers in (1, 4):
+            settings = process_manager.service(ConfigObject)
+            settings['analysisName'] = 'test_repeat_parallel'
+            settings['doNotStoreResults'] = True
+            chain = Chain('Data')
+            chain.n_workers = n_workers
+            chain.add(ReadToDf(name='read', key='df', path=self.paths, chunksize=2))
+            chain.add(Collect('collect'))
+            chain.add(RepeatChain(listen_to='chainRepeatRequestBy_read'))
+            self.assertEqual(process_manager.initialize(), StatusCode.Success)
+            self.assertEqual(process_manager.execute(), StatusCode.Success)
+            self.assertListEqual(process_manager.service(DataStore)['x'], [0, 10, 11, 20, 21, 22, 30, 31, 32, 33],
+                                 'not all chunks read with {:d} workers'.format(n_workers))
+            execution.reset_eskapade()
+
+    def test_push_down(self):
+        """Test pushing selection down into ReadToDf"""
+
+        results = []
+        for push_down in (False, True):
+            settings = process_manager.service(ConfigObject)
+            settings['analysisName'] = 'test_push_down'
+            settings['doNotStoreResults'] = True
+            settings['pushDownSelections'] = push_down
+            read = ReadToDf(key='df', path=self.paths)
+            select = ApplySelectionToDf(read_key='df', query_set=['x > 10 and y == "a"', 'x % 2 == 0'],
+                                        select_columns=['x'])
+            chain = Chain('Data')
+            chain.add(read)
+            chain.add(select)
+            self.assertEqual(process_manager.initialize(), StatusCode.Success)
+            self.assertEqual(process_manager.execute(), StatusCode.Success)
+            results.append(process_manager.service(DataStore)['df'])
+            execution.reset_eskapade()
+
+        self.assertListEqual(read.query_set, ['x > 10 and y == "a"'])
+        self.assertListEqual(read.select_columns, [])
+        pd.testing.assert_frame_equal(results[1], results[0])
+        self.assertListEqual(results[1]['x'].tolist(), [20, 22, 30, 32])
+
+    @unittest.skipIf(import_pyarrow() is None, 'pyarrow not installed')
+    def test_parquet_filters(self):
+        """Test passing on queries as Parquet filters"""
+
+        import pyarrow
+        import pyarrow.parquet
+
+        path = os.path.join(self.dir_path, 'input.parquet')
+        df = pd.concat(pd.read_csv(p) for p in self.paths)
+        pyarrow.parquet.write_table(pyarrow.Table.from_pandas(df, preserve_index=False), path, row_group_size=3)
+
+        link = ReadToDf(key='df', path=path, query_set=['x >= 20 and y == ["a"]', 'x != 21', 'not x > 31'],
+                        select_columns=['x'])
+        link.initialize()
+        self.assertListEqual(link.kwargs['usecols'], ['x', 'y'])
+        self.assertListEqual(link.kwargs['filters'], [('x', '>=', 20), ('y', 'in', ['a'])])
+        link.execute()
+        self.assertListEqual(process_manager.service(DataStore)['df']['x'].tolist(), [20, 22, 30, 31])
@@ -0,0 +1,158 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from eskapade.core import data_store_io
+from eskapade.core.process_services import DataStore
+
+
+class DataStoreIoTest(unittest.TestCase):
+    """Tests for persistence of data-store objects in separate files"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_write_read_objects(self):
+        """Test writing and reading objects in their formats"""
+
+        objects = dict(array=np.arange(10.),
+                       obj_array=np.array([{}, 'a'], dtype=object),
+                       df=pd.DataFrame(dict(x=[1, 2, 3], y=['a', 'b', 'c'])),
+                       other={'a': [1, 2]},
+                       unpicklable=lambda: None)
+        manifest = data_store_io.write_objects(list(objects), objects.get, self.dir_path, n_workers=2)
+        entries = manifest['objects']
+        self.assertNotIn('unpicklable', entries, 'object that cannot be written in manifest')
+        self.assertEqual(entries['array']['format'], 'npy')
+        self.assertEqual(entries['obj_array']['format'], 'pkl')
+        self.assertEqual(entries['df']['format'], 'parquet' if data_store_io.import_pyarrow() else 'pkl')
+        self.assertEqual(entries['other']['format'], 'pkl')
+        self.assertIs(entries['df']['type'], pd.DataFrame)
+        self.assertEqual(len(os.listdir(self.dir_path)), 5, 'unexpected number of files written')
+
+        read = data_store_io.read_objects(self.dir_path)
+        self.assertListEqual(sorted(read), ['array', 'df', 'obj_array', 'other'])
+        np.testing.assert_array_equal(read['array'], objects['array'])
+        self.assertListEqual(list(read['obj_array']), [{}, 'a'])
+        pd.testing.assert_frame_equal(read['df'], objects['df'])
+        self.assertDictEqual(read['other'], objects['other'])
+
+        # memory-mapped array
+        array = data_store_io.read_object(self.dir_path, entries['array'], mmap=True)
+        self.assertIsInstance(array, np.memmap)
+        np.testing.assert_array_equal(array, objects['array'])
+
+    def test_mixed_type_frames(self):
+        """Test writing and reading data frames with Python objects"""
+
+        objects = dict(mixed=pd.DataFrame(dict(x=[1, 'a', 2.5], y=[1., 2., 3.])),
+                       ints=pd.DataFrame(dict(x=pd.Series([1, 2, 3], dtype=object))),
+                       index=pd.DataFrame(dict(x=[1., 2.]), index=pd.Index([1, 'a'], dtype=object)))
+        manifest = data_store_io.write_objects(list(objects), objects.get, self.dir_path, n_workers=2)
+        self.assertListEqual(sorted(manifest['objects']), sorted(objects), 'data frame not persisted')
+        for key in objects:
+            self.assertEqual(manifest['objects'][key]['format'], 'pkl')
+
+        read = data_store_io.read_objects(self.dir_path)
+        for key, df in objects.items():
+            pd.testing.assert_frame_equal(read[key], df)
+        self.assertListEqual(read['mixed']['x'].tolist(), [1, 'a', 2.5])
+
+        # fall back to next format if writing fails
+        df = pd.DataFrame([[1, 2]], columns=['x', 'x'])
+        file_name, fmt = data_store_io.write_object(df, os.path.join(self.dir_path, 'dup'))
+        self.assertEqual(fmt, 'pkl')
+        pd.testing.assert_frame_equal(data_store_io.read_object(self.dir_path, dict(file=file_name, format=fmt)), df)
+
+    def test_data_store_dir(self):
+        """Test persisting data store in directory"""
+
+        ds = DataStore()
+        ds['a'] = np.ones(5)
+        ds['b'] = 'b'
+        ds.persist_in_dir(self.dir_path)
+        ds_ = DataStore.import_from_dir(self.dir_path)
+        self.assertIsInstance(ds_, DataStore)
+        self.assertListEqual(sorted(ds_), ['a', 'b'])
+        np.testing.assert_array_equal(ds_['a'], ds['a'])
+        self.assertEqual(ds_['b'], 'b')
+
+        # lazy import: objects are loaded on first access
+        ds_ = DataStore.import_from_dir(self.dir_path, lazy=True)
+        self.assertListEqual(sorted(ds_), ['a', 'b'])
+        self.assertFalse(ds_.is_loaded('a') or ds_.is_loaded('b'), 'object loaded before access')
+        array = ds_['a']
+        self.assertTrue(ds_.is_loaded('a'), 'object not loaded after access')
+        self.assertFalse(ds_.is_loaded('b'), 'object loaded without access')
+        self.assertIsInstance(array, np.memmap)
+        array[0] = 2.
+        np.testing.assert_array_equal(DataStore.import_from_dir(self.dir_path)['a'], ds['a'])
+        self.assertDictEqual(dict(ds_.items()), dict(a=array, b='b'))
+
+    def test_incremental(self):
+        """Test linking files of unchanged objects"""
+
+        def inode(dir_path, key):
+            entry = data_store_io.read_manifest(dir_path)['objects'][key]
+            return os.stat(os.path.join(dir_path, entry['file'])).st_ino
+
+        dirs = [os.path.join(self.dir_path, str(_)) for _ in range(3)]
+        ds = DataStore()
+        ds['a'] = np.ones(5)
+        ds['b'] = 'b'
+        ds.persist_in_dir(dirs[0])
+
+        # only changed object is written
+        ds['b'] = 'c'
+        ds.persist_in_dir(dirs[1])
+        self.assertEqual(inode(dirs[1], 'a'), inode(dirs[0], 'a'), 'file of unchanged object not linked')
+        self.assertNotEqual(inode(dirs[1], 'b'), inode(dirs[0], 'b'), 'file of changed object linked')
+        self.assertEqual(DataStore.import_from_dir(dirs[1])['b'], 'c')
+
+        # object modified in place
+        ds['a'][0] = 2.
+        ds.mark_dirty(['a'])
+        del ds['b']
+        ds.persist_in_dir(dirs[2])
+        self.assertNotEqual(inode(dirs[2], 'a'), inode(dirs[1], 'a'), 'file of changed object linked')
+        ds_ = DataStore.import_from_dir(dirs[2])
+        self.assertListEqual(sorted(ds_), ['a'])
+        self.assertEqual(ds_['a'][0], 2.)
+
+    def test_background(self):
+        """Test persisting data store in the background"""
+
+        dirs = [os.path.join(self.dir_path, str(_)) for _ in range(2)]
+        ds = DataStore()
+        ds['a'] = np.ones(5)
+        ds['b'] = 'b'
+        ds.persist_in_dir(dirs[0], background=True)
+
+        # replaced objects are persisted with their value at the time of the snapshot
+        ds['b'] = 'c'
+        ds.wait_persisted(['a'])
+        ds['a'][0] = 2.
+        ds.mark_dirty(['a'])
+        ds.persist_in_file(os.path.join(self.dir_path, 'ds.pkl'), background=True)
+        ds.persist_in_dir(dirs[1], background=True)
+        ds.wait_persisted()
+        self.assertFalse(ds._pending, 'objects pending after waiting')
+        self.assertGreater(ds.write_time, 0.)
+
+        ds_ = DataStore.import_from_dir(dirs[0])
+        self.assertEqual(ds_['b'], 'b')
+        self.assertEqual(ds_['a'][0], 1.)
+        ds_ = DataStore.import_from_file(os.path.join(self.dir_path, 'ds.pkl'))
+        self.assertEqual(ds_['b'], 'c')
+        self.assertEqual(ds_['a'][0], 2.)
+        ds_ = DataStore.import_from_dir(dirs[1])
+        self.assertEqual(ds_['b'], 'c')
+        self.assertEqual(ds_['a'][0], 2.)
+        ds.finish()
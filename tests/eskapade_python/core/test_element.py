@@ -329,3 +329,77 @@ class ChainTest(unittest.TestCase):
         self.assertEqual(self.dummy_chain.fin,
                          expected,
                          msg='Finalization order and number mismatch!')
+
+    def test_execute_parallel(self):
+        class KeyLink(Link):
+            def __init__(self, name, read_key=None, store_key=None):
+                super().__init__(name)
+                self.read_key = read_key
+                self.store_key = store_key
+
+            def execute(self):
+                self.parent.exec.append(self.name)
+                return StatusCode.Success
+
+        class FailKeyLink(KeyLink):
+            def execute(self):
+                super().execute()
+                return StatusCode.Failure
+
+        # Test dependencies.
+        self.dummy_chain.clear()
+        self.dummy_chain.n_workers = 4
+
+        links = [KeyLink('read_a', store_key='a'), KeyLink('read_b', store_key='b'),
+                 KeyLink('count_a', read_key='a', store_key='ca'), KeyLink('count_b', read_key='b', store_key='cb'),
+                 KeyLink('merge', read_key=['ca', 'cb'], store_key='c')]
+        [self.dummy_chain.add(_) for _ in links]
+
+        status = self.dummy_chain.execute()
+
+        self.assertEqual(status,
+                         StatusCode.Success,
+                         msg='Parallel execution failed!')
+
+        self.assertEqual(sorted(self.dummy_chain.exec),
+                         sorted(_.name for _ in links),
+                         msg='Parallel execution number mismatch!')
+
+        order = self.dummy_chain.exec
+        self.assertLess(order.index('read_a'), order.index('count_a'), msg='Dependency order mismatch!')
+        self.assertLess(order.index('read_b'), order.index('count_b'), msg='Dependency order mismatch!')
+        self.assertEqual(order[-1], 'merge', msg='Dependency order mismatch!')
+
+        # Test barrier.
+        self.dummy_chain.clear()
+        self.dummy_chain.n_workers = 4
+
+        links = [KeyLink('read_a', store_key='a'), self.link_one, KeyLink('read_b', store_key='b')]
+        [self.dummy_chain.add(_) for _ in links]
+
+        status = self.dummy_chain.execute()
+
+        self.assertEqual(status,
+                         StatusCode.Success,
+                         msg='Parallel execution failed!')
+
+        self.assertEqual(self.dummy_chain.exec,
+                         ['read_a', 'LinkOneExec', 'read_b'],
+                         msg='Barrier order mismatch!')
+
+        # Test Fail.
+        self.dummy_chain.clear()
+        self.dummy_chain.n_workers = 4
+
+        links = [FailKeyLink('read_a', store_key='a'), KeyLink('count_a', read_key='a', store_key='ca')]
+        [self.dummy_chain.add(_) for _ in links]
+
+        status = self.dummy_chain.execute()
+
+        self.assertEqual(status,
+                         StatusCode.Failure,
+                         msg='Parallel execution did not fail!')
+
+        self.assertEqual(self.dummy_chain.exec,
+                         ['read_a'],
+                         msg='Execution order and number mismatch!')
@@ -0,0 +1,158 @@
+import shutil
+import tempfile
+import unittest
+import unittest.mock as mock
+
+import numpy as np
+import pandas as pd
+
+from eskapade import process_manager
+from eskapade.core.definitions import StatusCode
+from eskapade.core.element import Chain, Link
+from eskapade.core.link_cache import LinkCache, fingerprint
+from eskapade.core.process_services import DataStore
+from eskapade.core_ops import RepeatChain
+
+
+class SquareLink(Link):
+    """Link that squares an array in the data store"""
+
+    def __init__(self, **kwargs):
+        Link.__init__(self, kwargs.pop('name', 'SquareLink'))
+        self._process_kwargs(kwargs, read_key='x', store_key='y', offset=0)
+
+    def get_input_keys(self):
+        return {self.read_key}
+
+    def get_output_keys(self):
+        return {self.store_key}
+
+    def execute(self):
+        ds = process_manager.service(DataStore)
+        ds[self.store_key] = ds[self.read_key] ** 2 + self.offset
+        return StatusCode.Success
+
+
+class LinkCacheTest(unittest.TestCase):
+    """Tests for the cache of link results"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        process_manager.reset()
+        shutil.rmtree(self.cache_dir)
+
+    def test_fingerprint(self):
+        """Test fingerprints of objects"""
+
+        def fp(obj):
+            return fingerprint(obj).hexdigest()
+
+        df = pd.DataFrame(dict(x=[1, 2, 3], y=['a', 'b', 'c']))
+        self.assertEqual(fp(df), fp(df.copy()))
+        self.assertNotEqual(fp(df), fp(df.assign(x=[1, 2, 4])))
+        self.assertEqual(fp(np.arange(5)), fp(np.arange(5)))
+        self.assertNotEqual(fp(np.arange(5)), fp(np.arange(5.)))
+        self.assertEqual(fp(dict(a=1, b={2, 3})), fp(dict(b={3, 2}, a=1)))
+        self.assertNotEqual(fp([1, 2]), fp((1, 2)))
+        self.assertEqual(fp(SquareLink), fp(SquareLink))
+        self.assertNotEqual(fp(lambda x: x + 1), fp(lambda x: x + 2))
+        with self.assertRaises(TypeError):
+            fp(mock.Mock(__reduce_ex__=mock.Mock(side_effect=TypeError)))
+
+    def test_restore(self):
+        """Test restoring link results from cache"""
+
+        cache = LinkCache()
+        cache.open(self.cache_dir)
+        ds = process_manager.service(DataStore)
+        ds['x'] = np.arange(5)
+        link = SquareLink()
+
+        key = cache.link_key(link, ds)
+        self.assertFalse(cache.restore(key, ds), 'result restored before stored')
+        link.execute()
+        cache.store(key, link.get_output_keys(), ds)
+
+        # same settings and input
+        ds_ = DataStore()
+        ds_['x'] = np.arange(5)
+        self.assertEqual(cache.link_key(SquareLink(), ds_), key)
+        self.assertTrue(cache.restore(key, ds_), 'result not restored')
+        np.testing.assert_array_equal(ds_['y'], ds['y'])
+
+        # different settings or input
+        self.assertNotEqual(cache.link_key(SquareLink(offset=1), ds_), key)
+        ds_['x'] = np.arange(6)
+        self.assertNotEqual(cache.link_key(SquareLink(), ds_), key)
+
+        # eviction of least-recently used entries
+        link.offset = 1
+        key_ = cache.link_key(link, ds)
+        link.execute()
+        cache.max_size = 1
+        cache.store(key_, link.get_output_keys(), ds)
+        self.assertFalse(cache.restore(key, ds_), 'entry not evicted')
+
+    def test_execute(self):
+        """Test skipping execution of cached links"""
+
+        process_manager.service(LinkCache).open(self.cache_dir)
+        ds = process_manager.service(DataStore)
+        ds['x'] = np.arange(5)
+        link = SquareLink()
+        link.cache_results = True
+        self.assertEqual(link._execute(), StatusCode.Success)
+        del ds['y']
+        with mock.patch.object(SquareLink, 'execute') as mock_execute:
+            self.assertEqual(link._execute(), StatusCode.Success)
+            mock_execute.assert_not_called()
+        np.testing.assert_array_equal(ds['y'], np.arange(5) ** 2)
+
+    def test_incomplete_results(self):
+        """Test not caching results that are not in the data store"""
+
+        cache = LinkCache()
+        cache.open(self.cache_dir)
+        ds = process_manager.service(DataStore)
+        ds['x'] = np.arange(5)
+        link = SquareLink()
+        key = cache.link_key(link, ds)
+        cache.store(key, link.get_output_keys(), ds)
+        self.assertFalse(cache.restore(key, ds), 'incomplete results cached')
+
+    def test_stateful_links(self):
+        """Test bypassing the cache for links that accumulate state"""
+
+        class AccumulateLink(SquareLink):
+            def execute(self):
+                ds = process_manager.service(DataStore)
+                ds[self.store_key] = ds.get(self.store_key, 0) + ds[self.read_key] ** 2
+                return StatusCode.Success
+
+        process_manager.service(LinkCache).open(self.cache_dir)
+        ds = process_manager.service(DataStore)
+        ds['x'] = np.arange(5)
+
+        # results stored at finalize
+        link = AccumulateLink()
+        link.store_at_finalize = True
+        link.cache_results = True
+        for _ in range(2):
+            self.assertEqual(link._execute(), StatusCode.Success)
+        np.testing.assert_array_equal(ds['y'], 2 * np.arange(5) ** 2)
+        self.assertFalse(link.cache_results, 'results of link that stores at finalize cached')
+
+        # link in repeating chain
+        del ds['y']
+        chain = Chain('repeat')
+        chain.add(AccumulateLink(name='accumulate'))
+        chain.get('accumulate').cache_results = True
+        chain.add(RepeatChain(maxcount=1))
+        self.assertTrue(chain.repeats)
+        self.assertEqual(chain.initialize(), StatusCode.Success)
+        self.assertEqual(chain.execute(), StatusCode.RepeatChain)
+        self.assertEqual(chain.execute(), StatusCode.Success)
+        np.testing.assert_array_equal(ds['y'], 2 * np.arange(5) ** 2)
+        self.assertFalse(chain.get('accumulate').cache_results, 'results of link in repeating chain cached')
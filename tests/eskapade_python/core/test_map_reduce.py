@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from eskapade import process_manager
+from eskapade.core import map_reduce
+from eskapade.core.process_services import ConfigObject
+
+MACRO = """from eskapade import analysis, Chain
+chain = Chain('Data')
+chain.add(analysis.ReadToDf(key='df', path='no_file.csv'))
+"""
+
+
+class MapReduceTest(unittest.TestCase):
+    """Tests for the map-reduce runner"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        process_manager.reset()
+        shutil.rmtree(self.dir_path)
+
+    def test_map_reduce(self):
+        """Test running a macro on input files and merging the results"""
+
+        paths = []
+        for it in range(3):
+            paths.append(os.path.join(self.dir_path, 'input_{:d}.csv'.format(it)))
+            pd.DataFrame(dict(x=range(it * 10, it * 10 + it + 1))).to_csv(paths[-1], index=False)
+        macro_path = os.path.join(self.dir_path, 'macro.py')
+        with open(macro_path, 'w') as macro_file:
+            macro_file.write(MACRO)
+        settings = ConfigObject()
+        settings['analysisName'] = 'test_map_reduce'
+        settings['resultsDir'] = self.dir_path
+        settings['doNotStoreResults'] = True
+        settings.add_macros(macro_path)
+
+        results = map_reduce.run_map_reduce(settings, [os.path.join(self.dir_path, 'input_*.csv')],
+                                            ['df', 'n_df', 'no_key'], n_workers=2)
+        self.assertListEqual(list(results), ['df', 'n_df'])
+        self.assertEqual(results['n_df'], 6)
+        self.assertListEqual(results['df']['x'].tolist(), [0, 10, 11, 20, 21, 22])
+
+        results = map_reduce.map_reduce(settings, paths[:2], ['n_df'], n_workers=1,
+                                        reducer=dict(n_df=lambda n1, n2: max(n1, n2)))
+        self.assertEqual(results['n_df'], 2)
+
+        with self.assertRaises(RuntimeError):
+            map_reduce.map_reduce(settings, paths[:1], ['n_df'], read_link='NoLink')
+        with self.assertRaises(RuntimeError):
+            map_reduce.expand_paths([os.path.join(self.dir_path, 'no_file_*.csv')])
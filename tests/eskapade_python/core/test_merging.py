@@ -0,0 +1,85 @@
+import collections
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from eskapade import process_manager, DataStore
+from eskapade.analysis.histogram import Histogram, ValueCounts
+from eskapade.analysis.statistics import ArrayStats
+from eskapade.core import merging
+
+
+class MergingTest(unittest.TestCase):
+    """Tests for merging data-store objects"""
+
+    def tearDown(self):
+        process_manager.reset()
+
+    def test_merge_objects(self):
+        """Test merging objects by type"""
+
+        merged = merging.merge_objects(collections.Counter(a=1, b=2), collections.Counter(b=3, c=4))
+        self.assertDictEqual(dict(merged), dict(a=1, b=5, c=4))
+        self.assertIsInstance(merged, collections.Counter)
+
+        obj = dict(a=1, b=[1])
+        merged = merging.merge_objects(obj, dict(b=[2], c=3))
+        self.assertDictEqual(merged, dict(a=1, b=[1, 2], c=3))
+        self.assertDictEqual(obj, dict(a=1, b=[1]))
+
+        merged = merging.merge_objects(pd.DataFrame(dict(x=[1, 2])), pd.DataFrame(dict(x=[3])))
+        self.assertListEqual(merged['x'].tolist(), [1, 2, 3])
+        self.assertEqual(merging.merge_objects(2, 3), 5)
+
+        with self.assertRaises(TypeError):
+            merging.merge_objects('a', 'b')
+        with self.assertRaises(TypeError):
+            merging.merge_objects(object(), object())
+
+    def test_merge_histograms(self):
+        """Test merging value counts and histograms"""
+
+        vc1 = ValueCounts(('x',), ('x',), {(1,): 2, (2,): 3})
+        vc2 = ValueCounts('x', counts={(2,): 1, (5,): 4})
+        self.assertTrue(merging.is_mergeable(vc1))
+        self.assertDictEqual(merging.merge_objects(vc1, vc2).counts, {(1,): 2, (2,): 4, (5,): 4})
+        self.assertDictEqual(vc1.counts, {(1,): 2, (2,): 3})
+        with self.assertRaises(ValueError):
+            merging.merge_objects(vc1, ValueCounts('y', counts={(1,): 1}))
+
+        specs = dict(bin_width=1, bin_offset=0)
+        hist = merging.merge_objects(Histogram(vc1, variable='x', bin_specs=specs),
+                                     Histogram(vc2, variable='x', bin_specs=specs))
+        bin_vals, bin_centers = hist.get_bin_vals()
+        np.testing.assert_array_equal(bin_vals, [2, 4, 4])
+        np.testing.assert_array_equal(bin_centers, [1, 2, 5, 6])
+
+        hist = Histogram(([1, 2, 3], [0, 1, 2, 4]), variable='x')
+        np.testing.assert_array_equal(merging.merge_objects(hist, hist).get_bin_vals()[0], [2, 4, 6])
+        with self.assertRaises(ValueError):
+            merging.merge_objects(hist, Histogram(vc1, variable='x', bin_specs=specs))
+
+    def test_merge_stats(self):
+        """Test merging array statistics"""
+
+        stats = ArrayStats(pd.DataFrame(dict(x=[1., 2., 3.])), 'x')
+        stats.create_stats()
+        merged = merging.merge_objects(stats, ArrayStats(pd.DataFrame(dict(x=[4., 5.])), 'x'))
+        self.assertEqual(merged.stat_vals['count'][0], 5)
+        self.assertAlmostEqual(merged.stat_vals['mean'][0], 3.)
+        self.assertEqual(len(stats.col), 3)
+
+    def test_merge_data_store(self):
+        """Test merging data stores"""
+
+        ds = process_manager.service(DataStore)
+        ds['n'] = 1
+        ds['counts'] = collections.Counter(a=1)
+        keys = process_manager.merge_data_store(dict(n=2, counts=collections.Counter(a=2), new='x', skip=0),
+                                                keys=['n', 'counts', 'new', 'no_key'])
+        self.assertListEqual(keys, ['n', 'counts', 'new'])
+        self.assertEqual(ds['n'], 3)
+        self.assertEqual(ds['counts']['a'], 3)
+        self.assertEqual(ds['new'], 'x')
+        self.assertNotIn('skip', ds)
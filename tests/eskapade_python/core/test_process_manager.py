@@ -1,9 +1,13 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
 import unittest
 import unittest.mock as mock
 
 from eskapade.core.definitions import StatusCode
-from eskapade.core.process_manager import process_manager
-from eskapade.core.process_services import ConfigObject
+from eskapade.core.process_manager import ProcessManager, process_manager
+from eskapade.core.process_services import ConfigObject, DataStore
 from eskapade.core.process_services import ProcessService
 from eskapade.core.element import Chain, Link
 
@@ -144,6 +148,306 @@ class ProcessManagerTest(unittest.TestCase):
         self.assertEqual(status, StatusCode.Success)
         self.assertEqual(Success.chains, ['1', '2', '4'])
 
+    def test_execute_parallel_chains(self):
+        pm = process_manager
+        settings = pm.service(ConfigObject)
+        settings['analysisName'] = 'test_execute_parallel_chains'
+        settings['nChainWorkers'] = 2
+        settings['doNotStoreResults'] = True
+
+        # both chains wait for each other, so they cannot run one after the other in the same worker
+        barrier = multiprocessing.get_context('fork').Barrier(2, timeout=30)
+
+        class Store(Link):
+            def execute(self):
+                barrier.wait()
+                ds = process_manager.service(DataStore)
+                ds[self.store_key] = os.getpid()
+                ds['tmp_' + self.store_key] = os.getpid()
+                return StatusCode.Success
+
+        class Sum(Link):
+            def execute(self):
+                ds = process_manager.service(DataStore)
+                ds[self.store_key] = [ds[k] for k in self.read_key]
+                return StatusCode.Success
+
+        for name in ('a', 'b'):
+            link = Store(name)
+            link.store_key = name
+            chain = Chain(name, pm)
+            chain.add(link)
+            chain.input_keys = []
+            chain.output_keys = [name]
+        link = Sum('sum')
+        link.read_key = ['a', 'b']
+        link.store_key = 'sum'
+        Chain('sum', pm).add(link)
+
+        status = pm.execute()
+
+        ds = pm.service(DataStore)
+        self.assertEqual(status, StatusCode.Success)
+        self.assertEqual(ds['sum'], [ds['a'], ds['b']])
+        self.assertNotEqual(ds['a'], os.getpid(), 'Chain not executed in worker process!')
+        self.assertNotEqual(ds['a'], ds['b'], 'Chains not executed in separate processes!')
+        self.assertNotIn('tmp_a', ds, 'Undeclared output merged into data store!')
+        self.assertEqual(pm.prev_chain_name, 'sum')
+
+    def test_parallel_chain_snapshots(self):
+        results_dir = tempfile.mkdtemp()
+        pm = ProcessManager()
+        settings = pm.service(ConfigObject)
+        settings['analysisName'] = 'test_parallel_chain_snapshots'
+        settings['resultsDir'] = results_dir
+        settings['nChainWorkers'] = 2
+        settings['storeResultsEachChain'] = True
+
+        class Store(Link):
+            def execute(self):
+                pm.service(DataStore)[self.store_key] = os.getpid()
+                return StatusCode.Success
+
+        for name in ('a', 'b'):
+            link = Store(name)
+            link.store_key = name
+            chain = Chain(name, pm)
+            chain.add(link)
+            chain.input_keys = []
+            chain.output_keys = [name]
+
+        try:
+            self.assertEqual(pm.execute(), StatusCode.Success)
+            self.assertSetEqual(set(pm.service(DataStore)), {'a', 'b'})
+            self.assertNotIn('a', process_manager.service(DataStore), 'Chain executed by global process manager!')
+
+            # chain snapshots hold the output of the chain and of the chains before it, as in serial execution
+            base_path = os.path.join(results_dir, 'test_parallel_chain_snapshots/proc_service_data/v0')
+            snapshots = dict((name, DataStore.import_from_file(os.path.join(base_path, '_' + name,
+                                                                            str(DataStore) + '.pkl')))
+                             for name in ('a', 'b'))
+            self.assertSetEqual(set(snapshots['a']), {'a'}, 'Output of later parallel chain persisted!')
+            self.assertSetEqual(set(snapshots['b']), {'a', 'b'}, 'Output of earlier parallel chain not persisted!')
+        finally:
+            pm.reset()
+            shutil.rmtree(results_dir)
+
+    def test_release_keys(self):
+        pm = process_manager
+        settings = pm.service(ConfigObject)
+        settings['analysisName'] = 'test_release_keys'
+        settings['doNotStoreResults'] = True
+        settings['dataStoreReleaseKeys'] = True
+        settings['dataStoreKeepKeys'] = ['kept']
+        ds = pm.service(DataStore)
+        ds['input'] = 0
+        ds['kept'] = 0
+
+        present = {}
+
+        class Copy(Link):
+            def execute(self):
+                ds = process_manager.service(DataStore)
+                present[self.name] = sorted(ds)
+                ds[self.store_key] = [ds[k] for k in self.read_key]
+                return StatusCode.Success
+
+        def add_link(chain, name, read_key, store_key):
+            link = Copy(name)
+            link.read_key = read_key
+            link.store_key = store_key
+            chain.add(link)
+
+        one = Chain('one', pm)
+        add_link(one, 'make_tmp', ['input', 'kept'], 'tmp')
+        add_link(one, 'use_tmp', ['tmp'], 'out1')
+        add_link(one, 'check_one', [], 'check')
+        two = Chain('two', pm)
+        add_link(two, 'use_out1', ['out1'], 'out2')
+        add_link(two, 'check_two', [], 'check')
+
+        pm.initialize()
+        self.assertDictEqual(one.key_releases, {'use_tmp': {'tmp': True}, None: {'input': True}})
+        self.assertDictEqual(two.key_releases, {None: {'out1': True}})
+
+        status = pm.execute()
+        self.assertEqual(status, StatusCode.Success)
+        self.assertListEqual(present['check_one'], ['input', 'kept', 'out1'])
+        self.assertListEqual(present['check_two'], ['check', 'kept', 'out1', 'out2'])
+        self.assertListEqual(sorted(ds), ['check', 'kept', 'out2'])
+
+        # unknown input keys: objects may be read by any link
+        pm.reset()
+        settings = pm.service(ConfigObject)
+        settings['dataStoreReleaseKeys'] = True
+        one = Chain('one', pm)
+        add_link(one, 'make_tmp', ['input'], 'tmp')
+        add_link(one, 'use_tmp', ['tmp'], 'out1')
+        add_link(one, 'unknown', None, 'out2')
+        pm.initialize()
+        self.assertDictEqual(one.key_releases, {'unknown': {'tmp': True}, None: {'input': True}})
+
+    def test_push_down(self):
+        pm = process_manager
+        settings = pm.service(ConfigObject)
+        settings['pushDownSelections'] = True
+        settings['dataStoreKeepKeys'] = ['kept']
+        pushed = []
+
+        class Select(Link):
+            def push_down(self, link):
+                pushed.append((link.name, self.name))
+                return True
+
+        def add_link(chain, name, read_key, store_key, cls=Link):
+            link = cls(name)
+            link.read_key = read_key
+            link.store_key = store_key
+            chain.add(link)
+
+        one = Chain('one', pm)
+        add_link(one, 'read', [], ['data', 'n_data'])
+        add_link(one, 'select', 'data', ['data', 'n_data'], Select)
+        add_link(one, 'read_tmp', [], 'tmp')
+        add_link(one, 'select_tmp', 'tmp', 'selected', Select)
+        add_link(one, 'read_kept', [], 'kept')
+        add_link(one, 'select_kept', 'kept', 'selected_kept', Select)
+        add_link(one, 'read_used', [], 'used')
+        add_link(one, 'select_used', 'used', 'selected_used', Select)
+        add_link(one, 'use', ['data', 'selected', 'used'], 'out')
+        pm.initialize()
+        self.assertListEqual(pushed, [('read', 'select'), ('read_tmp', 'select_tmp')])
+
+        # unknown input keys: objects may be read by any link
+        del pushed[:]
+        add_link(Chain('two', pm), 'unknown', None, 'out2')
+        pm.initialize()
+        self.assertListEqual(pushed, [('read', 'select')])
+
+    def test_checkpoint_resume(self):
+        results_dir = tempfile.mkdtemp()
+        executed = []
+
+        class Append(Link):
+            def execute(self):
+                executed.append(self.name)
+                if self.name == 'fail' and not process_manager.service(ConfigObject).get('resumeFromCheckpoint'):
+                    return StatusCode.Failure
+                ds = process_manager.service(DataStore)
+                ds[self.name] = ds.get('count', 0)
+                ds['count'] = ds[self.name] + 1
+                return StatusCode.Success
+
+        def configure(resume):
+            pm = process_manager
+            settings = pm.service(ConfigObject)
+            settings['analysisName'] = 'test_checkpoint'
+            settings['resultsDir'] = results_dir
+            settings['doNotStoreResults'] = True
+            settings['resumeFromCheckpoint'] = resume
+            Chain('zero', pm).add(Append('first'))
+            one = Chain('one', pm)
+            one.add(Append('a'))
+            one.add(Append('b'))
+            one.get('b').checkpoint = True
+            one.add(Append('fail'))
+            return pm
+
+        try:
+            # failure after checkpoint
+            pm = configure(resume=False)
+            self.assertEqual(pm.run(), StatusCode.Failure)
+            self.assertListEqual(executed, ['first', 'a', 'b', 'fail'])
+            base_path = os.path.join(results_dir, 'test_checkpoint/proc_service_data/v0')
+            self.assertTrue(os.path.isfile(os.path.join(base_path, 'checkpoint.json')), 'checkpoint not recorded')
+
+            # resume after checkpointed link
+            pm.reset()
+            executed.clear()
+            pm = configure(resume=True)
+            self.assertEqual(pm.run(), StatusCode.Success)
+            self.assertListEqual(executed, ['fail'])
+            ds = pm.service(DataStore)
+            self.assertDictEqual(dict(ds), dict(first=0, a=1, b=2, fail=3, count=4))
+            self.assertFalse(os.path.exists(os.path.join(base_path, 'checkpoint.json')), 'checkpoint not removed')
+        finally:
+            shutil.rmtree(results_dir)
+
+    def test_checkpoint_repeat(self):
+        from eskapade.core_ops import RepeatChain
+
+        results_dir = tempfile.mkdtemp()
+        pm = process_manager
+        settings = pm.service(ConfigObject)
+        settings['analysisName'] = 'test_checkpoint_repeat'
+        settings['resultsDir'] = results_dir
+        settings['doNotStoreResults'] = True
+        settings['checkpointInterval'] = 1e-9
+
+        class Count(Link):
+            def execute(self):
+                ds = process_manager.service(DataStore)
+                ds['count'] = ds.get('count', 0) + 1
+                return StatusCode.Success
+
+        chain = Chain('repeat', pm)
+        chain.add(Count('count'))
+        chain.add(RepeatChain(maxcount=3))
+        Chain('once', pm).add(Link('once'))
+
+        try:
+            with mock.patch.object(ProcessManager, 'checkpoint') as mock_checkpoint:
+                self.assertEqual(pm.execute(), StatusCode.Success)
+            self.assertEqual(pm.service(DataStore)['count'], 4)
+            self.assertTrue(chain.repeats)
+            checkpoints = [(c.name, l.name) for (c, l), _ in mock_checkpoint.call_args_list]
+            self.assertListEqual(checkpoints, [('once', 'once')],
+                                 'checkpoint taken in repeated chain')
+        finally:
+            shutil.rmtree(results_dir)
+
+    def test_checkpoint_in_place(self):
+        from eskapade.core import data_store_io
+
+        results_dir = tempfile.mkdtemp()
+        pm = process_manager
+        settings = pm.service(ConfigObject)
+        settings['analysisName'] = 'test_checkpoint_in_place'
+        settings['resultsDir'] = results_dir
+        settings['storeResultsEachChain'] = True
+        settings['dataStorePersistFormat'] = 'files'
+
+        class Update(Link):
+            def get_input_keys(self):
+                return set()
+
+            def get_output_keys(self):
+                return {'counts'}
+
+            def execute(self):
+                ds = process_manager.service(DataStore)
+                if 'counts' in ds:
+                    # modify object in place
+                    ds['counts'][self.name] = 1
+                else:
+                    ds['counts'] = {self.name: 0}
+                return StatusCode.Success
+
+        Chain('zero', pm).add(Update('first'))
+        chain = Chain('one', pm)
+        chain.add(Update('update'))
+        chain.add(Link('check'))
+        chain.get('check').checkpoint = True
+        chain.get('check').get_output_keys = set
+
+        try:
+            self.assertEqual(pm.execute(), StatusCode.Success)
+            ckp_path = os.path.join(results_dir, 'test_checkpoint_in_place/proc_service_data/v0/checkpoint_0')
+            objects = data_store_io.read_objects(os.path.join(ckp_path, str(DataStore)))
+            self.assertDictEqual(objects['counts'], dict(first=0, update=1), 'in-place change not checkpointed')
+        finally:
+            shutil.rmtree(results_dir)
+
     def tearDown(self):
         from eskapade.core import execution
         execution.reset_eskapade()
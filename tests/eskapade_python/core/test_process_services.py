@@ -1,3 +1,5 @@
+import os
+import pickle
 import unittest
 import unittest.mock as mock
 
@@ -398,3 +400,52 @@ class DataStoreTest(unittest.TestCase):
         """Test value of data-store persist flag"""
 
         self.assertTrue(DataStore._persist, 'unexpected value for data-store persist flag')
+
+    def test_memory_budget(self):
+        """Test spilling of data-store objects to disk"""
+
+        ds = DataStore()
+        ds['a'] = b'a' * 1000
+        ds['b'] = b'b' * 1000
+        ds.set_memory_budget(2500, min_spill_size=500)
+        self.assertFalse(ds.is_spilled('a') or ds.is_spilled('b'), 'object spilled within budget')
+
+        # exceed budget: least-recently used object is spilled
+        ds['a']
+        ds['c'] = b'c' * 1000
+        self.assertTrue(ds.is_spilled('b'), 'least-recently used object not spilled')
+        self.assertFalse(ds.is_spilled('a') or ds.is_spilled('c'), 'recently used object spilled')
+        self.assertLessEqual(ds.memory_usage, ds.memory_budget, 'memory usage exceeds budget')
+        spill_path = dict.__getitem__(ds, 'b').path
+        self.assertTrue(os.path.isfile(spill_path), 'no file for spilled object')
+
+        # access spilled object: object is loaded and other object is spilled
+        self.assertEqual(ds['b'], b'b' * 1000, 'unexpected value of spilled object')
+        self.assertFalse(ds.is_spilled('b'), 'accessed object not loaded')
+        self.assertTrue(ds.is_spilled('a'), 'least-recently used object not spilled')
+        self.assertFalse(os.path.exists(spill_path), 'file of loaded object not removed')
+
+        # small objects are not spilled
+        ds['d'] = 1
+        self.assertFalse(ds.is_spilled('d'), 'small object spilled')
+
+        # all objects are available as items and in pickled data store
+        items = dict(b=b'b' * 1000, a=b'a' * 1000, c=b'c' * 1000, d=1)
+        self.assertDictEqual(dict(ds.items()), items, 'unexpected data-store items')
+        self.assertDictEqual(dict(pickle.loads(pickle.dumps(ds)).items()), items, 'unexpected pickled items')
+
+        # copies of the data store hold the objects, not their spill files
+        self.assertTrue(any(ds.is_spilled(_) for _ in items), 'no object spilled')
+        self.assertDictEqual(ds.copy(), items, 'spilled object not loaded in copy')
+        self.assertDictEqual(dict(ds), items, 'spilled object not loaded in dict')
+        self.assertDictEqual({**ds}, items, 'spilled object not loaded in unpacked dict')
+
+        # deleting spilled object removes file
+        spill_path = dict.__getitem__(ds, 'a').path
+        spill_dir = os.path.dirname(spill_path)
+        del ds['a']
+        self.assertFalse(os.path.exists(spill_path), 'file of deleted object not removed')
+
+        # finishing removes spill directory
+        ds.finish()
+        self.assertFalse(os.path.exists(spill_dir), 'spill directory not removed')
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from eskapade import process_manager
+from eskapade.core import run_bench
+from eskapade.core.process_services import ConfigObject
+
+
+class RunBenchTest(unittest.TestCase):
+    """Tests for the benchmark of macro runs"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        process_manager.reset()
+        shutil.rmtree(self.dir_path)
+
+    def test_percentile(self):
+        """Test computing percentiles"""
+
+        self.assertEqual(run_bench.percentile([3., 1., 2.], 50), 2.)
+        self.assertAlmostEqual(run_bench.percentile([1., 2., 3., 4., 5.], 95), 4.8)
+        self.assertEqual(run_bench.percentile([7.], 95), 7.)
+        with self.assertRaises(ValueError):
+            run_bench.percentile([], 50)
+
+    def test_benchmark_macro(self):
+        """Test benchmarking the runs of a macro"""
+
+        macro_path = os.path.join(self.dir_path, 'macro.py')
+        with open(macro_path, 'w') as macro_file:
+            macro_file.write('from eskapade import Chain, core_ops\n'
+                             'Chain("Data").add(core_ops.ToDsDict(store_key="x", obj=[1, 2]))\n')
+
+        def create_settings():
+            settings = ConfigObject()
+            settings['analysisName'] = 'test_run_bench'
+            settings['doNotStoreResults'] = True
+            settings.add_macros(macro_path)
+            return settings
+
+        results = run_bench.benchmark_macro(create_settings, n_runs=3, n_warmup=1)
+        self.assertEqual(results['runs'], 3)
+        self.assertListEqual([_['name'] for _ in results['timings']], ['run', 'Data/ToDsDict', 'Data'])
+        for timing in results['timings']:
+            self.assertEqual(len(timing['times']), 3)
+            self.assertLessEqual(timing['median'], timing['p95'])
+        self.assertGreater(results['data_store_size'], 0)
+
+        path = os.path.join(self.dir_path, 'bench.json')
+        run_bench.write_results(results, path)
+        self.assertEqual(run_bench.read_results(path)['timings'][0]['times'], results['timings'][0]['times'])
+
+    def test_compare_results(self):
+        """Test comparing benchmark results"""
+
+        def results(run_time, link_time, peak_rss):
+            return dict(timings=[dict(name='run', median=run_time), dict(name='chain/link', median=link_time)],
+                        peak_rss=peak_rss, data_store_size=100)
+
+        comparisons = run_bench.compare_results(results(1., 1e-4, None), results(1.05, 5e-4, None), threshold=0.1)
+        self.assertListEqual([_['name'] for _ in comparisons], ['run', 'chain/link', 'data_store_size'])
+        self.assertFalse(any(_['regression'] for _ in comparisons))
+
+        comparisons = run_bench.compare_results(results(1., 1., 100), results(1.2, 0.5, 200), threshold=0.1)
+        self.assertListEqual([_['regression'] for _ in comparisons], [True, False, True, False])
+        self.assertAlmostEqual(comparisons[0]['change'], 0.2)
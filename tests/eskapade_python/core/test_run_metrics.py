@@ -0,0 +1,96 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from eskapade import process_manager
+from eskapade.core.definitions import StatusCode
+from eskapade.core.element import Chain, Link
+from eskapade.core.process_services import ConfigObject, DataStore
+from eskapade.core.run_metrics import METRIC_FIELDS, RunMetrics
+
+
+class MakeDf(Link):
+    """Link that stores a data frame with one more row than its input"""
+
+    def get_input_keys(self):
+        return {self.read_key} if self.read_key else set()
+
+    def get_output_keys(self):
+        return {self.store_key}
+
+    def execute(self):
+        ds = process_manager.service(DataStore)
+        n_rows = len(ds[self.read_key]) + 1 if self.read_key else 2
+        ds[self.store_key] = pd.DataFrame(dict(x=range(n_rows)))
+        return StatusCode.Success
+
+
+class RunMetricsTest(unittest.TestCase):
+    """Tests for the registry of run metrics"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        process_manager.reset()
+        shutil.rmtree(self.dir_path)
+
+    def test_run(self):
+        """Test collecting metrics of a run"""
+
+        settings = process_manager.service(ConfigObject)
+        settings['analysisName'] = 'test_run_metrics'
+        settings['doNotStoreResults'] = True
+        settings['collectRunMetrics'] = True
+        settings['runMetricsFile'] = os.path.join(self.dir_path, 'metrics.json')
+        chain = Chain('chain', process_manager)
+        first = MakeDf('first')
+        first.store_key = 'a'
+        second = MakeDf('second')
+        second.read_key, second.store_key = 'a', 'b'
+        chain.add(first)
+        chain.add(second)
+        self.assertEqual(process_manager.run(), StatusCode.Success)
+
+        records = process_manager.service(RunMetrics).records()
+        self.assertListEqual([(_['chain'], _['link'], _['phase']) for _ in records],
+                             [('chain', 'first', 'initialize'), ('chain', 'second', 'initialize'),
+                              ('chain', None, 'initialize'), ('chain', 'first', 'execute'),
+                              ('chain', 'second', 'execute'), ('chain', None, 'execute'),
+                              ('chain', 'first', 'finalize'), ('chain', 'second', 'finalize'),
+                              ('chain', None, 'finalize')])
+        link_rec = records[4]
+        self.assertEqual((link_rec['rows_in'], link_rec['rows_out']), (2, 3))
+        self.assertEqual(link_rec['calls'], 1)
+        self.assertGreaterEqual(records[5]['wall_time'], link_rec['wall_time'])
+
+        # metrics in data store and file
+        metrics_df = process_manager.service(DataStore)['run_metrics']
+        self.assertListEqual(list(metrics_df.columns), METRIC_FIELDS)
+        self.assertEqual(len(metrics_df), len(records))
+        with open(settings['runMetricsFile']) as metrics_file:
+            self.assertListEqual(json.load(metrics_file), records)
+
+    def test_add_dump(self):
+        """Test accumulating and dumping metrics"""
+
+        metrics = RunMetrics()
+        rec = dict(chain='c', link='l', phase='execute', calls=1, wall_time=1., cpu_time=.5, max_rss_delta=10,
+                   rows_in=1, rows_out=2)
+        metrics.add(rec)
+        metrics.merge([dict(rec, max_rss_delta=5), dict(rec, link='m')])
+        records = metrics.records()
+        self.assertEqual(len(records), 2)
+        self.assertDictEqual(records[0], dict(rec, calls=2, wall_time=2., cpu_time=1., rows_in=2, rows_out=4))
+
+        path = os.path.join(self.dir_path, 'metrics.csv')
+        metrics.dump(path)
+        with open(path) as metrics_file:
+            rows = list(csv.DictReader(metrics_file))
+        self.assertListEqual([_['link'] for _ in rows], ['l', 'm'])
+        self.assertEqual(rows[0]['calls'], '2')
@@ -0,0 +1,54 @@
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from eskapade import process_manager
+from eskapade.core.definitions import StatusCode
+from eskapade.core.element import Chain, Link
+from eskapade.core.process_services import ConfigObject
+
+
+def allocate():
+    return [list(range(100)) for _ in range(100)]
+
+
+class Allocate(Link):
+    """Link that allocates some memory"""
+
+    def execute(self):
+        self.data = allocate()
+        return StatusCode.Success
+
+
+class RunProfilerTest(unittest.TestCase):
+    """Tests for profiling of targeted links"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        process_manager.reset()
+        shutil.rmtree(self.dir_path)
+
+    def test_run(self):
+        """Test profiling targeted links in a run"""
+
+        settings = process_manager.service(ConfigObject)
+        settings['analysisName'] = 'test_run_profiler'
+        settings['resultsDir'] = self.dir_path
+        settings['doNotStoreResults'] = True
+        settings['profileTargets'] = ['target']
+        settings['profileMemoryTop'] = 3
+        chain = Chain('chain', process_manager)
+        chain.add(Allocate('target'))
+        chain.add(Allocate('other'))
+        self.assertEqual(process_manager.run(), StatusCode.Success)
+
+        prof_dir = os.path.join(self.dir_path, 'test_run_profiler/data/v0/profiles')
+        self.assertListEqual(sorted(os.listdir(prof_dir)), ['chain.target.memory.txt', 'chain.target.pstats'])
+        stats = pstats.Stats(os.path.join(prof_dir, 'chain.target.pstats'))
+        self.assertIn('allocate', [_[2] for _ in stats.stats])
+        with open(os.path.join(prof_dir, 'chain.target.memory.txt')) as mem_file:
+            self.assertTrue(mem_file.read().startswith('Execution 1, top 3 allocations:'))
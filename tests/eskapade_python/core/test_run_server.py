@@ -0,0 +1,52 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from eskapade.core import run_server
+
+
+class RunServerTest(unittest.TestCase):
+    """Tests for the server of Eskapade runs"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.dir_path, 'eskapade.sock')
+        self.server = run_server.RunServer(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.dir_path)
+
+    def submit(self, *args):
+        output = io.BytesIO()
+        exit_code = run_server.submit(list(args), self.socket_path, output)
+        return exit_code, output.getvalue().decode()
+
+    def test_run(self):
+        """Test submitting a run"""
+
+        macro_path = os.path.join(self.dir_path, 'macro.py')
+        with open(macro_path, 'w') as macro_file:
+            macro_file.write('from eskapade import process_manager, ConfigObject\n'
+                             'settings = process_manager.service(ConfigObject)\n'
+                             'print("analysis " + settings["analysisName"])\n')
+        exit_code, output = self.submit('--results-dir', self.dir_path, '--store-none', '-n', 'served', macro_path)
+        self.assertEqual(exit_code, 0)
+        self.assertIn('analysis served', output)
+
+    def test_errors(self):
+        """Test exit codes of failed runs"""
+
+        exit_code, output = self.submit('--no-such-option')
+        self.assertEqual(exit_code, 2)
+        self.assertIn('usage:', output)
+        exit_code, output = self.submit('--interactive', 'macro.py')
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(os.listdir(self.dir_path), ['eskapade.sock'])
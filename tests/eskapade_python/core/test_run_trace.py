@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from eskapade import process_manager
+from eskapade.core.definitions import StatusCode
+from eskapade.core.element import Chain, Link
+from eskapade.core.process_services import ConfigObject, DataStore
+from eskapade.core.run_trace import RunTrace
+
+
+class RepeatTwice(Link):
+    """Link that repeats its chain once"""
+
+    def execute(self):
+        ds = process_manager.service(DataStore)
+        ds['n'] = ds.get('n', 0) + 1
+        return StatusCode.RepeatChain if ds['n'] < 2 else StatusCode.Success
+
+    def get_trace_args(self):
+        return dict(n=process_manager.service(DataStore).get('n'))
+
+
+class RunTraceTest(unittest.TestCase):
+    """Tests for the timeline of a run"""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        process_manager.reset()
+        shutil.rmtree(self.dir_path)
+
+    def test_run(self):
+        """Test writing trace of a run"""
+
+        settings = process_manager.service(ConfigObject)
+        settings['analysisName'] = 'test_run_trace'
+        settings['resultsDir'] = self.dir_path
+        settings['storeResultsInBackground'] = True
+        settings['runTraceFile'] = os.path.join(self.dir_path, 'trace.json')
+        chain = Chain('chain', process_manager)
+        chain.add(RepeatTwice('repeat'))
+        self.assertEqual(process_manager.run(), StatusCode.Success)
+
+        with open(settings['runTraceFile']) as trace_file:
+            events = json.load(trace_file)['traceEvents']
+        spans = [_ for _ in events if _['ph'] == 'X']
+        names = [_['name'] for _ in spans]
+        for name in ('chain', 'chain initialize', 'chain execute', 'chain finalize', 'repeat execute',
+                     'persist services', 'write data store'):
+            self.assertIn(name, names, 'span "{}" missing'.format(name))
+        self.assertListEqual([_['args']['iteration'] for _ in spans if _['name'] == 'chain execute'], [0, 1])
+        self.assertListEqual([_['args']['n'] for _ in spans if _['name'] == 'repeat execute'], [1, 2])
+        chain_span = spans[names.index('chain')]
+        for span in spans:
+            if span['cat'] == 'link':
+                self.assertEqual(span['args']['chain'], 'chain')
+                self.assertGreaterEqual(span['ts'], chain_span['ts'])
+                self.assertLessEqual(span['ts'] + span['dur'], chain_span['ts'] + chain_span['dur'])
+        self.assertTrue(any(_['ph'] == 'M' for _ in events), 'thread names missing')
+
+    def test_merge(self):
+        """Test merging trace events"""
+
+        trace = RunTrace()
+        with trace.span('a', 'test', dict(x=1)):
+            pass
+        trace.merge([dict(name='b', cat='test', ph='X', ts=0., dur=1., pid=-1, tid=1)])
+        self.assertListEqual([_['name'] for _ in trace.events()], ['a', 'b'])
+        self.assertDictEqual(trace.events()[0]['args'], dict(x=1))
+        trace.clear()
+        self.assertListEqual(trace.events(), [])
@@ -0,0 +1,51 @@
+import io
+import logging
+import unittest
+
+from eskapade.logger import Logger, LogLevel, LogPublisher
+
+
+class Unprintable(object):
+    """Object that fails the test if it is formatted"""
+
+    def __format__(self, format_spec):
+        raise AssertionError('disabled log message formatted')
+
+
+class LoggerTest(unittest.TestCase):
+    """Tests for the Eskapade logger"""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.publisher = LogPublisher('test_logger', LogLevel.INFO)
+        self.publisher.add_handler(logging.StreamHandler(self.stream))
+        self.logger = Logger('test_logger', observer=self.publisher)
+
+    def tearDown(self):
+        self.publisher.disable_queue()
+
+    def test_levels(self):
+        """Test logging at enabled and disabled levels"""
+
+        self.logger.debug('not logged {obj}', obj=Unprintable())
+        self.logger.info('value = {value:d}', value=42)
+        self.logger.log_level = LogLevel.WARNING
+        self.logger.info('not logged {obj}', obj=Unprintable())
+        self.logger.warning('{a} {b}', a='x', b='y')
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith('[test_logger#INFO] value = 42'))
+        self.assertTrue(lines[1].endswith('[test_logger#WARNING] x y'))
+
+    def test_queue(self):
+        """Test logging through a queue"""
+
+        handlers = list(self.publisher.handlers)
+        self.publisher.enable_queue()
+        self.assertNotEqual(self.publisher.handlers, handlers)
+        values = [1]
+        self.logger.info('values = {values}', values=values)
+        values.append(2)
+        self.publisher.disable_queue()
+        self.assertListEqual(self.publisher.handlers, handlers)
+        self.assertTrue(self.stream.getvalue().endswith('values = [1]\n'))
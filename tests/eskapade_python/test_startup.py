@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import eskapade
+
+# modules that should not be imported before a macro needs them
+HEAVY_MODULES = ('IPython', 'matplotlib', 'numpy', 'pandas', 'pkg_resources', 'scipy', 'sklearn')
+
+# code that imports Eskapade in a fresh interpreter and reports the loaded heavy modules
+STARTUP_CODE = """
+import json
+import sys
+{code}
+print(json.dumps(sorted(set(_.split('.')[0] for _ in sys.modules) & set({modules!r}))))
+"""
+
+
+def startup(code):
+    """Run code in a fresh interpreter.
+
+    :return: heavy modules imported by the code
+    """
+    python_path = [os.path.dirname(os.path.dirname(eskapade.__file__))]
+    python_path.extend(os.environ.get('PYTHONPATH', '').split(os.pathsep))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path))
+    output = subprocess.check_output([sys.executable, '-c', STARTUP_CODE.format(code=code, modules=HEAVY_MODULES)],
+                                     env=env, universal_newlines=True)
+    return json.loads(output.splitlines()[-1])
+
+
+class StartupTest(unittest.TestCase):
+    """Tests for the start-up time of Eskapade"""
+
+    def test_import(self):
+        """Test that importing Eskapade and its link packages does not import heavy modules"""
+
+        self.assertListEqual(startup('import eskapade\n'), [])
+        modules = startup('import eskapade\n'
+                          'from eskapade import analysis, core_ops, data_quality, process_manager\n'
+                          'link = core_ops.HelloWorld()\n')
+        self.assertListEqual(modules, [])
+
+    def test_run_help(self):
+        """Test that eskapade_run --help does not import heavy modules"""
+
+        modules = startup('sys.argv = ["eskapade_run", "--help"]\n'
+                          'from eskapade.entry_points import eskapade_run\n'
+                          'try:\n'
+                          '    eskapade_run()\n'
+                          'except SystemExit:\n'
+                          '    pass\n')
+        self.assertListEqual(modules, [])
+
+    def test_lazy_links(self):
+        """Test lazy import of link classes"""
+
+        from eskapade import analysis
+        from eskapade.analysis.links.read_to_df import ReadToDf
+
+        self.assertIs(analysis.ReadToDf, ReadToDf)
+        self.assertIn('ReadToDf', dir(analysis))
+        with self.assertRaises(AttributeError):
+            analysis.NoSuchLink
+
+    def test_star_import(self):
+        """Test that star import of Eskapade exports the core classes and the process manager"""
+
+        from eskapade.core.process_manager import process_manager
+
+        namespace = {}
+        exec('from eskapade import *', namespace)
+        for name in ('StatusCode', 'ConfigObject', 'DataStore', 'Chain', 'Link', 'helpers', 'MissingPackageError'):
+            self.assertIn(name, namespace)
+        self.assertIs(namespace['process_manager'], process_manager)
+        self.assertIs(namespace['DataStore'], eskapade.DataStore)